@@ -0,0 +1,68 @@
+"""Deterministic stand-in for AIService used by benchmarks."""
+
+import hashlib
+import time
+from typing import Callable, List, Optional, Tuple
+
+from models.generation_stats import GenerationStats
+from models.payload import PayloadImage
+from utils.metrics import metrics
+from utils.tokens import estimate_tokens
+
+
+class FakeAIService:
+    """Mimics AIService with a fixed latency and content derived from the input."""
+
+    def __init__(self, latency: float):
+        """
+        Initialize fake AI service.
+
+        Args:
+            latency: Seconds each request takes.
+        """
+        self.latency = latency
+        self.cache = None
+        self.requests = 0
+
+    def generate_readme_content(
+        self,
+        file_content: str,
+        images: Optional[List[PayloadImage]] = None,
+        update: bool = False,
+    ) -> str:
+        """Return a README derived from the payload after the configured latency."""
+        time.sleep(self.latency)
+        self.requests += 1
+        digest = hashlib.sha256(file_content.encode("utf-8")).hexdigest()[:12]
+        return f"# Synthetic README\n\nPayload digest: {digest}\n"
+
+    def stream_readme_content(
+        self,
+        file_content: str,
+        on_chunk: Callable[[str], None],
+        images: Optional[List[PayloadImage]] = None,
+        update: bool = False,
+    ) -> Tuple[str, GenerationStats]:
+        """Return the same README as generate_readme_content in one chunk."""
+        start = time.perf_counter()
+        markdown_content = self.generate_readme_content(file_content, images, update)
+        # The whole README arrives as the first token, like a one-chunk stream
+        time_to_first_token = time.perf_counter() - start
+        metrics.increment("time_to_first_token_seconds", time_to_first_token)
+        on_chunk(markdown_content)
+        return markdown_content, GenerationStats(
+            time_to_first_token=time_to_first_token,
+            duration=time.perf_counter() - start,
+            input_tokens=estimate_tokens(file_content),
+            output_tokens=estimate_tokens(markdown_content),
+        )
+
+    def summary_fingerprint(self) -> str:
+        """Identify the fake summarizer."""
+        return "fake"
+
+    def summarize_file(self, file_content: str) -> str:
+        """Return a summary derived from the file after the configured latency."""
+        time.sleep(self.latency)
+        self.requests += 1
+        return f"Synthetic summary of {file_content.split(chr(10), 1)[0]}"
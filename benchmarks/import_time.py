@@ -0,0 +1,78 @@
+"""Guard against slow startup: time importing the entry point in a fresh process.
+
+Usage:
+    python -m benchmarks.import_time --max-ms 150
+
+Exits with a non-zero status if importing main takes longer than the limit
+or pulls in modules that must only be imported when the model is called.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+TOOL_ROOT = Path(__file__).resolve().parent.parent
+DEFERRED_MODULES = ("openai", "httpx", "PIL")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+loaded = [name for name in {deferred!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+def measure_import(runs: int) -> dict:
+    """
+    Import main in fresh interpreters and collect timings.
+
+    Args:
+        runs: Number of interpreter launches.
+
+    Returns:
+        Median and best import time, and deferred modules that were imported.
+    """
+    timings = []
+    loaded = set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(deferred=DEFERRED_MODULES)],
+            cwd=TOOL_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(sample["seconds"])
+        loaded.update(sample["loaded"])
+
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "best_ms": round(min(timings) * 1000, 2),
+        "eagerly_loaded": sorted(loaded),
+    }
+
+
+def main() -> None:
+    """Run the import benchmark and enforce the limits."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    report = measure_import(args.runs)
+    print(json.dumps(report, indent=2))
+
+    if report["eagerly_loaded"]:
+        sys.exit(f"Deferred modules imported at startup: {report['eagerly_loaded']}")
+    if report["median_ms"] > args.max_ms:
+        sys.exit(f"Import took {report['median_ms']} ms, limit is {args.max_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
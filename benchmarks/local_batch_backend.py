@@ -0,0 +1,90 @@
+"""Batch backend answering requests locally, for benchmarks."""
+
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from models.batch_status import BatchStatus
+from services.batch_backend import BatchBackend
+
+
+class LocalBatchBackend(BatchBackend):
+    """Completes batches on the local machine, standing in for the API in benchmarks."""
+
+    def __init__(
+        self, directory: Path, respond: Optional[Callable[[Dict[str, Any]], str]] = None
+    ):
+        """
+        Initialize local batch backend.
+
+        Args:
+            directory: Directory keeping batch results across restarts.
+            respond: Produces the output text for a request body; defaults to
+                a placeholder README.
+        """
+        self.directory = Path(directory)
+        self.respond = respond or self._placeholder
+
+    def submit(self, input_path: Path) -> str:
+        """Answer every request of the batch and store the results."""
+        batch_id = f"local_batch_{uuid.uuid4().hex}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        with (
+            open(input_path, "r", encoding="utf-8") as source,
+            open(self._output_path(batch_id), "w", encoding="utf-8") as output,
+        ):
+            for line in source:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                text = self.respond(request["body"])
+                result = {
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "output": [
+                                {
+                                    "type": "message",
+                                    "content": [{"type": "output_text", "text": text}],
+                                }
+                            ],
+                            "usage": {
+                                "input_tokens": len(json.dumps(request["body"])) // 4,
+                                "output_tokens": len(text) // 4,
+                            },
+                        },
+                    },
+                    "error": None,
+                }
+                output.write(json.dumps(result) + "\n")
+        return batch_id
+
+    def retrieve(self, batch_id: str) -> BatchStatus:
+        """Report a stored batch as completed."""
+        if not self._output_path(batch_id).exists():
+            return BatchStatus("expired")
+        total = sum(1 for _ in self.results(batch_id))
+        return BatchStatus("completed", total, 0, total)
+
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        """Read the stored results of a batch."""
+        if not self._output_path(batch_id).exists():
+            return
+        with open(self._output_path(batch_id), "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _output_path(self, batch_id: str) -> Path:
+        """Get the file holding the results of a batch."""
+        return self.directory / f"{batch_id}.output.jsonl"
+
+    @staticmethod
+    def _placeholder(body: Dict[str, Any]) -> str:
+        """Produce a minimal README response for a request."""
+        return json.dumps(
+            {"markdown": "# Project\n\nGenerated by the local batch backend."}
+        )
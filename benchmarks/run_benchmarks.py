@@ -0,0 +1,288 @@
+"""Benchmark discovery, change detection, payload building and the full pipeline.
+
+Usage:
+    python -m benchmarks.run_benchmarks --projects 60 --files 40 --output bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.synthetic_repo import generate_monorepo, generate_root_project
+
+TOOL_ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure(stage: str, func: Callable[[], Any], results: List[Dict[str, Any]]) -> Any:
+    """
+    Run one stage, recording its wall time and peak traced memory.
+
+    Args:
+        stage: Stage name.
+        func: Stage to run.
+        results: List receiving the stage record.
+
+    Returns:
+        Return value of the stage.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            value = func()
+    finally:
+        duration = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    results.append(
+        {"stage": stage, "seconds": round(duration, 6), "peak_memory_bytes": peak}
+    )
+    print(f"{stage:<32} {duration * 1000:10.1f} ms {peak / 1024:10.0f} KiB")
+    return value
+
+
+def run(args: argparse.Namespace, repo_root: Path) -> Dict[str, Any]:
+    """
+    Generate the synthetic repository and benchmark every stage against it.
+
+    Args:
+        args: Parsed command line arguments.
+        repo_root: Directory to create the synthetic repository in.
+
+    Returns:
+        Machine-readable benchmark report.
+    """
+    results: List[Dict[str, Any]] = []
+    measure(
+        "generate_repository",
+        lambda: generate_monorepo(
+            repo_root, args.projects, args.files, args.history, args.noise
+        ),
+        results,
+    )
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ["PATH_TO_PROJECT"] = str(repo_root)
+    os.environ["AI_CACHE"] = "false"
+    os.environ["MAX_CONCURRENT_PROJECTS"] = str(args.concurrency)
+
+    # Imported late: configuration is read from the environment set above
+    from benchmarks.fake_ai_service import FakeAIService
+    from config.settings import Settings
+    from services.file_service import FileService
+    from services.git_service import GitService
+    from services.project_service import ProjectService
+    from utils.command_runner import CommandRunner
+    from utils.metrics import metrics
+
+    os.chdir(repo_root)
+    settings = Settings()
+    git_service = GitService(
+        CommandRunner(
+            settings.max_concurrent_commands, settings.command_timeout_seconds
+        )
+    )
+    file_service = FileService(settings)
+    ai_service = FakeAIService(args.latency)
+    project_service = ProjectService(git_service, file_service, ai_service, settings)
+
+    measure(
+        "discovery_walk",
+        lambda: file_service.find_pyproject_toml_files(repo_root),
+        results,
+    )
+    measure(
+        "discovery_git",
+        lambda: git_service.find_tracked_files(repo_root, "pyproject.toml"),
+        results,
+    )
+    projects = project_service.discover_projects()
+
+    def detect_per_project() -> Dict[Path, List[str]]:
+        changed = {}
+        for project in projects:
+            project.base_commit = file_service.extract_base_commit_from_readme(
+                project.readme_path
+            )
+            changed[project.root_path] = git_service.get_changed_files(
+                project.root_path, project.base_commit
+            )
+        return changed
+
+    per_project_files = measure(
+        "change_detection_per_project", detect_per_project, results
+    )
+    changed_files = measure(
+        "change_detection_batch",
+        lambda: project_service.detect_changes(projects),
+        results,
+    )
+    _check_same_changes(per_project_files, changed_files)
+
+    def build_payloads() -> None:
+        for project in projects:
+            file_paths = file_service.filter_project_files(
+                project, changed_files[project.root_path]
+            )
+            project_service.payload_builder.build(file_paths)
+
+    measure("payload_build", build_payloads, results)
+    metrics.reset()
+    measure("end_to_end", project_service.process_all_projects, results)
+    end_to_end_metrics = {
+        key: value
+        for key, value in metrics.report().items()
+        if key in ("counters", "span_totals")
+    }
+    project_service.close()
+
+    measure(
+        "watch_cycle_root_project",
+        lambda: _check_watch_ignores_state(repo_root.parent / "root_project", args),
+        results,
+    )
+
+    return {
+        "tool_commit": _tool_commit(),
+        "parameters": vars(args),
+        "ai_requests": ai_service.requests,
+        "stages": results,
+        "end_to_end_metrics": end_to_end_metrics,
+    }
+
+
+def _check_same_changes(
+    per_project: Dict[Path, List[str]], batch: Dict[Path, List[str]]
+) -> None:
+    """Fail the benchmark if per-project and batched change detection disagree."""
+    for root, file_paths in per_project.items():
+        if sorted(file_paths) != sorted(batch.get(root, [])):
+            raise RuntimeError(
+                f"Change detection paths differ for {root}: per project "
+                f"{sorted(file_paths)[:3]}, batched {sorted(batch.get(root, []))[:3]}"
+            )
+
+
+def _check_watch_ignores_state(root: Path, args: argparse.Namespace) -> None:
+    """
+    Fail the benchmark if watch mode picks up the tool's own state files.
+
+    The project is the repository root and .readmegen is not git-ignored, so
+    only the excluded directories keep state written by a cycle out of the
+    payload and from triggering the next cycle.
+    """
+    from benchmarks.fake_ai_service import FakeAIService
+    from config.settings import Settings
+    from services.file_service import FileService
+    from services.git_service import GitService
+    from services.project_service import ProjectService
+    from services.watch_service import WatchService
+
+    generate_root_project(root)
+    os.chdir(root)
+    os.environ["PATH_TO_PROJECT"] = str(root)
+    state_file = root / ".readmegen" / "cache" / "ai" / "entry.json"
+    state_file.parent.mkdir(parents=True)
+    state_file.write_text("{}")
+
+    settings = Settings()
+    ai_service = FakeAIService(args.latency)
+    payloads: List[str] = []
+    generate = ai_service.generate_readme_content
+
+    def record(file_content: str, *rest: Any, **options: Any) -> str:
+        payloads.append(file_content)
+        return generate(file_content, *rest, **options)
+
+    ai_service.generate_readme_content = record
+    project_service = ProjectService(
+        GitService(), FileService(settings), ai_service, settings
+    )
+    watch_service = WatchService(project_service)
+    try:
+        watch_service._load_projects()
+        before = watch_service._snapshot()
+        (root / "main.py").write_text("print('changed')\n")
+        state_file.write_text('{"changed": true}')
+        after = watch_service._snapshot()
+        watch_service._regenerate(watch_service._changed_paths(before, after), after)
+        settled = watch_service._snapshot()
+        (root / ".readmegen" / "projects.json").write_text("{}")
+        follow_up = watch_service._changed_paths(settled, watch_service._snapshot())
+    finally:
+        project_service.close()
+
+    leaked = [
+        file_path for file_path in after.files if file_path.startswith(".readmegen")
+    ]
+    if leaked or follow_up or not payloads:
+        raise RuntimeError(
+            f"Watch mode picked up its own state: snapshot {leaked[:3]}, "
+            f"next cycle {sorted(follow_up)[:3]}, payloads {len(payloads)}"
+        )
+    if any(".readmegen/" in payload for payload in payloads):
+        raise RuntimeError("Watch mode sent .readmegen files to the model")
+
+
+def _tool_commit() -> str:
+    """Get the commit of the benchmarked code, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=TOOL_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--files", type=int, default=20, help="modules per project")
+    parser.add_argument("--history", type=int, default=50, help="commits of history")
+    parser.add_argument(
+        "--noise", type=int, default=200, help="ignored files per project"
+    )
+    parser.add_argument("--latency", type=float, default=0.05, help="fake AI latency")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic repo")
+    args = parser.parse_args()
+
+    if args.output:
+        # Stages run inside the synthetic repository
+        args.output = args.output.resolve()
+
+    sys.path.insert(0, str(TOOL_ROOT))
+    temp_dir = tempfile.mkdtemp(prefix="readmegen-bench-")
+    report = run(args, Path(temp_dir) / "repo")
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        print(output)
+
+    if args.keep:
+        print(f"Synthetic repository kept at {temp_dir}")
+    else:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
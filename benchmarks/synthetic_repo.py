@@ -0,0 +1,138 @@
+"""Synthetic monorepo generator for benchmarks."""
+
+import random
+import subprocess
+from pathlib import Path
+from typing import List
+
+MODULE_TEMPLATE = '''"""Module {index} of {project}."""
+
+
+class Component{index}:
+    """Synthetic component number {index}."""
+
+    def __init__(self, value: int = {index}):
+        """Initialize component."""
+        self.value = value
+
+    def compute(self, factor: int) -> int:
+        """Compute a value."""
+        return self.value * factor + {revision}
+'''
+
+
+def generate_monorepo(
+    root: Path,
+    projects: int,
+    files_per_project: int,
+    history_depth: int,
+    noise_files: int,
+    seed: int = 0,
+) -> List[Path]:
+    """
+    Create a git monorepo with Python projects, history and vendored noise.
+
+    Every second project gets a README whose Last updated marker points into
+    the middle of the history, so both diff-based and full change detection
+    are exercised.
+
+    Args:
+        root: Empty directory to create the repository in.
+        projects: Number of projects.
+        files_per_project: Number of modules per project.
+        history_depth: Number of commits modifying random modules.
+        noise_files: Number of ignored files in node_modules and .venv per project.
+        seed: Random seed making the repository reproducible.
+
+    Returns:
+        Root directories of the generated projects.
+    """
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    _git(root, "init", "-q")
+    _git(root, "config", "user.email", "bench@example.com")
+    _git(root, "config", "user.name", "bench")
+    (root / ".gitignore").write_text("node_modules/\n.venv/\n.readmegen/\n")
+
+    project_roots = []
+    for project_index in range(projects):
+        project_root = root / "apps" / f"project_{project_index:03d}"
+        package = project_root / "src"
+        package.mkdir(parents=True)
+        (project_root / "pyproject.toml").write_text(
+            f'[project]\nname = "project-{project_index:03d}"\n'
+            f'version = "0.1.0"\ndescription = "Synthetic project"\n'
+        )
+        (project_root / "main.py").write_text("print('hello')\n")
+        for file_index in range(files_per_project):
+            _write_module(package, project_root.name, file_index, 0)
+
+        for noise_dir in ("node_modules/dep", ".venv/lib"):
+            noise_path = project_root / noise_dir
+            noise_path.mkdir(parents=True)
+            for noise_index in range(noise_files):
+                (noise_path / f"file_{noise_index}.js").write_text("x = 1;\n")
+        (project_root / "node_modules" / "dep" / "pyproject.toml").write_text(
+            '[project]\nname = "vendored"\n'
+        )
+        project_roots.append(project_root)
+
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", "Initial commit")
+
+    middle_commit = None
+    for revision in range(1, history_depth + 1):
+        project_root = rng.choice(project_roots)
+        file_index = rng.randrange(max(files_per_project, 1))
+        _write_module(project_root / "src", project_root.name, file_index, revision)
+        _git(root, "commit", "-q", "-am", f"Change {revision}")
+        if revision == history_depth // 2:
+            middle_commit = _git(root, "rev-parse", "HEAD")
+
+    middle_commit = middle_commit or _git(root, "rev-parse", "HEAD")
+    for project_root in project_roots[::2]:
+        (project_root / "README.md").write_text(
+            f"# {project_root.name}\n\n<!-- Last updated: {middle_commit} -->"
+        )
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", "Add READMEs")
+
+    return project_roots
+
+
+def generate_root_project(root: Path) -> Path:
+    """
+    Create a git repository that is itself one project, with no .gitignore.
+
+    Args:
+        root: Empty directory to create the repository in.
+
+    Returns:
+        Root directory of the project, the repository root.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    _git(root, "init", "-q")
+    _git(root, "config", "user.email", "bench@example.com")
+    _git(root, "config", "user.name", "bench")
+    (root / "pyproject.toml").write_text(
+        '[project]\nname = "root-project"\nversion = "0.1.0"\n'
+    )
+    (root / "main.py").write_text("print('hello')\n")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", "Initial commit")
+    return root
+
+
+def _write_module(package: Path, project: str, index: int, revision: int) -> None:
+    """Write one synthetic module."""
+    (package / f"module_{index:03d}.py").write_text(
+        MODULE_TEMPLATE.format(project=project, index=index, revision=revision)
+    )
+
+
+def _git(cwd: Path, *args: str) -> str:
+    """Run a git command in the repository."""
+    result = subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
@@ -90,4 +90,41 @@ Respond only with a JSON object in the following format:
 
 ## Output Return your answer as a JSON object in the format { "markdown": "Your markdown here" } 
 # E.g. { "markdown": "# My Project\\n\\nThis is a description of my project." }
+"""
+
+    @staticmethod
+    def get_file_summary_prompt() -> str:
+        """Get the prompt for summarizing a single project file."""
+        return """
+# Role
+You are summarizing one file of a Python project. The summary will later be used, together with the summaries of the other files, to write the project's README.md.
+
+# Guidelines
+- Start with one sentence describing the purpose of the file.
+- List the public classes, functions, CLI commands, endpoints or configuration keys it defines, each with a short description.
+- Mention dependencies on other project modules and external services.
+- For configuration and dependency files, list the relevant settings, dependencies and scripts.
+- For images, describe only what the file name suggests it shows.
+- Keep it under 200 words and do not include code longer than one line.
+
+# Output Format
+Respond with the plain text summary only.
+"""
+
+    @staticmethod
+    def get_readme_update_prompt() -> str:
+        """Get the prompt for revising an existing README from a diff."""
+        return """
+# Role
+You are maintaining the README.md of a Python project. You receive the current README.md and a unified diff of the project changes made since it was written.
+
+# Guidelines
+- Revise the README so it accurately describes the project after the changes.
+- Update only the parts affected by the diff: new or removed features, modules, commands, configuration, dependencies and examples.
+- Keep all other sections, wording, ordering and formatting exactly as they are.
+- Do not describe the diff itself or add a changelog; the README must read as if written from scratch.
+- If the changes do not affect anything the README describes, return it unchanged.
+
+# Output Format
+Respond only with a JSON object in the format { "markdown": "Your markdown here" } containing the complete revised README.
 """
@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import List, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -17,6 +17,16 @@ class Settings:
         """Get OpenAI API key."""
         return os.getenv("OPENAI_API_KEY", "")
 
+    @property
+    def openai_base_url(self) -> Optional[str]:
+        """Get an alternative OpenAI API base URL, e.g. of a local stub server."""
+        return os.getenv("OPENAI_BASE_URL") or None
+
+    @property
+    def stream_responses(self) -> bool:
+        """Check if README content is streamed and written incrementally."""
+        return self._get_bool_env("STREAM_RESPONSES", False)
+
     @property
     def required_env_vars(self) -> List[str]:
         """Get list of required environment variables."""
@@ -25,13 +35,249 @@ class Settings:
     @property
     def excluded_directories(self) -> List[str]:
         """Get list of directories to exclude from search."""
-        return ["node_modules", ".git", "__pycache__", ".venv", "venv"]
+        return ["node_modules", ".git", "__pycache__", ".venv", "venv", ".readmegen"]
 
     @property
     def apps_directory(self) -> str:
         """Get the apps directory name."""
         return os.getenv("PATH_TO_PROJECT")
 
+    @property
+    def discovery_mode(self) -> str:
+        """Get the project discovery mode: "walk" (filesystem) or "git" (index)."""
+        mode = os.getenv("DISCOVERY_MODE", "walk").lower()
+        if mode not in ("walk", "git"):
+            raise ValueError('DISCOVERY_MODE must be either "walk" or "git"')
+        return mode
+
+    @property
+    def batch_change_detection(self) -> bool:
+        """Check if changed files are detected for all projects at once."""
+        return self._get_bool_env("BATCH_CHANGE_DETECTION", True)
+
+    @property
+    def read_from_git(self) -> bool:
+        """Check if file contents are read from the current commit, not the disk."""
+        return self._get_bool_env("READ_FROM_GIT", False)
+
+    @property
+    def payload_token_budget(self) -> int:
+        """Get the maximum payload tokens per project, 0 for no limit."""
+        return max(0, self._get_int_env("PAYLOAD_TOKEN_BUDGET", 100000))
+
+    @property
+    def max_payload_bytes(self) -> int:
+        """Get the hard limit on the payload size per project, 0 for no limit."""
+        return max(0, self._get_int_env("MAX_PAYLOAD_BYTES", 2 * 1024 * 1024))
+
+    @property
+    def image_max_dimension(self) -> int:
+        """Get the maximum width and height of images sent to the AI."""
+        return self._get_int_env("IMAGE_MAX_DIMENSION", 1024)
+
+    @property
+    def image_cache_directory(self) -> str:
+        """Get the directory holding encoded image thumbnails."""
+        return os.getenv("IMAGE_CACHE_DIR", ".readmegen/cache/images")
+
+    @property
+    def diff_updates(self) -> bool:
+        """Check if existing READMEs are revised from a diff of the changes."""
+        return self._get_bool_env("DIFF_UPDATES", False)
+
+    @property
+    def diff_update_max_tokens(self) -> int:
+        """Get the diff size above which the full project payload is sent instead."""
+        return max(0, self._get_int_env("DIFF_UPDATE_MAX_TOKENS", 8000))
+
+    @property
+    def generated_file_detection(self) -> bool:
+        """Check if generated, vendored and large data files are left out."""
+        return self._get_bool_env("GENERATED_FILE_DETECTION", True)
+
+    @property
+    def summary_mode(self) -> bool:
+        """Check if READMEs are generated from stored per-file summaries."""
+        return self._get_bool_env("SUMMARY_MODE", False)
+
+    @property
+    def summary_index_path(self) -> str:
+        """Get the path of the per-file summary index."""
+        return os.getenv("SUMMARY_INDEX_PATH", ".readmegen/summaries.json")
+
+    @property
+    def project_index_enabled(self) -> bool:
+        """Check whether discovery results are kept in the project index."""
+        return self._get_bool_env("PROJECT_INDEX", True)
+
+    @property
+    def project_index_path(self) -> str:
+        """Get the path of the persistent project index."""
+        return os.getenv("PROJECT_INDEX_PATH", ".readmegen/projects.json")
+
+    @property
+    def relevance_filter_enabled(self) -> bool:
+        """Check whether projects with README-irrelevant changes are skipped."""
+        return self._get_bool_env("RELEVANCE_FILTER", False)
+
+    @property
+    def relevance_threshold(self) -> int:
+        """Get the total change weight, in percent, needed to regenerate a README."""
+        return max(1, self._get_int_env("RELEVANCE_THRESHOLD", 100))
+
+    @property
+    def relevance_rules(self) -> List[Tuple[str, int]]:
+        """Get glob patterns and the weight, in percent, of files matching them."""
+        value = os.getenv(
+            "RELEVANCE_RULES",
+            "tests/*:20,*/tests/*:20,test_*.py:20,*_test.py:20,conftest.py:20,.github/*:0,"
+            ".gitlab-ci.yml:0,.pre-commit-config.yaml:0,tox.ini:10,*.lock:0",
+        )
+        rules = []
+        for rule in value.split(","):
+            if not rule.strip():
+                continue
+            pattern, _, weight = rule.strip().rpartition(":")
+            try:
+                rules.append((pattern, int(weight)))
+            except ValueError:
+                raise ValueError(
+                    f"Invalid RELEVANCE_RULES entry '{rule}', expected glob:weight"
+                )
+        return rules
+
+    @property
+    def ai_cache_enabled(self) -> bool:
+        """Check if AI responses are cached on disk."""
+        return self._get_bool_env("AI_CACHE", True)
+
+    @property
+    def ai_cache_directory(self) -> str:
+        """Get the directory holding cached AI responses."""
+        return os.getenv("AI_CACHE_DIR", ".readmegen/cache/ai")
+
+    @property
+    def ai_cache_max_bytes(self) -> int:
+        """Get the maximum size of the AI response cache in bytes."""
+        return self._get_int_env("AI_CACHE_MAX_MB", 100) * 1024 * 1024
+
+    @property
+    def ai_cache_ttl_seconds(self) -> int:
+        """Get the time after which cached AI responses expire."""
+        return self._get_int_env("AI_CACHE_TTL_HOURS", 7 * 24) * 3600
+
+    @property
+    def ai_requests_per_minute(self) -> int:
+        """Get the request budget per minute, 0 to learn it from the API."""
+        return max(0, self._get_int_env("AI_REQUESTS_PER_MINUTE", 0))
+
+    @property
+    def ai_tokens_per_minute(self) -> int:
+        """Get the token budget per minute, 0 to learn it from the API."""
+        return max(0, self._get_int_env("AI_TOKENS_PER_MINUTE", 0))
+
+    @property
+    def ai_max_retries(self) -> int:
+        """Get how often a rate-limited or transiently failing request is retried."""
+        return max(0, self._get_int_env("AI_MAX_RETRIES", 5))
+
+    @property
+    def batch_directory(self) -> str:
+        """Get the directory of batch files and the resumable batch state."""
+        return os.getenv("BATCH_DIR", ".readmegen/batch")
+
+    @property
+    def batch_poll_seconds(self) -> int:
+        """Get the number of seconds between batch status checks."""
+        return max(1, self._get_int_env("BATCH_POLL_SECONDS", 60))
+
+    @property
+    def plan_output_tokens_per_second(self) -> int:
+        """Get the output speed assumed by --plan when projecting wall time."""
+        return max(1, self._get_int_env("PLAN_OUTPUT_TOKENS_PER_SECOND", 30))
+
+    @property
+    def metrics_json_path(self) -> Optional[str]:
+        """Get the path of the JSON run report, if one should be written."""
+        return os.getenv("METRICS_JSON_PATH") or None
+
+    @property
+    def metrics_prometheus_path(self) -> Optional[str]:
+        """Get the path of the Prometheus textfile, if one should be written."""
+        return os.getenv("METRICS_PROMETHEUS_PATH") or None
+
+    @property
+    def max_concurrent_projects(self) -> int:
+        """Get the maximum number of projects processed at the same time."""
+        return max(1, self._get_int_env("MAX_CONCURRENT_PROJECTS", 1))
+
+    @property
+    def pipeline_depth(self) -> int:
+        """Get how many projects are prepared ahead of the model requests, 0 for none."""
+        return max(0, self._get_int_env("PIPELINE_DEPTH", 2))
+
+    @property
+    def encoding_processes(self) -> int:
+        """Get the worker processes encoding images, 0 to encode in-thread."""
+        return max(0, self._get_int_env("ENCODING_PROCESSES", 2))
+
+    @property
+    def shard_weighting(self) -> str:
+        """Get how --shard assigns projects: hash or size."""
+        weighting = os.getenv("SHARD_WEIGHTING", "hash").strip().lower()
+        if weighting not in ("hash", "size"):
+            raise ValueError("SHARD_WEIGHTING must be 'hash' or 'size'")
+        return weighting
+
+    @property
+    def shard_manifest_directory(self) -> str:
+        """Get the directory shard result manifests are written to."""
+        return os.getenv("SHARD_MANIFEST_DIR", ".readmegen/shards")
+
+    @property
+    def max_concurrent_commands(self) -> int:
+        """Get the maximum number of subprocesses run at the same time."""
+        return max(1, self._get_int_env("MAX_CONCURRENT_COMMANDS", 8))
+
+    @property
+    def command_timeout_seconds(self) -> int:
+        """Get the number of seconds before a subprocess is killed."""
+        return max(1, self._get_int_env("COMMAND_TIMEOUT_SECONDS", 60))
+
+    @property
+    def watch_debounce_seconds(self) -> float:
+        """Get how long watch mode waits for changes to settle."""
+        return max(0, self._get_int_env("WATCH_DEBOUNCE_MS", 1500)) / 1000
+
+    @property
+    def watch_poll_seconds(self) -> float:
+        """Get the polling interval of watch mode when inotify is unavailable."""
+        return max(50, self._get_int_env("WATCH_POLL_MS", 1000)) / 1000
+
+    @property
+    def watch_force_polling(self) -> bool:
+        """Check whether watch mode polls even where inotify is available."""
+        return self._get_bool_env("WATCH_FORCE_POLLING", False)
+
+    @staticmethod
+    def _get_int_env(name: str, default: int) -> int:
+        """Read an integer environment variable, falling back to a default."""
+        value = os.getenv(name)
+        if not value:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"Environment variable {name} must be an integer")
+
+    @staticmethod
+    def _get_bool_env(name: str, default: bool) -> bool:
+        """Read a boolean environment variable, falling back to a default."""
+        value = os.getenv(name)
+        if not value:
+            return default
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
     def _validate_environment(self) -> None:
         """Validate that all required environment variables are set."""
         missing_vars = [var for var in self.required_env_vars if not os.getenv(var)]
@@ -1,30 +1,168 @@
 """Main entry point for the README generator."""
 
+import argparse
+import os
 import sys
 import traceback
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 from config.settings import Settings
 from services.ai_service import AIService
+from services.batch_service import BatchService
 from services.file_service import FileService
 from services.git_service import GitService
+from services.plan_service import PlanService
 from services.project_service import ProjectService
+from services.shard_service import ShardService, merge_manifests, print_merged_report
+from services.watch_service import WatchService
+from utils.command_runner import CommandRunner
+from utils.metrics import metrics
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import ResponseCache
+from utils.sharding import parse_shard
 
 # Add project root to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate README.md files.")
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument(
+        "--plan",
+        action="store_true",
+        help="show which projects would be regenerated and the estimated cost, "
+        "without calling the model",
+    )
+    modes.add_argument(
+        "--batch",
+        action="store_true",
+        help="generate all pending READMEs through one asynchronous batch, "
+        "resuming a batch submitted earlier",
+    )
+    modes.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and regenerate projects as commits and edits touch them",
+    )
+    modes.add_argument(
+        "--shard",
+        type=shard_argument,
+        metavar="I/N",
+        help="process only the I-th of N deterministic shards of the projects "
+        "and write its result manifest",
+    )
+    modes.add_argument(
+        "--merge-shards",
+        nargs="+",
+        type=Path,
+        metavar="MANIFEST",
+        help="combine shard result manifests into one run report and exit",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help="write the report merged by --merge-shards to this file",
+    )
+    args = parser.parse_args()
+    if args.report and not args.merge_shards:
+        parser.error("argument --report: only allowed with --merge-shards")
+    return args
+
+
+def shard_argument(value: str) -> Tuple[int, int]:
+    """Parse the --shard option, reporting mistakes as usage errors."""
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def merge_shards(manifest_paths: List[Path], report_path: Optional[Path]) -> None:
+    """Merge shard manifests, exiting with an error if the run is incomplete."""
+    try:
+        report = merge_manifests(manifest_paths, report_path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Could not merge shard manifests: {e}")
+        sys.exit(1)
+
+    print_merged_report(report)
+    if report_path:
+        print(f"Merged report written to {report_path}")
+    if report["missing_shards"] or report["conflicts"]:
+        sys.exit(1)
+
+
 def main():
     """Main function orchestrating the README generation process."""
+    args = parse_args()
+    if args.merge_shards:
+        # Needs no configuration, so it also runs where no API key is set
+        merge_shards(args.merge_shards, args.report)
+        return
+
+    settings = None
     try:
         # Initialize configuration
         settings = Settings()
+        if settings.apps_directory:
+            os.chdir(settings.apps_directory)
 
         # Initialize services
-        git_service = GitService()
-        file_service = FileService()
-        ai_service = AIService(settings.openai_api_key)
-        project_service = ProjectService(git_service, file_service, ai_service)
+        git_service = GitService(
+            CommandRunner(
+                settings.max_concurrent_commands, settings.command_timeout_seconds
+            )
+        )
+        file_service = FileService(settings)
+        cache = None
+        if settings.ai_cache_enabled:
+            cache = ResponseCache(
+                Path(settings.ai_cache_directory),
+                settings.ai_cache_max_bytes,
+                settings.ai_cache_ttl_seconds,
+            )
+        ai_service = AIService(
+            settings.openai_api_key,
+            cache,
+            settings.openai_base_url,
+            rate_limiter=RateLimiter(
+                settings.ai_requests_per_minute, settings.ai_tokens_per_minute
+            ),
+            max_retries=settings.ai_max_retries,
+        )
+        project_service = ProjectService(
+            git_service, file_service, ai_service, settings
+        )
+
+        if args.plan:
+            PlanService(project_service).plan_all_projects()
+            return
+
+        if args.batch:
+            BatchService(
+                project_service,
+                Path(settings.batch_directory),
+                settings.batch_poll_seconds,
+            ).run()
+            return
+
+        if args.watch:
+            WatchService(project_service).run()
+            return
+
+        if args.shard:
+            shard, shard_count = args.shard
+            ShardService(
+                project_service,
+                shard,
+                shard_count,
+                Path(settings.shard_manifest_directory),
+            ).run()
+            print("\nScript completed successfully.")
+            return
 
         # Execute the main workflow
         project_service.process_all_projects()
@@ -36,6 +174,21 @@ def main():
         print(traceback.format_exc())
         sys.exit(1)
 
+    finally:
+        if settings:
+            export_metrics(settings)
+
+
+def export_metrics(settings: Settings) -> None:
+    """Write the run report and Prometheus textfile if configured."""
+    try:
+        if settings.metrics_json_path:
+            metrics.write_json(Path(settings.metrics_json_path))
+        if settings.metrics_prometheus_path:
+            metrics.write_prometheus(Path(settings.metrics_prometheus_path))
+    except OSError as e:
+        print(f"Warning: Could not write metrics: {e}")
+
 
 if __name__ == "__main__":
     main()
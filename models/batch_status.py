@@ -0,0 +1,20 @@
+"""Status of a batch of model requests."""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class BatchStatus:
+    """Represents the progress of a submitted batch."""
+
+    TERMINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+    state: str
+    completed: int = 0
+    failed: int = 0
+    total: int = 0
+
+    @property
+    def done(self) -> bool:
+        """Check if the batch will not make further progress."""
+        return self.state in self.TERMINAL_STATES
@@ -0,0 +1,24 @@
+"""Timing statistics of a streamed AI generation."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class GenerationStats:
+    """Represents how quickly a response was streamed back."""
+
+    time_to_first_token: Optional[float] = None
+    duration: float = 0.0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    cached: bool = False
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Get the output rate after the first token arrived."""
+        streaming_time = self.duration - (self.time_to_first_token or 0.0)
+        if streaming_time <= 0:
+            return 0.0
+        return self.output_tokens / streaming_time
@@ -0,0 +1,43 @@
+"""Payload model describing what is sent to the AI for a project."""
+
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class PayloadImage:
+    """Represents an image sent to the AI as a native image input."""
+
+    path: str
+    sha: str
+    media_type: str
+    data: str
+
+    @property
+    def data_url(self) -> str:
+        """Get the image as a base64 data URL."""
+        return f"data:{self.media_type};base64,{self.data}"
+
+
+@dataclass
+class Payload:
+    """Represents the file content sent to the AI and how it was assembled."""
+
+    content: str
+    tokens: int
+    included: List[str] = None
+    truncated: List[str] = None
+    dropped: List[str] = None
+    images: List[PayloadImage] = None
+    update: bool = False
+
+    def __post_init__(self):
+        """Initialize default values after creation."""
+        if self.included is None:
+            self.included = []
+        if self.truncated is None:
+            self.truncated = []
+        if self.dropped is None:
+            self.dropped = []
+        if self.images is None:
+            self.images = []
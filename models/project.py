@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
 
+from models.relevance_report import RelevanceReport
+
 
 @dataclass
 class Project:
@@ -14,6 +16,7 @@ class Project:
     pyproject_toml_path: Path
     base_commit: Optional[str] = None
     changed_files: List[str] = None
+    relevance: Optional[RelevanceReport] = None
 
     def __post_init__(self):
         """Initialize default values after creation."""
@@ -0,0 +1,17 @@
+"""Planned work for a single project."""
+
+from dataclasses import dataclass
+
+from models.project import Project
+
+
+@dataclass
+class ProjectPlan:
+    """Represents whether and at what estimated cost a project would be regenerated."""
+
+    project: Project
+    regenerate: bool
+    input_tokens: int = 0
+    output_tokens: int = 0
+    seconds: float = 0.0
+    update: bool = False
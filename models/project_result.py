@@ -0,0 +1,27 @@
+"""Outcome of processing a single project."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from models.project import Project
+
+
+@dataclass
+class ProjectResult:
+    """Represents the result of processing one project."""
+
+    UPDATED = "updated"
+    SKIPPED = "skipped"
+    DEFERRED = "deferred"
+    EMPTY = "empty"
+    FAILED = "failed"
+
+    project: Project
+    status: str
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        """Check if processing the project failed."""
+        return self.status == self.FAILED
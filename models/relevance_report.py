@@ -0,0 +1,23 @@
+"""Relevance report describing how much a project's changes matter to its README."""
+
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass
+class RelevanceReport:
+    """Represents the scored changes of a project against a relevance threshold."""
+
+    score: int
+    threshold: int
+    reasons: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def relevant(self) -> bool:
+        """Check if the changes warrant regenerating the README."""
+        return self.score >= self.threshold
+
+    @property
+    def irrelevant(self) -> bool:
+        """Check if none of the changes can affect the README."""
+        return self.score == 0
@@ -1,66 +1,576 @@
 """AI service for generating README content."""
 
+import hashlib
 import json
-
-import openai
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from config.prompts import Prompts
+from models.batch_status import BatchStatus
+from models.generation_stats import GenerationStats
+from models.payload import PayloadImage
+from services.batch_backend import BatchBackend, OpenAIBatchBackend
+from utils.json_stream import JsonStringFieldExtractor, replace_surrogates
+from utils.metrics import metrics
+from utils.rate_limiter import RateLimiter, parse_duration
+from utils.response_cache import ResponseCache
+from utils.tokens import IMAGE_TOKENS, estimate_tokens
 
 
 class AIService:
     """Service for AI operations."""
 
-    def __init__(self, api_key: str):
+    MODEL = "gpt-4-turbo"
+    TEMPERATURE = 0.7
+    RESERVED_OUTPUT_TOKENS = 2000
+    BACKOFF_BASE_SECONDS = 1.0
+    BACKOFF_MAX_SECONDS = 60.0
+    SYSTEM_MESSAGE = 'You are a helpful assistant that generates README.md files. Always respond with valid JSON in the format {"markdown": "your markdown content here"}.'
+    SUMMARY_SYSTEM_MESSAGE = "You are a helpful assistant that summarizes source files for documentation writers. Respond with plain text only."
+
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[ResponseCache] = None,
+        base_url: Optional[str] = None,
+        batch_backend: Optional[BatchBackend] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 5,
+    ):
         """
         Initialize AI service.
 
         Args:
             api_key: OpenAI API key.
+            cache: Optional cache of previous responses.
+            base_url: Optional API base URL, e.g. of a local stub server.
+            batch_backend: Backend running batch requests, the OpenAI Batch
+                API by default.
+            rate_limiter: Request and token budgets shared by all requests.
+            max_retries: Retries of a request rejected by rate limits or
+                failing transiently.
         """
-        openai.api_key = api_key
+        self.api_key = api_key
+        self.base_url = base_url
         self.prompts = Prompts()
+        self._openai = None
+        self._openai_lock = threading.Lock()
+        self.cache = cache
+        self.batch_backend = batch_backend or OpenAIBatchBackend(self._client)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
 
-    def generate_readme_content(self, file_content: str) -> str:
+    def generate_readme_content(
+        self,
+        file_content: str,
+        images: Optional[List[PayloadImage]] = None,
+        update: bool = False,
+    ) -> str:
         """
         Generate README content using AI.
 
         Args:
             file_content: Concatenated file content.
+            images: Images sent as image inputs alongside the text.
+            update: Whether the content is an existing README and a diff to
+                revise it from.
 
         Returns:
             Generated markdown content.
         """
-        prompt = self._build_prompt(file_content)
+        prompt = self._build_prompt(file_content, update)
 
         try:
-            response = openai.responses.create(
-                model="gpt-4-turbo",
-                input=[
-                    {
-                        "role": "system",
-                        "content": 'You are a helpful assistant that generates README.md files. Always respond with valid JSON in the format {"markdown": "your markdown content here"}.',
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.7,
-            )
+            response_content = self._complete(self.SYSTEM_MESSAGE, prompt, images)
+        except Exception as e:
+            raise RuntimeError(f"Error generating README content: {e}")
+
+        return self._parse_response(response_content)
+
+    def stream_readme_content(
+        self,
+        file_content: str,
+        on_chunk: Callable[[str], None],
+        images: Optional[List[PayloadImage]] = None,
+        update: bool = False,
+    ) -> Tuple[str, GenerationStats]:
+        """
+        Generate README content, passing markdown to a callback as it streams in.
+
+        Args:
+            file_content: Concatenated file content.
+            on_chunk: Called with each newly decoded piece of markdown.
+            images: Images sent as image inputs alongside the text.
+            update: Whether the content is an existing README and a diff to
+                revise it from.
+
+        Returns:
+            Generated markdown content and streaming statistics.
+        """
+        prompt = self._build_prompt(file_content, update)
+        images = images or []
+        stats = GenerationStats()
+        start = time.perf_counter()
+
+        cache_key = self._cache_key(self.SYSTEM_MESSAGE, prompt, images)
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is not None:
+            metrics.increment("ai_cache_hits")
+            markdown_content = self._parse_response(cached)
+            on_chunk(markdown_content)
+            stats.cached = True
+            stats.duration = time.perf_counter() - start
+            return markdown_content, stats
 
-            response_content = response.output_text
-            return self._parse_response(response_content)
+        extractor = JsonStringFieldExtractor("markdown")
+        response_parts = []
 
+        metrics.increment("ai_requests", mode="stream")
+        try:
+            with metrics.span("ai_request", mode="stream"):
+                self._consume_stream(
+                    prompt, images, extractor, response_parts, stats, on_chunk, start
+                )
         except Exception as e:
             raise RuntimeError(f"Error generating README content: {e}")
 
-    def _build_prompt(self, file_content: str) -> str:
-        """Build the complete prompt for AI."""
-        base_prompt = self.prompts.get_readme_generation_prompt()
+        stats.duration = time.perf_counter() - start
+        if stats.time_to_first_token is not None:
+            metrics.increment("time_to_first_token_seconds", stats.time_to_first_token)
+        response_content = "".join(response_parts)
+
+        if self.cache and response_content:
+            self.cache.put(cache_key, response_content)
+
+        if extractor.found:
+            return self._parse_response(response_content), stats
+
+        # Not the expected JSON, so nothing was streamed yet
+        markdown_content = self._parse_response(response_content)
+        on_chunk(markdown_content)
+        return markdown_content, stats
+
+    def _consume_stream(
+        self,
+        prompt: str,
+        images: List[PayloadImage],
+        extractor: JsonStringFieldExtractor,
+        response_parts: List[str],
+        stats: GenerationStats,
+        on_chunk: Callable[[str], None],
+        start: float,
+    ) -> None:
+        """Send a streaming request and feed its text deltas to the extractor."""
+        stream = self._create_response(
+            self._estimate_request_tokens(self.SYSTEM_MESSAGE, prompt, images),
+            model=self.MODEL,
+            input=self._build_input(self.SYSTEM_MESSAGE, prompt, images),
+            temperature=self.TEMPERATURE,
+            stream=True,
+            extra_body={
+                "prompt_cache_key": self._prompt_cache_key(self.SYSTEM_MESSAGE)
+            },
+        )
+
+        for event in stream:
+            if event.type == "response.output_text.delta":
+                if stats.time_to_first_token is None:
+                    stats.time_to_first_token = time.perf_counter() - start
+                response_parts.append(event.delta)
+                markdown_chunk = extractor.feed(event.delta)
+                if markdown_chunk:
+                    on_chunk(markdown_chunk)
+            elif event.type == "response.completed" and event.response.usage:
+                usage = event.response.usage
+                details = getattr(usage, "input_tokens_details", None)
+                stats.input_tokens = usage.input_tokens
+                stats.cached_input_tokens = getattr(details, "cached_tokens", 0) or 0
+                stats.output_tokens = usage.output_tokens
+                self._record_usage(usage)
+            elif event.type in ("response.failed", "error"):
+                raise RuntimeError(f"Streaming failed with event {event.type}")
+
+    def summarize_file(self, file_content: str) -> str:
+        """
+        Summarize a single file for later README generation.
+
+        Args:
+            file_content: File path followed by the file content.
+
+        Returns:
+            Plain text summary of the file.
+        """
+        prompt = f"{self.prompts.get_file_summary_prompt()}\n\n{file_content}"
+
+        try:
+            return self._complete(self.SUMMARY_SYSTEM_MESSAGE, prompt).strip()
+        except Exception as e:
+            raise RuntimeError(f"Error summarizing file: {e}")
+
+    def summary_fingerprint(self) -> str:
+        """
+        Identify the model and prompts producing file summaries.
+
+        Returns:
+            Digest that changes whenever stored summaries go stale.
+        """
+        return ResponseCache.make_key(
+            model=self.MODEL,
+            temperature=self.TEMPERATURE,
+            system=self.SUMMARY_SYSTEM_MESSAGE,
+            prompt=self.prompts.get_file_summary_prompt(),
+        )
+
+    def readme_cache_key(
+        self,
+        file_content: str,
+        images: Optional[List[PayloadImage]] = None,
+        update: bool = False,
+    ) -> str:
+        """
+        Get the response cache key of a README request.
+
+        Args:
+            file_content: Concatenated file content.
+            images: Images sent as image inputs alongside the text.
+            update: Whether the request revises an existing README.
+
+        Returns:
+            Cache key.
+        """
+        return self._cache_key(
+            self.SYSTEM_MESSAGE, self._build_prompt(file_content, update), images or []
+        )
+
+    def cached_readme_content(self, cache_key: str) -> Optional[str]:
+        """
+        Get README content answered earlier for the same request.
+
+        Args:
+            cache_key: Key returned by readme_cache_key.
+
+        Returns:
+            Markdown content, or None if the request was not answered before.
+        """
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is None:
+            return None
+        metrics.increment("ai_cache_hits")
+        return self._parse_response(cached)
+
+    def build_batch_request(
+        self,
+        custom_id: str,
+        file_content: str,
+        images: Optional[List[PayloadImage]] = None,
+        update: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Build one line of a README generation batch.
+
+        Args:
+            custom_id: ID mapping the result back to its project.
+            file_content: Concatenated file content.
+            images: Images sent as image inputs alongside the text.
+            update: Whether the request revises an existing README.
+
+        Returns:
+            Request in the Batch API's JSONL input format.
+        """
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": OpenAIBatchBackend.ENDPOINT,
+            "body": {
+                "model": self.MODEL,
+                "input": self._build_input(
+                    self.SYSTEM_MESSAGE,
+                    self._build_prompt(file_content, update),
+                    images or [],
+                ),
+                "temperature": self.TEMPERATURE,
+                "prompt_cache_key": self._prompt_cache_key(self.SYSTEM_MESSAGE),
+            },
+        }
+
+    def submit_batch(self, requests: List[Dict[str, Any]], input_path: Path) -> str:
+        """
+        Write requests to a JSONL batch file and submit it.
+
+        Args:
+            requests: Requests built by build_batch_request.
+            input_path: Batch file to write.
+
+        Returns:
+            Batch ID.
+        """
+        input_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(input_path, "w", encoding="utf-8") as f:
+            for request in requests:
+                f.write(json.dumps(request) + "\n")
+
+        metrics.increment("ai_requests", len(requests), mode="batch")
+        with metrics.span("batch_submit"):
+            return self.batch_backend.submit(input_path)
+
+    def get_batch_status(self, batch_id: str) -> BatchStatus:
+        """
+        Get the progress of a submitted batch.
+
+        Args:
+            batch_id: Batch ID returned by submit_batch.
+
+        Returns:
+            Current status.
+        """
+        return self.batch_backend.retrieve(batch_id)
+
+    def get_batch_results(
+        self, batch_id: str, cache_keys: Optional[Dict[str, str]] = None
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Collect the README content generated by a finished batch.
+
+        Args:
+            batch_id: Batch ID returned by submit_batch.
+            cache_keys: Cache key per custom ID, to cache successful responses.
+
+        Returns:
+            Markdown content per custom ID, and error messages per custom ID.
+        """
+        cache_keys = cache_keys or {}
+        contents: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+
+        for result in self.batch_backend.results(batch_id):
+            custom_id = result.get("custom_id")
+            response = result.get("response") or {}
+            body = response.get("body") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                error = result.get("error") or body.get("error") or response
+                errors[custom_id] = str(error)
+                continue
+
+            usage = body.get("usage")
+            if usage:
+                details = usage.get("input_tokens_details") or {}
+                self._record_tokens(
+                    usage.get("input_tokens", 0),
+                    details.get("cached_tokens", 0),
+                    usage.get("output_tokens", 0),
+                )
+
+            response_content = "".join(
+                part.get("text", "")
+                for item in body.get("output", [])
+                if item.get("type") == "message"
+                for part in item.get("content", [])
+                if part.get("type") == "output_text"
+            )
+            if self.cache and response_content and custom_id in cache_keys:
+                self.cache.put(cache_keys[custom_id], response_content)
+            contents[custom_id] = self._parse_response(response_content)
+
+        return contents, errors
+
+    def _complete(
+        self,
+        system_message: str,
+        prompt: str,
+        images: Optional[List[PayloadImage]] = None,
+    ) -> str:
+        """Send a prompt to the model, answering from the cache when possible."""
+        images = images or []
+
+        cache_key = self._cache_key(system_message, prompt, images)
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                metrics.increment("ai_cache_hits")
+                return cached
+
+        metrics.increment("ai_requests", mode="blocking")
+        with metrics.span("ai_request", mode="blocking"):
+            response = self._create_response(
+                self._estimate_request_tokens(system_message, prompt, images),
+                model=self.MODEL,
+                input=self._build_input(system_message, prompt, images),
+                temperature=self.TEMPERATURE,
+                extra_body={"prompt_cache_key": self._prompt_cache_key(system_message)},
+            )
+        response_content = response.output_text
+        if response.usage:
+            self._record_usage(response.usage)
+
+        if self.cache and response_content:
+            self.cache.put(cache_key, response_content)
+        return response_content
+
+    def _client(self) -> Any:
+        """Get the configured OpenAI module, importing it on first use."""
+        with self._openai_lock:
+            if self._openai is None:
+                # Deferred so runs that never call the model skip the heavy import
+                import openai
+
+                openai.api_key = self.api_key
+                # Retries are scheduled by _create_response
+                openai.max_retries = 0
+                if self.base_url:
+                    openai.base_url = self.base_url
+                self._openai = openai
+        return self._openai
+
+    def _create_response(self, tokens: int, **request: Any) -> Any:
+        """
+        Send a Responses API request within the rate limits, retrying transient errors.
+
+        Rate-limit headers of every response adjust the shared budgets. A 429
+        pauses all requests; other transient errors back off this request only.
+
+        Args:
+            tokens: Estimated tokens of the request, including its output.
+            **request: Arguments of the request.
+
+        Returns:
+            Parsed response, or the event stream of a streaming request.
+        """
+        openai = self._client()
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(tokens)
+            try:
+                raw_response = openai.responses.with_raw_response.create(**request)
+            except (
+                openai.RateLimitError,
+                openai.APIConnectionError,
+                openai.InternalServerError,
+            ) as e:
+                if attempt >= self.max_retries:
+                    raise
+
+                headers = getattr(getattr(e, "response", None), "headers", None) or {}
+                self.rate_limiter.update(headers)
+                delay = RateLimiter.backoff(
+                    attempt,
+                    self.BACKOFF_BASE_SECONDS,
+                    self.BACKOFF_MAX_SECONDS,
+                    self._retry_after(headers),
+                )
+                rate_limited = isinstance(e, openai.RateLimitError)
+                reason = "rate_limit" if rate_limited else type(e).__name__
+                metrics.increment("ai_retries", reason=reason)
+                print(f"Request failed ({reason}), retrying in {delay:.1f}s")
+
+                if rate_limited:
+                    # Hold back every request, not just this one
+                    self.rate_limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+                attempt += 1
+                continue
+
+            self.rate_limiter.update(raw_response.headers)
+            return raw_response.parse()
+
+    def _estimate_request_tokens(
+        self, system_message: str, prompt: str, images: List[PayloadImage]
+    ) -> int:
+        """Estimate the tokens a request counts against the token budget."""
+        return (
+            estimate_tokens(system_message)
+            + estimate_tokens(prompt)
+            + len(images) * IMAGE_TOKENS
+            + self.RESERVED_OUTPUT_TOKENS
+        )
+
+    @staticmethod
+    def _retry_after(headers: Any) -> Optional[float]:
+        """Get the delay the provider asked for before retrying, if any."""
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return float(retry_after_ms) / 1000
+            except ValueError:
+                pass
+        return parse_duration(headers.get("retry-after"))
+
+    def _record_usage(self, usage: Any) -> None:
+        """Record token usage reported by the API in the run metrics."""
+        details = getattr(usage, "input_tokens_details", None)
+        self._record_tokens(
+            usage.input_tokens,
+            getattr(details, "cached_tokens", 0) or 0,
+            usage.output_tokens,
+        )
+
+    def _record_tokens(
+        self, input_tokens: int, cached_tokens: int, output_tokens: int
+    ) -> None:
+        """Record input tokens split by prompt cache hits, and output tokens."""
+        metrics.increment("input_tokens", input_tokens)
+        metrics.increment("cached_input_tokens", cached_tokens)
+        metrics.increment("uncached_input_tokens", input_tokens - cached_tokens)
+        metrics.increment("output_tokens", output_tokens)
+
+    def _cache_key(
+        self, system_message: str, prompt: str, images: List[PayloadImage]
+    ) -> str:
+        """Build the response cache key of a request."""
+        return ResponseCache.make_key(
+            model=self.MODEL,
+            temperature=self.TEMPERATURE,
+            system=system_message,
+            prompt=prompt,
+            images=[image.sha for image in images],
+        )
+
+    def _prompt_cache_key(self, system_message: str) -> str:
+        """Get the key routing requests that share a static prefix to the same cache."""
+        digest = hashlib.sha256(
+            f"{self.MODEL}\n{system_message}".encode("utf-8")
+        ).hexdigest()
+        return f"readmegen-{digest[:16]}"
+
+    def _build_input(
+        self, system_message: str, prompt: str, images: List[PayloadImage]
+    ) -> List[Dict[str, Any]]:
+        """Build the input messages of a request."""
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": self._build_user_content(prompt, images)},
+        ]
+
+    def _build_user_content(
+        self, prompt: str, images: List[PayloadImage]
+    ) -> Union[str, List[Dict[str, str]]]:
+        """Build the user message content, adding images as image inputs."""
+        if not images:
+            return prompt
+        return [{"type": "input_text", "text": prompt}] + [
+            {"type": "input_image", "image_url": image.data_url} for image in images
+        ]
+
+    def _build_prompt(self, file_content: str, update: bool = False) -> str:
+        """
+        Build the complete prompt for AI.
+
+        The static instructions come first and the project content last, so
+        requests share the longest possible prefix for provider prompt caching.
+        """
+        if update:
+            base_prompt = self.prompts.get_readme_update_prompt()
+        else:
+            base_prompt = self.prompts.get_readme_generation_prompt()
         return f"{base_prompt}\n\n{file_content}"
 
     def _parse_response(self, response_content: str) -> str:
         """Parse AI response and extract markdown content."""
         try:
             result = json.loads(response_content)
-            return result.get("markdown", "")
+            return replace_surrogates(result.get("markdown", ""))
         except json.JSONDecodeError:
             print("Warning: Could not parse JSON response, using raw content")
             return response_content
@@ -0,0 +1,98 @@
+"""Backends running batches of model requests asynchronously."""
+
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+
+from models.batch_status import BatchStatus
+
+
+class BatchBackend(ABC):
+    """Interface of a service running JSONL batches of Responses API requests."""
+
+    @abstractmethod
+    def submit(self, input_path: Path) -> str:
+        """
+        Submit a batch.
+
+        Args:
+            input_path: JSONL file with one request per line.
+
+        Returns:
+            Batch ID.
+        """
+
+    @abstractmethod
+    def retrieve(self, batch_id: str) -> BatchStatus:
+        """
+        Get the progress of a batch.
+
+        Args:
+            batch_id: Batch ID returned by submit.
+
+        Returns:
+            Current status.
+        """
+
+    @abstractmethod
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Read the results of a finished batch.
+
+        Args:
+            batch_id: Batch ID returned by submit.
+
+        Yields:
+            One result line per request, with custom_id, response and error.
+        """
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Runs batches through the OpenAI Batch API."""
+
+    ENDPOINT = "/v1/responses"
+    COMPLETION_WINDOW = "24h"
+
+    def __init__(self, client: Callable[[], Any]):
+        """
+        Initialize OpenAI batch backend.
+
+        Args:
+            client: Returns the configured OpenAI client.
+        """
+        self._client = client
+
+    def submit(self, input_path: Path) -> str:
+        """Upload the JSONL file and create a batch from it."""
+        client = self._client()
+        with open(input_path, "rb") as f:
+            input_file = client.files.create(file=f, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=self.ENDPOINT,
+            completion_window=self.COMPLETION_WINDOW,
+        )
+        return batch.id
+
+    def retrieve(self, batch_id: str) -> BatchStatus:
+        """Get the progress of a batch from the API."""
+        batch = self._client().batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return BatchStatus(
+            batch.status,
+            counts.completed if counts else 0,
+            counts.failed if counts else 0,
+            counts.total if counts else 0,
+        )
+
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        """Download the output and error files of a batch."""
+        client = self._client()
+        batch = client.batches.retrieve(batch_id)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in client.files.content(file_id).text.splitlines():
+                if line.strip():
+                    yield json.loads(line)
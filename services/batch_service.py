@@ -0,0 +1,244 @@
+"""Bulk README generation through asynchronous batches."""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from models.batch_status import BatchStatus
+from models.project import Project
+from models.project_result import ProjectResult
+from services.project_service import ProjectService
+from utils.metrics import metrics
+
+
+class BatchService:
+    """Service submitting all pending projects as one batch and writing the results."""
+
+    def __init__(
+        self, project_service: ProjectService, directory: Path, poll_seconds: float
+    ):
+        """
+        Initialize batch service.
+
+        Args:
+            project_service: Project service whose change detection and payloads
+                are reused.
+            directory: Directory for batch files and the resumable state file.
+            poll_seconds: Seconds between batch status checks.
+        """
+        self.project_service = project_service
+        self.ai_service = project_service.ai_service
+        self.settings = project_service.settings
+        self.directory = Path(directory)
+        self.state_path = self.directory / "state.json"
+        self.poll_seconds = poll_seconds
+
+    def run(self) -> List[ProjectResult]:
+        """
+        Submit a batch, or resume the pending one, and write its results.
+
+        Returns:
+            Results of the projects answered by the batch.
+        """
+        try:
+            state = self._load_state()
+            if state:
+                print(
+                    f"Resuming batch {state['batch_id']} with "
+                    f"{len(state['projects'])} project(s) at commit {state['commit']}"
+                )
+            else:
+                state = self._submit()
+                if not state:
+                    return []
+
+            try:
+                status = self._wait(state["batch_id"])
+            except KeyboardInterrupt:
+                print("\nStopped waiting. Run with --batch again to resume.")
+                return []
+
+            results = self._write_results(state, status)
+            self._clear_state(state)
+        finally:
+            self.project_service.close()
+        self.project_service.print_summary(results)
+        return results
+
+    def _submit(self) -> Optional[Dict[str, Any]]:
+        """Prepare every project, answer what is cached and submit the rest."""
+        project_service = self.project_service
+        with metrics.span("discovery"):
+            projects = project_service.discover_projects()
+        if not projects:
+            print("No projects found.")
+            return None
+
+        current_commit = project_service.git_service.get_current_commit_sha()
+        changed_files = {}
+        if self.settings.batch_change_detection:
+            with metrics.span("change_detection", mode="batch"):
+                changed_files = project_service.detect_changes(projects)
+
+        requests = []
+        pending: Dict[str, Dict[str, str]] = {}
+        handled: List[ProjectResult] = []
+
+        for project in projects:
+            print(f'\nPreparing project "{project.name}" at "{project.root_path}" ...')
+            with metrics.project_scope(project.name, str(project.root_path)):
+                try:
+                    status = project_service.check_project(
+                        project, current_commit, changed_files.get(project.root_path)
+                    )
+                    if status:
+                        handled.append(self._result(project, status))
+                        continue
+
+                    payload = project_service.build_payload(project, current_commit)
+                    cache_key = self.ai_service.readme_cache_key(
+                        payload.content, payload.images, payload.update
+                    )
+                    cached = self.ai_service.cached_readme_content(cache_key)
+                    if cached is not None:
+                        saved = project_service.save_readme(
+                            project, cached, current_commit
+                        )
+                        handled.append(
+                            self._result(
+                                project,
+                                ProjectResult.UPDATED if saved else ProjectResult.EMPTY,
+                            )
+                        )
+                        continue
+
+                    custom_id = f"project-{len(requests)}"
+                    requests.append(
+                        self.ai_service.build_batch_request(
+                            custom_id, payload.content, payload.images, payload.update
+                        )
+                    )
+                    pending[custom_id] = {
+                        "name": project.name,
+                        "root": str(project.root_path),
+                        "pyproject": str(project.pyproject_toml_path),
+                        "cache_key": cache_key,
+                    }
+                except Exception as e:
+                    print(f'ERROR preparing project "{project.name}": {e}')
+                    handled.append(self._result(project, ProjectResult.FAILED, str(e)))
+
+        if handled:
+            print("\nHandled without the batch:")
+            project_service.print_summary(handled)
+        if not requests:
+            print("\nNothing to submit.")
+            return None
+
+        input_path = self.directory / f"batch-{current_commit[:12]}.jsonl"
+        batch_id = self.ai_service.submit_batch(requests, input_path)
+        state = {
+            "batch_id": batch_id,
+            "commit": current_commit,
+            "input_path": str(input_path),
+            "submitted_at": time.time(),
+            "projects": pending,
+        }
+        self._save_state(state)
+        print(f"\nSubmitted batch {batch_id} with {len(requests)} request(s)")
+        return state
+
+    def _wait(self, batch_id: str) -> BatchStatus:
+        """Poll the batch until it finishes, printing progress as it changes."""
+        last_progress = None
+        while True:
+            status = self.ai_service.get_batch_status(batch_id)
+            progress = (status.state, status.completed, status.failed)
+            if progress != last_progress:
+                print(
+                    f"Batch {batch_id}: {status.state}, {status.completed} completed, "
+                    f"{status.failed} failed of {status.total}"
+                )
+                last_progress = progress
+            if status.done:
+                return status
+            time.sleep(self.poll_seconds)
+
+    def _write_results(
+        self, state: Dict[str, Any], status: BatchStatus
+    ) -> List[ProjectResult]:
+        """Map batch results back to their projects and write the READMEs."""
+        if status.state != "completed":
+            print(f"Warning: Batch ended as {status.state}, writing available results")
+
+        cache_keys = {
+            custom_id: entry["cache_key"]
+            for custom_id, entry in state["projects"].items()
+        }
+        contents, errors = self.ai_service.get_batch_results(
+            state["batch_id"], cache_keys
+        )
+
+        results = []
+        for custom_id, entry in state["projects"].items():
+            project = Project(
+                name=entry["name"],
+                root_path=Path(entry["root"]),
+                pyproject_toml_path=Path(entry["pyproject"]),
+            )
+            with metrics.project_scope(project.name, str(project.root_path)):
+                if custom_id in contents:
+                    try:
+                        saved = self.project_service.save_readme(
+                            project, contents[custom_id], state["commit"]
+                        )
+                        status_name = (
+                            ProjectResult.UPDATED if saved else ProjectResult.EMPTY
+                        )
+                        results.append(self._result(project, status_name))
+                    except OSError as e:
+                        print(f'ERROR writing README of "{project.name}": {e}')
+                        results.append(
+                            self._result(project, ProjectResult.FAILED, str(e))
+                        )
+                else:
+                    error = errors.get(custom_id, f"No result, batch {status.state}")
+                    print(f'ERROR generating README of "{project.name}": {error}')
+                    results.append(self._result(project, ProjectResult.FAILED, error))
+        return results
+
+    def _result(
+        self, project: Project, status: str, error: Optional[str] = None
+    ) -> ProjectResult:
+        """Record the outcome of a project in the run metrics."""
+        metrics.increment("projects", status=status)
+        return ProjectResult(project, status, error=error)
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        """Load the state of a batch submitted by an earlier run, if any."""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load batch state {self.state_path}: {e}")
+            return None
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        """Write the batch state so a later run can resume it."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self.state_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, self.state_path)
+
+    def _clear_state(self, state: Dict[str, Any]) -> None:
+        """Remove the state and input files of a finished batch."""
+        for path in (self.state_path, Path(state["input_path"])):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
@@ -1,43 +1,135 @@
 """File operations service."""
 
+import codecs
+import io
 import json
+import os
 import re
-import base64
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
 
 import tomli
 
 from config.settings import Settings
 from models.project import Project
+from utils.file_rules import ProjectFileRules
+from utils.generated_files import GeneratedFileDetector
+from utils.gitignore import GitignoreRules, is_ignored
+from utils.metrics import metrics
+from utils.path_trie import is_under_prefix, relative_prefix
 
 
 class FileService:
     """Service for file operations."""
 
-    def __init__(self):
-        """Initialize file service."""
-        self.settings = Settings()
+    IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp"}
+    BINARY_EXTENSIONS = {
+        ".so", ".dylib", ".dll", ".exe", ".bin", ".o", ".a", ".pyc", ".pyd",
+        ".whl", ".egg", ".zip", ".tar", ".gz", ".bz2", ".xz", ".7z", ".jar",
+        ".pdf", ".ico", ".tiff", ".woff", ".woff2", ".ttf", ".otf", ".eot",
+        ".mp3", ".mp4", ".wav", ".mov", ".avi", ".sqlite", ".db", ".pkl",
+        ".npy", ".npz", ".parquet", ".onnx", ".pt", ".h5",
+    }  # fmt: skip
+    CHUNK_SIZE = 48 * 1024
+    SNIFF_SIZE = 8 * 1024
+    BASE_COMMIT_PATTERN = re.compile(
+        r"<!--\s*Last\s+updated:\s*([a-f0-9]+)\s*-->", re.IGNORECASE
+    )
+
+    def __init__(self, settings: Settings):
+        """
+        Initialize file service.
+
+        Args:
+            settings: Application settings.
+        """
+        self.settings = settings
+        self.generated_detector = None
+        if settings.generated_file_detection:
+            self.generated_detector = GeneratedFileDetector()
+        self._project_rules: Dict[Path, Tuple[Tuple[int, int], ProjectFileRules]] = {}
 
     def find_pyproject_toml_files(self, start_directory: Path) -> List[Path]:
         """
         Find all pyproject.toml files in directory tree.
 
+        Excluded and git-ignored directories are pruned before descending.
+
         Args:
             start_directory: Directory to start search from.
 
         Returns:
             List of pyproject.toml file paths.
         """
-        results = []
+        return sorted(
+            path
+            for path, is_dir in self.walk(start_directory)
+            if not is_dir and path.name == "pyproject.toml" and path.is_file()
+        )
+
+    def find_directories(self, start_directory: Path) -> List[Path]:
+        """
+        Find the directories of a tree that are neither excluded nor git-ignored.
+
+        Args:
+            start_directory: Directory to start search from.
+
+        Returns:
+            The start directory followed by all directories below it.
+        """
+        return [start_directory] + [
+            path for path, is_dir in self.walk(start_directory) if is_dir
+        ]
+
+    def walk(self, start_directory: Path) -> Iterator[Tuple[Path, bool]]:
+        """
+        Walk a directory tree, pruning excluded and git-ignored entries.
+
+        Args:
+            start_directory: Directory to start from.
+
+        Yields:
+            Path of each remaining entry and whether it is a directory.
+        """
+        excluded = set(self.settings.excluded_directories)
+        stack: List[Tuple[Path, List[GitignoreRules]]] = [(start_directory, [])]
 
-        for item in start_directory.rglob("*"):
-            if item.name in self.settings.excluded_directories:
+        while stack:
+            directory, rules = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                print(f"Error scanning {directory}: {e}")
                 continue
-            if item.name == "pyproject.toml" and item.is_file():
-                results.append(item)
 
-        return results
+            if any(entry.name == ".gitignore" for entry in entries):
+                directory_rules = GitignoreRules.from_directory(directory)
+                if directory_rules:
+                    rules = rules + [directory_rules]
+
+            for entry in entries:
+                if entry.name in excluded:
+                    continue
+
+                is_dir = entry.is_dir(follow_symlinks=False)
+                entry_path = Path(entry.path)
+                if rules and is_ignored(rules, entry_path, is_dir):
+                    continue
+
+                if is_dir:
+                    stack.append((entry_path, rules))
+                yield entry_path, is_dir
 
     def read_pyproject_toml(
         self, pyproject_toml_path: Path
@@ -73,14 +165,38 @@ class FileService:
 
         try:
             content = self.read_file(readme_path)
-            match = re.search(
-                r"<!--\s*Last\s+updated:\s*([a-f0-9]+)\s*-->", content, re.IGNORECASE
-            )
+            match = self.BASE_COMMIT_PATTERN.search(content)
             return match.group(1) if match else None
         except Exception as e:
             print(f"Error extracting base commit from {readme_path}: {e}")
             return None
 
+    def update_base_commit(self, readme_path: Path, commit: str) -> bool:
+        """
+        Point the Last updated marker of an existing README at another commit.
+
+        Args:
+            readme_path: Path to README.md file.
+            commit: Commit SHA to record.
+
+        Returns:
+            True if the marker was found and updated.
+        """
+        try:
+            content = self.read_file(readme_path)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading {readme_path}: {e}")
+            return False
+
+        updated, count = self.BASE_COMMIT_PATTERN.subn(
+            f"<!-- Last updated: {commit} -->", content, count=1
+        )
+        if not count:
+            return False
+        if updated != content:
+            self.write_file(readme_path, updated)
+        return True
+
     def read_file(self, file_path: Path) -> str:
         """
         Read file content as string.
@@ -104,12 +220,41 @@ class FileService:
         """
         with open(file_path, "w", encoding="utf-8") as f:
             f.write(content)
+        metrics.increment("bytes_written", len(content.encode("utf-8")))
+
+    @contextmanager
+    def open_atomic(self, file_path: Path) -> Iterator[TextIO]:
+        """
+        Open a temporary file that replaces the target file once fully written.
+
+        The target is left untouched if the block raises.
+
+        Args:
+            file_path: Path to the file to replace.
+
+        Yields:
+            Text stream of the temporary file.
+        """
+        temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                yield f
+                written = f.tell()
+            os.replace(temp_path, file_path)
+            metrics.increment("bytes_written", written)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
 
     def filter_project_files(
         self, project: Project, file_paths: List[str]
     ) -> List[str]:
         """
-        Filter files to include only those within project root and exclude README.md and poetry.lock.
+        Filter files to those within the project root that are worth sending.
+
+        README.md files are always dropped. The project's include and exclude
+        globs from [tool.readmegen] in its pyproject.toml apply next, then the
+        generated and vendored file checks by path.
 
         Args:
             project: Project instance.
@@ -118,61 +263,195 @@ class FileService:
         Returns:
             Filtered list of file paths.
         """
-        filtered_files = []
+        prefix = relative_prefix(project.root_path, Path.cwd())
+        rules = self.project_file_rules(project)
 
+        kept = []
         for file_path in file_paths:
-            path_obj = Path(file_path)
+            if not is_under_prefix(file_path, prefix):
+                continue
+            if file_path.rsplit("/", 1)[-1] == "README.md":
+                continue
+            relative = file_path if prefix == "." else file_path[len(prefix) + 1 :]
+            reason = rules.exclusion_reason(relative)
+            if reason:
+                metrics.increment("files_excluded", reason=reason)
+                continue
+            kept.append(file_path)
+        return kept
 
-            try:
-                # Check if file is within project root
-                path_obj.resolve().relative_to(project.root_path.resolve())
+    def project_file_rules(self, project: Project) -> ProjectFileRules:
+        """
+        Get the compiled file rules of a project, reading them once per change.
 
-                # Exclude README.md and poetry.lock files
-                if path_obj.name not in ["README.md", "poetry.lock"]:
-                    filtered_files.append(file_path)
+        Args:
+            project: Project whose pyproject.toml holds the rules.
 
-            except ValueError:
-                # File is not within project root
-                continue
+        Returns:
+            File rules of the project.
+        """
+        path = project.pyproject_toml_path
+        try:
+            stat = path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = (0, 0)
+
+        cached = self._project_rules.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        config: Dict[str, Any] = {}
+        if signature != (0, 0):
+            package_data = self.read_pyproject_toml(path) or {}
+            tool = package_data.get("tool", {})
+            config = tool.get("readmegen", {}) if isinstance(tool, dict) else {}
+        if not isinstance(config, dict):
+            print(f"Warning: Ignoring tool.readmegen in {path}: not a table")
+            config = {}
+
+        rules = ProjectFileRules.from_config(config, str(path), self.generated_detector)
+        self._project_rules[path] = (signature, rules)
+        return rules
+
+    def iter_file_chunks(
+        self,
+        file_path: str,
+        read_blob: Optional[Callable[[str], Optional[bytes]]] = None,
+    ) -> Iterator[str]:
+        """
+        Stream one file as a payload section: its path followed by its content.
+
+        Images, which the payload builder attaches as image inputs, files with
+        a known binary extension and files whose first chunk is not UTF-8 text
+        are skipped.
 
-        return filtered_files
+        Args:
+            file_path: File path.
+            read_blob: Optional reader returning the file's committed content.
 
-    def concatenate_file_contents(self, file_paths: List[str]) -> str:
+        Yields:
+            Consecutive chunks of the section; nothing for missing or binary files.
+        """
+        suffix = Path(file_path).suffix.lower()
+        if suffix in self.BINARY_EXTENSIONS or suffix in self.IMAGE_EXTENSIONS:
+            return
+
+        source = self._open_source(file_path, read_blob)
+        if source is None:
+            return
+
+        with source:
+            detector = self.generated_detector
+            if detector:
+                reason = detector.match_size(file_path, self._source_size(source))
+                if reason:
+                    self._skip_generated(file_path, reason)
+                    return
+
+            first_chunk = source.read(self.CHUNK_SIZE)
+            self._count_bytes_read(first_chunk, read_blob)
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            try:
+                if b"\0" in first_chunk[: self.SNIFF_SIZE]:
+                    raise ValueError("NUL byte found")
+                text = decoder.decode(first_chunk)
+            except ValueError:
+                print(f"Skipping binary file {file_path}")
+                return
+
+            if detector:
+                reason = detector.match_content(file_path, first_chunk)
+                if reason:
+                    self._skip_generated(file_path, reason)
+                    return
+
+            yield f"{file_path}\n"
+            yield text
+
+            decoder.errors = "replace"
+            while chunk := source.read(self.CHUNK_SIZE):
+                self._count_bytes_read(chunk, read_blob)
+                yield decoder.decode(chunk)
+            yield decoder.decode(b"", final=True)
+            yield "\n\n"
+
+    def read_bytes(
+        self,
+        file_path: str,
+        read_blob: Optional[Callable[[str], Optional[bytes]]] = None,
+        max_size: Optional[int] = None,
+    ) -> Optional[bytes]:
         """
-        Concatenate file paths and their contents.
-        For text files, reads the content directly.
-        For image files, encodes them in base64.
+        Read a file's raw content from git or the working tree.
 
         Args:
-            file_paths: List of file paths.
+            file_path: File path.
+            read_blob: Optional reader returning the file's committed content.
+            max_size: Optional size in bytes above which the file is skipped
+                without being read.
 
         Returns:
-            Concatenated content string.
+            File content, or None if the file cannot be read or is too large.
         """
-        content = ""
-        image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'}
+        source = self._open_source(file_path, read_blob)
+        if source is None:
+            return None
+        with source:
+            size = self._source_size(source)
+            if max_size is not None and size > max_size:
+                print(f"Skipping {file_path}: {size} bytes exceeds {max_size}")
+                return None
+            data = source.read()
+        self._count_bytes_read(data, read_blob)
+        return data
+
+    def _skip_generated(self, file_path: str, reason: str) -> None:
+        """Report a file left out by the generated file checks."""
+        print(f"Skipping {reason} {file_path}")
+        metrics.increment("files_excluded", reason=reason)
+
+    @staticmethod
+    def _source_size(source: BinaryIO) -> int:
+        """Get the size of an opened file or blob without reading it."""
+        if isinstance(source, io.BytesIO):
+            return source.getbuffer().nbytes
+        return os.fstat(source.fileno()).st_size
+
+    def _count_bytes_read(
+        self, data: bytes, read_blob: Optional[Callable[[str], Optional[bytes]]]
+    ) -> None:
+        """Record bytes read for the payload in the run metrics."""
+        metrics.increment(
+            "bytes_read", len(data), source="git" if read_blob else "disk"
+        )
+
+    def _open_source(
+        self,
+        file_path: str,
+        read_blob: Optional[Callable[[str], Optional[bytes]]],
+    ) -> Optional[BinaryIO]:
+        """Open a file from git or the working tree as a binary stream."""
+        if read_blob:
+            data = read_blob(file_path)
+            return None if data is None else io.BytesIO(data)
 
-        for file_path in file_paths:
-            path_obj = Path(file_path)
+        try:
+            return open(file_path, "rb")
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Error reading {file_path}: {e}")
+            return None
 
-            if not path_obj.exists():
-                continue
 
-            content += f"{file_path}\n"
+def utf8_length(text: str) -> int:
+    """Get the UTF-8 encoded size of a string."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
 
-            try:
-                if path_obj.suffix.lower() in image_extensions:
-                    # Handle image files
-                    with open(path_obj, 'rb') as img_file:
-                        img_data = base64.b64encode(
-                            img_file.read()).decode('utf-8')
-                        content += f"[IMAGE_BASE64:{path_obj.suffix}]\n{img_data}\n\n"
-                else:
-                    # Handle text files
-                    file_content = self.read_file(path_obj)
-                    content += f"{file_content}\n\n"
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
-                continue
 
-        return content
+def truncate_utf8(text: str, max_bytes: int) -> str:
+    """Cut a string so that its UTF-8 encoding fits into max_bytes."""
+    if utf8_length(text) <= max_bytes:
+        return text
+    return text.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore")
@@ -1,21 +1,163 @@
 """Git operations service."""
 
+import asyncio
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from utils.command_runner import CommandRunner
+from utils.command_runner import CommandError, CommandRunner
+from utils.git_cat_file import GitCatFile
+from utils.path_trie import PathTrie, relative_prefix
 
 
 class GitService:
     """Service for Git operations."""
 
-    def __init__(self):
-        """Initialize Git service."""
-        self.command_runner = CommandRunner()
+    def __init__(self, command_runner: Optional[CommandRunner] = None):
+        """
+        Initialize Git service.
+
+        Args:
+            command_runner: Runner for git commands, shared with other services.
+        """
+        self.command_runner = command_runner or CommandRunner()
+        self.cat_file = GitCatFile()
 
     def get_current_commit_sha(self) -> str:
         """Get the current commit SHA."""
-        return self.command_runner.run("git rev-parse HEAD")
+        return self.command_runner.run(["git", "rev-parse", "HEAD"])
+
+    def read_blob(self, file_path: str, revision: str = "HEAD") -> Optional[bytes]:
+        """
+        Read a file's content as stored in a commit.
+
+        All reads share one persistent git cat-file process.
+
+        Args:
+            file_path: File path relative to the working directory.
+            revision: Commit to read the file from.
+
+        Returns:
+            File content, or None if the file does not exist in the commit.
+        """
+        return self.cat_file.read(f"{revision}:./{file_path}")
+
+    def get_blob_shas(
+        self, project_root: Path, revision: str = "HEAD"
+    ) -> Dict[str, str]:
+        """
+        Get the blob SHA of every file of a project in a commit.
+
+        Args:
+            project_root: Root directory of the project.
+            revision: Commit to list.
+
+        Returns:
+            Blob SHA per file path relative to the working directory.
+        """
+        output = self.command_runner.run(
+            ["git", "ls-tree", "-r", "-z", revision, "--", str(project_root)]
+        )
+
+        blob_shas = {}
+        for entry in self._parse_nul_list(output):
+            info, file_path = entry.split("\t", 1)
+            _, object_type, sha = info.split()
+            if object_type == "blob":
+                blob_shas[file_path] = sha
+        return blob_shas
+
+    def get_blob_sizes(self, revision: str = "HEAD") -> Dict[str, int]:
+        """
+        Get the size of every file below the working directory in a commit.
+
+        Args:
+            revision: Commit to list.
+
+        Returns:
+            Size in bytes per file path relative to the working directory.
+        """
+        output = self.command_runner.run(["git", "ls-tree", "-r", "-l", "-z", revision])
+
+        blob_sizes = {}
+        for entry in self._parse_nul_list(output):
+            info, file_path = entry.split("\t", 1)
+            _, object_type, _, size = info.split()
+            if object_type == "blob":
+                blob_sizes[file_path] = int(size)
+        return blob_sizes
+
+    def close(self) -> None:
+        """Release git processes held by the service."""
+        self.cat_file.close()
+
+    def find_tracked_files(self, directory: Path, file_name: str) -> List[Path]:
+        """
+        Find tracked files with the given name using a single git query.
+
+        Args:
+            directory: Directory to search in.
+            file_name: Exact file name to look for.
+
+        Returns:
+            List of absolute file paths.
+        """
+        output = self.command_runner.run(
+            ["git", "ls-files", "-z", "--", f"{directory}/*{file_name}"]
+        )
+        paths = [Path.cwd() / path for path in output.split("\0") if path]
+        return sorted(path for path in paths if path.name == file_name)
+
+    def get_git_directory(self) -> Path:
+        """Get the absolute path of the repository's .git directory."""
+        return Path(self.command_runner.run(["git", "rev-parse", "--absolute-git-dir"]))
+
+    def get_working_tree_changes(self) -> List[str]:
+        """
+        Get modified, deleted and untracked files that are not git-ignored.
+
+        Returns:
+            File paths relative to the working directory.
+        """
+        output = self.command_runner.run(
+            ["git", "ls-files", "-z", "--modified", "--others", "--exclude-standard"]
+        )
+        return sorted(set(self._parse_nul_list(output)))
+
+    def get_diff_files(self, base_commit: str, head_commit: str) -> List[str]:
+        """
+        Get all files changed between two commits.
+
+        Args:
+            base_commit: Older commit.
+            head_commit: Newer commit.
+
+        Returns:
+            File paths relative to the working directory.
+        """
+        output = self.command_runner.run(
+            ["git", "diff", "-z", "--name-only", "--relative", base_commit, head_commit]
+        )
+        return self._parse_nul_list(output)
+
+    def get_diff(
+        self, base_commit: str, head_commit: Optional[str], file_paths: List[str]
+    ) -> str:
+        """
+        Get the unified diff of files since a commit.
+
+        Args:
+            base_commit: Older commit.
+            head_commit: Newer commit, or None to compare with the working tree.
+            file_paths: Files to include, relative to the working directory.
+
+        Returns:
+            Unified diff with renames detected.
+        """
+        command = ["git", "diff", "--no-color", "--no-ext-diff", "-M", "--unified=3"]
+        command.append(base_commit)
+        if head_commit:
+            command.append(head_commit)
+        return self.command_runner.run(command + ["--", *file_paths])
 
     def get_changed_files(
         self, project_root: Path, base_commit: Optional[str] = None
@@ -35,13 +177,124 @@ class GitService:
         else:
             return self._get_all_tracked_files(project_root)
 
+    def get_changed_files_batch(
+        self, projects: List[Tuple[Path, Optional[str]]]
+    ) -> Dict[Path, List[str]]:
+        """
+        Get changed files for many projects with one git query per base commit.
+
+        Projects are grouped by base commit, each group is queried once and the
+        output is partitioned to project roots by path prefix. The queries of
+        all groups run concurrently.
+
+        Args:
+            projects: Pairs of project root and base commit (None for all files).
+
+        Returns:
+            Changed file paths, relative to the working directory, per project root.
+        """
+        return asyncio.run(self.get_changed_files_batch_async(projects))
+
+    async def get_changed_files_batch_async(
+        self, projects: List[Tuple[Path, Optional[str]]]
+    ) -> Dict[Path, List[str]]:
+        """
+        Get changed files for many projects without blocking the event loop.
+
+        Args:
+            projects: Pairs of project root and base commit (None for all files).
+
+        Returns:
+            Changed file paths, relative to the working directory, per project root.
+        """
+        cwd = Path.cwd()
+        changed: Dict[Path, List[str]] = {root: [] for root, _ in projects}
+        groups: Dict[Optional[str], List[Tuple[Path, str]]] = {}
+        outside: List[Tuple[Path, Optional[str]]] = []
+
+        for root, base_commit in projects:
+            prefix = relative_prefix(root, cwd)
+            if prefix.startswith("../"):
+                # Outside the working directory, so not covered by --relative output
+                outside.append((root, base_commit))
+            else:
+                groups.setdefault(base_commit, []).append((root, prefix))
+
+        group_items = list(groups.items())
+        results = await asyncio.gather(
+            *(
+                self._get_group_files(base_commit, members)
+                for base_commit, members in group_items
+            ),
+            *(
+                self._get_changed_files_async(root, base_commit)
+                for root, base_commit in outside
+            ),
+        )
+
+        for (base_commit, members), file_paths in zip(group_items, results):
+            trie: PathTrie[Path] = PathTrie()
+            for root, prefix in members:
+                trie.insert(prefix, root)
+
+            for file_path in file_paths:
+                for root in trie.find_all(file_path):
+                    changed[root].append(file_path)
+
+        for (root, _), file_paths in zip(outside, results[len(group_items) :]):
+            changed[root] = file_paths
+
+        return changed
+
+    async def _get_group_files(
+        self, base_commit: Optional[str], members: List[Tuple[Path, str]]
+    ) -> List[str]:
+        """Get changed files below all given prefixes in a single git query."""
+        pathspecs = [prefix for _, prefix in members]
+
+        if base_commit:
+            command = ["git", "diff", "-z", "--name-only", "--relative"]
+            command += [base_commit, "HEAD", "--", *pathspecs]
+            try:
+                return self._parse_nul_list(
+                    await self.command_runner.run_async(command)
+                )
+            except CommandError:
+                print(
+                    f"Error getting diff against {base_commit}. "
+                    "Falling back to all tracked files."
+                )
+
+        command = ["git", "ls-files", "-z", "--", *pathspecs]
+        return self._parse_nul_list(await self.command_runner.run_async(command))
+
+    async def _get_changed_files_async(
+        self, project_root: Path, base_commit: Optional[str]
+    ) -> List[str]:
+        """Get changed files of one project without blocking the event loop."""
+        if base_commit:
+            try:
+                output = await self.command_runner.run_async(
+                    self._diff_command(project_root, base_commit)
+                )
+                return self._parse_diff_output(project_root, output)
+            except CommandError:
+                print(
+                    f"Error getting diff for {project_root}. Falling back to all tracked files."
+                )
+        output = await self.command_runner.run_async(
+            self._ls_files_command(project_root)
+        )
+        return self._parse_nul_list(output)
+
     def _get_diff_files(self, project_root: Path, base_commit: str) -> List[str]:
         """Get files changed since base commit."""
         try:
-            command = f'git diff --name-only {base_commit} HEAD -- "{project_root}"'
-            output = self.command_runner.run(command)
-            return self._parse_file_list(output)
-        except RuntimeError:
+            output = self.command_runner.run(
+                self._diff_command(project_root, base_commit)
+            )
+            return self._parse_diff_output(project_root, output)
+        except CommandError:
             print(
                 f"Error getting diff for {project_root}. Falling back to all tracked files."
             )
@@ -49,12 +302,41 @@ class GitService:
 
     def _get_all_tracked_files(self, project_root: Path) -> List[str]:
         """Get all tracked files in project."""
-        command = f'git ls-files "{project_root}"'
-        output = self.command_runner.run(command)
-        return self._parse_file_list(output)
-
-    def _parse_file_list(self, output: str) -> List[str]:
-        """Parse command output into list of file paths."""
-        if not output:
-            return []
-        return [f.strip() for f in output.split("\n") if f.strip()]
+        output = self.command_runner.run(self._ls_files_command(project_root))
+        return self._parse_nul_list(output)
+
+    def _diff_command(self, project_root: Path, base_commit: str) -> Sequence[str]:
+        """Build the command listing files changed since a commit below a project."""
+        return [
+            "git",
+            "-C",
+            str(project_root),
+            "diff",
+            "-z",
+            "--name-only",
+            "--relative",
+            base_commit,
+            "HEAD",
+        ]
+
+    def _ls_files_command(self, project_root: Path) -> Sequence[str]:
+        """Build the command listing all tracked files of a project."""
+        return ["git", "ls-files", "-z", "--", str(project_root)]
+
+    def _parse_diff_output(self, project_root: Path, output: str) -> List[str]:
+        """
+        Parse diff output into paths relative to the working directory.
+
+        The diff runs in the project root, so this also covers projects outside
+        the working directory, and the paths match those of ``git ls-files``
+        and the batched diff.
+        """
+        prefix = relative_prefix(project_root, Path.cwd())
+        file_paths = self._parse_nul_list(output)
+        if prefix == ".":
+            return file_paths
+        return [f"{prefix}/{file_path}" for file_path in file_paths]
+
+    def _parse_nul_list(self, output: str) -> List[str]:
+        """Parse NUL-separated command output into list of file paths."""
+        return [f for f in output.split("\0") if f]
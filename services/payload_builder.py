@@ -0,0 +1,361 @@
+"""Token-budgeted payload construction."""
+
+import re
+from pathlib import PurePosixPath
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.payload import Payload, PayloadImage
+from services.file_service import FileService, truncate_utf8, utf8_length
+from utils.image_encoder import ImageEncoder
+from utils.tokens import CHARS_PER_TOKEN, IMAGE_TOKENS, estimate_tokens
+
+
+class PayloadBuilder:
+    """Builds the AI payload from the most important files within a token budget."""
+
+    ENTRY_POINTS = {"main.py", "__main__.py", "app.py", "cli.py", "manage.py"}
+    CONFIG_SUFFIXES = {".toml", ".cfg", ".ini", ".yaml", ".yml", ".json", ".env"}
+    TEST_PATTERN = re.compile(
+        r"(^|/)(tests?|testing|fixtures?|conftest\.py|test_[^/]*|[^/]*_test\.py)($|/)"
+    )
+    MIN_TRUNCATED_TOKENS = 200
+    # Images above this size are not read; OpenAI rejects larger image inputs
+    MAX_IMAGE_BYTES = 20 * 1024 * 1024
+    # Approximate cost of one image input at the default detail level
+    IMAGE_TOKENS = IMAGE_TOKENS
+
+    def __init__(
+        self,
+        file_service: FileService,
+        token_budget: int,
+        max_bytes: int,
+        image_encoder: ImageEncoder,
+    ):
+        """
+        Initialize payload builder.
+
+        Args:
+            file_service: File service used to read files.
+            token_budget: Maximum payload tokens, 0 for no limit.
+            max_bytes: Hard limit on the UTF-8 size of the payload, 0 for no limit.
+            image_encoder: Encoder producing the images sent as image inputs.
+        """
+        self.file_service = file_service
+        self.token_budget = token_budget
+        self.max_bytes = max_bytes
+        self.image_encoder = image_encoder
+
+    def build(
+        self,
+        file_paths: List[str],
+        read_blob: Optional[Callable[[str], Optional[bytes]]] = None,
+    ) -> Payload:
+        """
+        Build a payload, adding files in order of importance until the budget is spent.
+
+        Files are streamed and never read past the remaining budget. Files that
+        do not fit are truncated when enough budget is left, and otherwise only
+        listed by name at the end of the payload. Images are deduplicated by
+        content and attached as image inputs, leaving a reference in the text;
+        their base64 data counts against the byte limit.
+
+        Files are chosen by importance but laid out in canonical order, with
+        truncated files and the omitted list last, so the payload of a project
+        changes as little as possible between requests and keeps a long
+        prefix for provider prompt caching.
+
+        Args:
+            file_paths: Candidate file paths.
+            read_blob: Optional reader returning a file's committed content.
+
+        Returns:
+            Assembled payload with a record of truncated and dropped files.
+        """
+        payload = Payload(content="", tokens=0)
+        sections: List[Tuple[str, str]] = []
+        remaining_tokens = self.token_budget or None
+        remaining_bytes = self.max_bytes or None
+        image_paths: Dict[str, str] = {}
+
+        for file_path in self.rank_files(file_paths):
+            if self._is_image(file_path):
+                if remaining_tokens is None or remaining_tokens >= self.IMAGE_TOKENS:
+                    attached = len(payload.images)
+                    section = self._add_image(
+                        payload, image_paths, file_path, read_blob, remaining_bytes
+                    )
+                    if section:
+                        sections.append((file_path, section))
+                    if len(payload.images) > attached:
+                        if remaining_tokens is not None:
+                            remaining_tokens -= self.IMAGE_TOKENS
+                        if remaining_bytes is not None:
+                            remaining_bytes -= len(payload.images[-1].data)
+                else:
+                    payload.dropped.append(file_path)
+                continue
+
+            limit = self._char_limit(remaining_tokens, remaining_bytes)
+            section, complete = self._read_section(file_path, read_blob, limit)
+            if section:
+                remaining_tokens, remaining_bytes = self._fit(
+                    payload,
+                    sections,
+                    file_path,
+                    section,
+                    complete,
+                    remaining_tokens,
+                    remaining_bytes,
+                )
+
+        return self._assemble(payload, sections)
+
+    def build_from_texts(self, texts: Dict[str, str], header: str = "") -> Payload:
+        """
+        Build a payload from sections already in memory, such as file summaries.
+
+        Sections are fitted into the same token budget and byte limit as in
+        ``build``, in order of importance, and laid out the same way.
+
+        Args:
+            texts: Payload section per file path.
+            header: Text placed before the sections, counted against the budget.
+
+        Returns:
+            Assembled payload with a record of truncated and dropped files.
+        """
+        payload = Payload(content="", tokens=0)
+        sections: List[Tuple[str, str]] = []
+        remaining_tokens = self.token_budget or None
+        remaining_bytes = self.max_bytes or None
+        if remaining_tokens is not None:
+            remaining_tokens = max(0, remaining_tokens - estimate_tokens(header))
+        if remaining_bytes is not None:
+            remaining_bytes = max(0, remaining_bytes - utf8_length(header))
+
+        for file_path in self.rank_files(list(texts)):
+            remaining_tokens, remaining_bytes = self._fit(
+                payload,
+                sections,
+                file_path,
+                texts[file_path],
+                True,
+                remaining_tokens,
+                remaining_bytes,
+            )
+        return self._assemble(payload, sections, header)
+
+    def estimate_tokens(self, file_sizes: Dict[str, int]) -> int:
+        """
+        Estimate the payload tokens of files without reading them.
+
+        Args:
+            file_sizes: Size in bytes per candidate file path.
+
+        Returns:
+            Estimated tokens, capped at the token budget.
+        """
+        tokens = sum(
+            self.IMAGE_TOKENS if self._is_image(file_path) else size // CHARS_PER_TOKEN
+            for file_path, size in file_sizes.items()
+        )
+        return min(tokens, self.token_budget) if self.token_budget else tokens
+
+    def _add_image(
+        self,
+        payload: Payload,
+        image_paths: Dict[str, str],
+        file_path: str,
+        read_blob: Optional[Callable[[str], Optional[bytes]]],
+        remaining_bytes: Optional[int],
+    ) -> Optional[str]:
+        """Attach an image to the payload once per content and return its text reference."""
+        data = self.file_service.read_bytes(file_path, read_blob, self.MAX_IMAGE_BYTES)
+        if data is None:
+            return None
+
+        sha = self.image_encoder.content_hash(data)
+        if sha in image_paths:
+            payload.included.append(file_path)
+            return f"{file_path}\n[IMAGE: identical to {image_paths[sha]}]\n\n"
+
+        encoded = self.image_encoder.encode(data, PurePosixPath(file_path).suffix)
+        if encoded is None or (
+            remaining_bytes is not None and len(encoded[1]) > remaining_bytes
+        ):
+            payload.dropped.append(file_path)
+            return None
+
+        media_type, image_data = encoded
+        payload.images.append(PayloadImage(file_path, sha, media_type, image_data))
+        payload.included.append(file_path)
+        image_paths[sha] = file_path
+        return (
+            f"{file_path}\n[IMAGE: attached as image input #{len(payload.images)}]\n\n"
+        )
+
+    def rank_files(self, file_paths: List[str]) -> List[str]:
+        """
+        Order files from most to least important for describing a project.
+
+        Args:
+            file_paths: File paths to rank.
+
+        Returns:
+            File paths sorted by importance, and by path within a tier.
+        """
+        return sorted(file_paths, key=lambda path: (self._priority(path), path))
+
+    def canonical_order(self, file_paths: List[str]) -> List[str]:
+        """
+        Order files the way they are laid out in a payload.
+
+        Args:
+            file_paths: File paths to order.
+
+        Returns:
+            pyproject.toml first, then the other files sorted by path.
+        """
+        return sorted(file_paths, key=self._layout_key)
+
+    def _layout_key(self, file_path: str) -> Tuple[bool, str]:
+        """Get the sort key of a file in the payload layout."""
+        return PurePosixPath(file_path).name != "pyproject.toml", file_path
+
+    def _priority(self, file_path: str) -> int:
+        """Get the importance tier of a file, lower is more important."""
+        path = PurePosixPath(file_path)
+
+        if path.name == "pyproject.toml":
+            return 0
+        if self.TEST_PATTERN.search(file_path):
+            return 6
+        if path.name in self.ENTRY_POINTS:
+            return 1
+        if (
+            path.suffix in self.CONFIG_SUFFIXES
+            or path.name.startswith(".env")
+            or "config" in path.parts
+            or path.stem in ("config", "settings")
+        ):
+            return 2
+        if path.suffix == ".py":
+            return 5 if path.name.startswith("_") and path.name != "__init__.py" else 3
+        return 4
+
+    def _is_image(self, file_path: str) -> bool:
+        """Check if a file is sent as an image input."""
+        return PurePosixPath(file_path).suffix.lower() in FileService.IMAGE_EXTENSIONS
+
+    def _char_limit(
+        self, remaining_tokens: Optional[int], remaining_bytes: Optional[int]
+    ) -> Optional[int]:
+        """Get how many characters of a file are worth reading."""
+        limits = []
+        if remaining_tokens is not None:
+            limits.append(remaining_tokens * CHARS_PER_TOKEN)
+        if remaining_bytes is not None:
+            limits.append(remaining_bytes)
+        return min(limits) if limits else None
+
+    def _read_section(
+        self,
+        file_path: str,
+        read_blob: Optional[Callable[[str], Optional[bytes]]],
+        limit: Optional[int],
+    ) -> Tuple[str, bool]:
+        """Read a file's section up to a character limit, reporting if it was complete."""
+        chunks = self.file_service.iter_file_chunks(file_path, read_blob)
+        collected = []
+        length = 0
+
+        for chunk in chunks:
+            collected.append(chunk)
+            length += len(chunk)
+            if limit is not None and length > limit:
+                chunks.close()
+                return "".join(collected)[: limit + 1], False
+
+        return "".join(collected), True
+
+    def _fit(
+        self,
+        payload: Payload,
+        sections: List[Tuple[str, str]],
+        file_path: str,
+        section: str,
+        complete: bool,
+        remaining_tokens: Optional[int],
+        remaining_bytes: Optional[int],
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """Place a section whole, truncated or not at all, returning the budget left."""
+        tokens = estimate_tokens(section)
+        size = utf8_length(section)
+        fits = (remaining_tokens is None or tokens <= remaining_tokens) and (
+            remaining_bytes is None or size <= remaining_bytes
+        )
+
+        if complete and fits:
+            payload.included.append(file_path)
+        elif self._can_truncate(remaining_tokens, remaining_bytes):
+            section = self._truncate(section, remaining_tokens, remaining_bytes)
+            tokens = estimate_tokens(section)
+            size = utf8_length(section)
+            payload.truncated.append(file_path)
+        else:
+            payload.dropped.append(file_path)
+            return remaining_tokens, remaining_bytes
+
+        sections.append((file_path, section))
+        if remaining_tokens is not None:
+            remaining_tokens -= tokens
+        if remaining_bytes is not None:
+            remaining_bytes -= size
+        return remaining_tokens, remaining_bytes
+
+    def _assemble(
+        self, payload: Payload, sections: List[Tuple[str, str]], header: str = ""
+    ) -> Payload:
+        """Lay out the sections canonically, followed by the omitted files."""
+        truncated = set(payload.truncated)
+        ordered = [header] + [
+            section
+            for file_path, section in sorted(
+                sections,
+                key=lambda entry: (entry[0] in truncated, self._layout_key(entry[0])),
+            )
+        ]
+        if payload.dropped:
+            ordered.append(
+                "Files omitted due to size limits:\n"
+                + "".join(f"- {file_path}\n" for file_path in sorted(payload.dropped))
+            )
+
+        payload.content = "".join(ordered)
+        payload.tokens = (
+            estimate_tokens(payload.content) + len(payload.images) * self.IMAGE_TOKENS
+        )
+        return payload
+
+    def _can_truncate(
+        self, remaining_tokens: Optional[int], remaining_bytes: Optional[int]
+    ) -> bool:
+        """Check if a truncated part of a file is still worth sending."""
+        minimum = self.MIN_TRUNCATED_TOKENS
+        return (remaining_tokens is None or remaining_tokens >= minimum) and (
+            remaining_bytes is None or remaining_bytes >= minimum * CHARS_PER_TOKEN
+        )
+
+    def _truncate(
+        self,
+        section: str,
+        remaining_tokens: Optional[int],
+        remaining_bytes: Optional[int],
+    ) -> str:
+        """Cut a section down to fit the remaining tokens and bytes."""
+        marker = "\n[... truncated to fit the token budget ...]\n\n"
+        keep = self._char_limit(remaining_tokens, remaining_bytes) - len(marker)
+        text = section[: max(0, keep)]
+        if remaining_bytes is not None:
+            text = truncate_utf8(text, max(0, remaining_bytes - len(marker)))
+        return text + marker
@@ -0,0 +1,150 @@
+"""Preflight planning of a README generation run."""
+
+import heapq
+from typing import List
+
+from config.prompts import Prompts
+from models.payload import Payload
+from models.project import Project
+from models.project_plan import ProjectPlan
+from services.ai_service import AIService
+from services.project_service import ProjectService
+from utils.tokens import estimate_tokens
+
+
+class PlanService:
+    """Service estimating which projects a run would regenerate and at what cost."""
+
+    DEFAULT_OUTPUT_TOKENS = 2000
+    MIN_OUTPUT_TOKENS = 500
+    MAX_OUTPUT_TOKENS = 4096
+    REQUEST_OVERHEAD_SECONDS = 1.0
+    INPUT_TOKENS_PER_SECOND = 5000.0
+
+    def __init__(self, project_service: ProjectService):
+        """
+        Initialize plan service.
+
+        Args:
+            project_service: Project service whose discovery and skip logic is reused.
+        """
+        self.project_service = project_service
+        self.settings = project_service.settings
+        self.prompt_tokens = estimate_tokens(
+            AIService.SYSTEM_MESSAGE + Prompts.get_readme_generation_prompt()
+        )
+        self.update_prompt_tokens = estimate_tokens(
+            AIService.SYSTEM_MESSAGE + Prompts.get_readme_update_prompt()
+        )
+
+    def plan_all_projects(self) -> List[ProjectPlan]:
+        """
+        Discover projects, detect changes and size payloads without calling the model.
+
+        Returns:
+            Plan for every discovered project.
+        """
+        project_service = self.project_service
+        projects = project_service.discover_projects()
+        if not projects:
+            print("No projects found.")
+            return []
+
+        current_commit = project_service.git_service.get_current_commit_sha()
+        changed_files = {}
+        if self.settings.batch_change_detection:
+            changed_files = project_service.detect_changes(projects)
+
+        plans = []
+        try:
+            for project in projects:
+                if not project_service.prepare_project(
+                    project, changed_files.get(project.root_path)
+                ):
+                    plans.append(ProjectPlan(project, regenerate=False))
+                    continue
+
+                payload = project_service.estimate_payload(project, current_commit)
+                plans.append(self._estimate(project, payload))
+        finally:
+            project_service.close()
+
+        self.print_plan(plans)
+        return plans
+
+    def estimate_wall_time(self, plans: List[ProjectPlan]) -> float:
+        """
+        Estimate the run's wall time with the configured concurrency.
+
+        Requests are assigned longest first to the least busy worker.
+
+        Args:
+            plans: Project plans.
+
+        Returns:
+            Estimated seconds until the last request finishes.
+        """
+        workers = [0.0] * self.settings.max_concurrent_projects
+        for seconds in sorted((plan.seconds for plan in plans), reverse=True):
+            heapq.heapreplace(workers, workers[0] + seconds)
+        return max(workers)
+
+    def print_plan(self, plans: List[ProjectPlan]) -> None:
+        """
+        Print the plan as a table with totals.
+
+        Args:
+            plans: Project plans.
+        """
+        regenerated = [plan for plan in plans if plan.regenerate]
+
+        print(
+            f"\n{'Project':<40} {'Action':<11} {'Input':>9} {'Output':>8} {'Time':>8}"
+        )
+        for plan in plans:
+            if plan.regenerate:
+                action = "update" if plan.update else "regenerate"
+                print(
+                    f"{plan.project.name:<40} {action:<11} "
+                    f"{plan.input_tokens:>9} {plan.output_tokens:>8} "
+                    f"{plan.seconds:>7.1f}s"
+                )
+            else:
+                print(f"{plan.project.name:<40} {'skip':<11}")
+
+        print(
+            f"\n{len(regenerated)} of {len(plans)} project(s) would be regenerated: "
+            f"~{sum(plan.input_tokens for plan in regenerated)} input and "
+            f"~{sum(plan.output_tokens for plan in regenerated)} output tokens, "
+            f"~{self.estimate_wall_time(regenerated):.0f}s wall time with "
+            f"{self.settings.max_concurrent_projects} concurrent project(s)."
+        )
+
+    def _estimate(self, project: Project, payload: Payload) -> ProjectPlan:
+        """Estimate tokens and duration of regenerating one project."""
+        prompt_tokens = (
+            self.update_prompt_tokens if payload.update else self.prompt_tokens
+        )
+        input_tokens = prompt_tokens + payload.tokens
+
+        output_tokens = self.DEFAULT_OUTPUT_TOKENS
+        if project.readme_path.exists():
+            try:
+                existing = self.project_service.file_service.read_file(
+                    project.readme_path
+                )
+                output_tokens = min(
+                    max(estimate_tokens(existing), self.MIN_OUTPUT_TOKENS),
+                    self.MAX_OUTPUT_TOKENS,
+                )
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Skipping unreadable {project.readme_path}: {e}")
+
+        seconds = (
+            self.REQUEST_OVERHEAD_SECONDS
+            + input_tokens / self.INPUT_TOKENS_PER_SECOND
+            + output_tokens / self.settings.plan_output_tokens_per_second
+        )
+        return ProjectPlan(
+            project, True, input_tokens, output_tokens, seconds, payload.update
+        )
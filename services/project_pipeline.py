@@ -0,0 +1,250 @@
+"""Pipelined project processing with overlapping stages."""
+
+import io
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from models.payload import Payload
+from models.project import Project
+from models.project_result import ProjectResult
+from utils.metrics import metrics
+from utils.output_capture import OutputCapture
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from services.project_service import ProjectService
+
+
+@dataclass
+class _Job:
+    """A project moving through the pipeline."""
+
+    index: int
+    project: Project
+    changed_files: Optional[List[str]]
+    start: float
+    payload: Optional[Payload] = None
+    markdown_content: str = ""
+    output: io.StringIO = field(default_factory=io.StringIO)
+
+
+class ProjectPipeline:
+    """
+    Runs projects through prepare, request and write stages at the same time.
+
+    While the model works on one project, the next ones are checked for
+    changes and their payloads built, and finished READMEs are written by a
+    stage of their own. The queues between the stages are bounded, so
+    preparation waits when requests fall behind and at most ``depth``
+    payloads are held in memory per queue.
+    """
+
+    POLL_SECONDS = 0.1
+
+    def __init__(
+        self,
+        project_service: "ProjectService",
+        current_commit: str,
+        depth: int,
+        request_workers: int,
+    ):
+        """
+        Initialize project pipeline.
+
+        Args:
+            project_service: Project service doing the work of each stage.
+            current_commit: Current commit SHA.
+            depth: Capacity of each queue between stages.
+            request_workers: Projects whose model requests run at the same time.
+        """
+        self.project_service = project_service
+        self.settings = project_service.settings
+        self.current_commit = current_commit
+        self.depth = max(1, depth)
+        self.request_workers = max(1, request_workers)
+        self._requests: "queue.Queue[Optional[_Job]]" = queue.Queue(self.depth)
+        self._writes: "queue.Queue[Optional[_Job]]" = queue.Queue(self.depth)
+        self._stop = threading.Event()
+        self._capture = OutputCapture()
+        self._results: List[Optional[ProjectResult]] = []
+
+    def run(
+        self, projects: List[Project], changed_files: Dict["Path", List[str]]
+    ) -> List[ProjectResult]:
+        """
+        Process projects through all stages.
+
+        Failures are recorded per project and never abort the run.
+
+        Args:
+            projects: Projects to process.
+            changed_files: Changed files per project root detected in advance;
+                projects without an entry are diffed in the prepare stage.
+
+        Returns:
+            Results in the same order as the given projects.
+        """
+        self._results = [None] * len(projects)
+
+        with self._capture.installed():
+            prepare = self._thread(self._prepare_stage, projects, changed_files)
+            requests = [
+                self._thread(self._request_stage) for _ in range(self.request_workers)
+            ]
+            write = self._thread(self._write_stage)
+            try:
+                self._join(prepare)
+                for _ in requests:
+                    self._put(self._requests, None, "prepare")
+                for thread in requests:
+                    self._join(thread)
+                self._put(self._writes, None, "request")
+                self._join(write)
+            except BaseException:
+                # Daemon threads end with the process; keep them from starting more work
+                self._stop.set()
+                raise
+        return self._results
+
+    def _prepare_stage(
+        self, projects: List[Project], changed_files: Dict["Path", List[str]]
+    ) -> None:
+        """Check projects for changes and build the payloads of those to regenerate."""
+        for index, project in enumerate(projects):
+            if self._stop.is_set():
+                return
+            job = _Job(
+                index,
+                project,
+                changed_files.get(project.root_path),
+                time.perf_counter(),
+            )
+            if self._run_step(job, "prepare", partial(self._prepare, job)):
+                self._put(self._requests, job, "prepare")
+
+    def _prepare(self, job: _Job) -> Optional[str]:
+        """Prepare one project, returning its status if it needs no request."""
+        project_service = self.project_service
+        project = job.project
+        print(f'\nProcessing project "{project.name}" at "{project.root_path}" ...')
+        status = project_service.check_project(
+            project, self.current_commit, job.changed_files
+        )
+        if status:
+            return status
+        job.payload = project_service.build_payload(project, self.current_commit)
+        return None
+
+    def _request_stage(self) -> None:
+        """Send the model requests of prepared projects."""
+        while True:
+            job = self._requests.get()
+            if job is None:
+                return
+            if self._run_step(job, "request", partial(self._request, job)):
+                self._put(self._writes, job, "request")
+
+    def _request(self, job: _Job) -> Optional[str]:
+        """Generate one README, returning its status if it was already written."""
+        payload = job.payload
+        # Payloads can hold large images; only the generated text moves on
+        job.payload = None
+
+        if self.settings.stream_responses:
+            saved = self.project_service.stream_and_save_readme(
+                job.project, payload, self.current_commit
+            )
+            return ProjectResult.UPDATED if saved else ProjectResult.EMPTY
+
+        job.markdown_content = self.project_service.ai_service.generate_readme_content(
+            payload.content, payload.images, payload.update
+        )
+        return None
+
+    def _write_stage(self) -> None:
+        """Write generated READMEs."""
+        while True:
+            job = self._writes.get()
+            if job is None:
+                return
+            self._run_step(job, "write", partial(self._write, job))
+
+    def _write(self, job: _Job) -> str:
+        """Write one README and return its status."""
+        saved = self.project_service.save_readme(
+            job.project, job.markdown_content, self.current_commit
+        )
+        return ProjectResult.UPDATED if saved else ProjectResult.EMPTY
+
+    def _run_step(
+        self, job: _Job, stage: str, step: Callable[[], Optional[str]]
+    ) -> bool:
+        """
+        Run one stage of a job, recording its result if the job ends there.
+
+        Args:
+            job: Job to advance.
+            stage: Stage name used in metrics.
+            step: Work of the stage, returning a status to end the job.
+
+        Returns:
+            True if the job moves on to the next stage.
+        """
+        project = job.project
+        # Stages run on different threads; the job's buffer and project scope
+        # follow it so its output is emitted as one block when it ends
+        with (
+            self._capture.redirected(job.output),
+            metrics.project_scope(project.name, str(project.root_path)),
+        ):
+            try:
+                with metrics.span("pipeline_stage", stage=stage):
+                    status = step()
+                error = None
+            except Exception as e:
+                print(f'ERROR processing project "{project.name}": {e}')
+                print(traceback.format_exc())
+                status, error = ProjectResult.FAILED, str(e)
+
+            if not status:
+                return True
+            result = ProjectResult(
+                project, status, time.perf_counter() - job.start, error
+            )
+            metrics.record_span("project", job.start)
+            metrics.increment("projects", status=result.status)
+            self._results[job.index] = result
+        self._capture.emit(job.output)
+        return False
+
+    def _put(
+        self, target: "queue.Queue[Optional[_Job]]", job: Optional[_Job], stage: str
+    ) -> None:
+        """Hand a job to the next stage, waiting while its queue is full."""
+        start = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                target.put(job, timeout=self.POLL_SECONDS)
+                break
+            except queue.Full:
+                continue
+        waited = time.perf_counter() - start
+        if waited > 0.001:
+            metrics.increment("pipeline_blocked_seconds", waited, stage=stage)
+
+    def _thread(self, target: Callable[..., None], *args) -> threading.Thread:
+        """Start a stage on a daemon thread."""
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        return thread
+
+    def _join(self, thread: threading.Thread) -> None:
+        """Wait for a stage to finish without blocking KeyboardInterrupt."""
+        while thread.is_alive():
+            thread.join(self.POLL_SECONDS)
@@ -1,20 +1,44 @@
 """Main project processing service."""
 
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, Optional
 
 from config.settings import Settings
+from models.payload import Payload
 from models.project import Project
+from models.project_result import ProjectResult
 from services.ai_service import AIService
 from services.file_service import FileService
 from services.git_service import GitService
+from services.payload_builder import PayloadBuilder
+from services.project_pipeline import ProjectPipeline
+from services.relevance_filter import RelevanceFilter
+from utils.command_runner import CommandError
+from utils.image_encoder import ImageEncoder
+from utils.metrics import metrics
+from utils.output_capture import OutputCapture
+from utils.project_index import ProjectIndex
+from utils.summary_index import SummaryIndex
+from utils.tokens import estimate_tokens
+
+
+class _EmptyContentError(Exception):
+    """Raised to discard a streamed README that came back empty."""
 
 
 class ProjectService:
     """Service for processing projects."""
 
     def __init__(
-        self, git_service: GitService, file_service: FileService, ai_service: AIService
+        self,
+        git_service: GitService,
+        file_service: FileService,
+        ai_service: AIService,
+        settings: Settings,
     ):
         """
         Initialize project service.
@@ -23,15 +47,41 @@ class ProjectService:
             git_service: Git service instance.
             file_service: File service instance.
             ai_service: AI service instance.
+            settings: Application settings.
         """
         self.git_service = git_service
         self.file_service = file_service
         self.ai_service = ai_service
-        self.settings = Settings()
+        self.settings = settings
+        self.payload_builder = PayloadBuilder(
+            file_service,
+            self.settings.payload_token_budget,
+            self.settings.max_payload_bytes,
+            ImageEncoder(
+                Path(self.settings.image_cache_directory),
+                self.settings.image_max_dimension,
+                self.settings.encoding_processes,
+            ),
+        )
+        self.summary_index = None
+        if self.settings.summary_mode:
+            self.summary_index = SummaryIndex(Path(self.settings.summary_index_path))
+        self.relevance_filter = None
+        if self.settings.relevance_filter_enabled:
+            self.relevance_filter = RelevanceFilter(
+                git_service,
+                self.settings.relevance_rules,
+                self.settings.relevance_threshold,
+                read_working_tree=not self.settings.read_from_git,
+            )
+        self.project_index = None
+        if self.settings.project_index_enabled:
+            self.project_index = ProjectIndex(Path(self.settings.project_index_path))
 
     def process_all_projects(self) -> None:
         """Process all projects in the repository."""
-        projects = self.discover_projects()
+        with metrics.span("discovery"):
+            projects = self.discover_projects()
 
         if not projects:
             print(
@@ -41,8 +91,330 @@ class ProjectService:
 
         current_commit = self.git_service.get_current_commit_sha()
 
+        try:
+            results = self.run_projects(projects, current_commit)
+        finally:
+            self.close()
+        self.print_summary(results)
+
+    def close(self) -> None:
+        """Stop the git and image encoding workers and save the project index."""
+        self.git_service.close()
+        self.payload_builder.image_encoder.close()
+        self._save_project_index()
+
+    def run_projects(
+        self,
+        projects: List[Project],
+        current_commit: str,
+        changed_files: Optional[Dict[Path, List[str]]] = None,
+    ) -> List[ProjectResult]:
+        """
+        Process projects, several at once when concurrency is enabled.
+
+        With a pipeline depth, the next projects are prepared while earlier
+        ones wait on the model, and READMEs are written on a stage of their
+        own. Failures are recorded per project and never abort the batch.
+
+        Args:
+            projects: Projects to process.
+            current_commit: Current commit SHA.
+            changed_files: Changed files per project root detected in advance;
+                detected here if not given.
+
+        Returns:
+            Results in the same order as the given projects.
+        """
+        max_workers = min(self.settings.max_concurrent_projects, len(projects))
+
+        if changed_files is None:
+            changed_files = {}
+            if self.settings.batch_change_detection:
+                with metrics.span("change_detection", mode="batch"):
+                    changed_files = self.detect_changes(projects)
+
+        try:
+            if self.settings.pipeline_depth:
+                pipeline = ProjectPipeline(
+                    self,
+                    current_commit,
+                    self.settings.pipeline_depth,
+                    self.settings.max_concurrent_projects,
+                )
+                return pipeline.run(projects, changed_files)
+
+            if max_workers <= 1:
+                return [
+                    self._run_project(
+                        project, current_commit, changed_files.get(project.root_path)
+                    )
+                    for project in projects
+                ]
+
+            capture = OutputCapture()
+            with capture.installed(), ThreadPoolExecutor(max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        self._run_grouped,
+                        capture,
+                        project,
+                        current_commit,
+                        changed_files.get(project.root_path),
+                    )
+                    for project in projects
+                ]
+                return [future.result() for future in futures]
+        finally:
+            self._save_project_index()
+
+    def detect_changes(self, projects: List[Project]) -> Dict[Path, List[str]]:
+        """
+        Detect changed files for all projects with batched git queries.
+
+        Also sets each project's base commit from its existing README.
+
+        Args:
+            projects: Projects to inspect.
+
+        Returns:
+            Changed file paths per project root.
+        """
         for project in projects:
-            self.process_single_project(project, current_commit)
+            project.base_commit = self.read_base_commit(project)
+
+        return self.git_service.get_changed_files_batch(
+            [(project.root_path, project.base_commit) for project in projects]
+        )
+
+    def read_base_commit(self, project: Project) -> Optional[str]:
+        """
+        Get the commit recorded in a project's README.
+
+        Args:
+            project: Project to inspect.
+
+        Returns:
+            Commit SHA if found, None otherwise.
+        """
+        if not self.project_index:
+            return self.file_service.extract_base_commit_from_readme(
+                project.readme_path
+            )
+        return self.project_index.get_base_commit(
+            project.readme_path, self.file_service.extract_base_commit_from_readme
+        )
+
+    def _run_grouped(
+        self,
+        capture: OutputCapture,
+        project: Project,
+        current_commit: str,
+        changed_files: Optional[List[str]],
+    ) -> ProjectResult:
+        """Process a project on a worker thread, keeping its output together."""
+        with capture.group():
+            return self._run_project(project, current_commit, changed_files)
+
+    def _run_project(
+        self,
+        project: Project,
+        current_commit: str,
+        changed_files: Optional[List[str]] = None,
+    ) -> ProjectResult:
+        """Process a project and capture its outcome instead of raising."""
+        start = time.perf_counter()
+        with (
+            metrics.project_scope(project.name, str(project.root_path)),
+            metrics.span("project"),
+        ):
+            try:
+                status = self.process_single_project(
+                    project, current_commit, changed_files
+                )
+                result = ProjectResult(project, status, time.perf_counter() - start)
+            except Exception as e:
+                print(f'ERROR processing project "{project.name}": {e}')
+                print(traceback.format_exc())
+                result = ProjectResult(
+                    project, ProjectResult.FAILED, time.perf_counter() - start, str(e)
+                )
+            metrics.increment("projects", status=result.status)
+        return result
+
+    def blob_reader(
+        self, current_commit: str
+    ) -> Optional[Callable[[str], Optional[bytes]]]:
+        """
+        Get the reader used for file contents.
+
+        Args:
+            current_commit: Commit written into the Last updated marker.
+
+        Returns:
+            Reader of files at that commit, or None to read the working tree.
+        """
+        if not self.settings.read_from_git:
+            return None
+        return partial(self.git_service.read_blob, revision=current_commit)
+
+    def _build_summary_payload(self, project: Project, current_commit: str) -> Payload:
+        """
+        Build a payload from per-file summaries, summarizing only new files.
+
+        Args:
+            project: Project to build the payload for.
+            current_commit: Commit whose files are summarized.
+
+        Returns:
+            Payload made of one summary per project file.
+        """
+        read_blob = partial(self.git_service.read_blob, revision=current_commit)
+        blob_shas = self.git_service.get_blob_shas(project.root_path, current_commit)
+        file_paths = self.payload_builder.canonical_order(
+            self.file_service.filter_project_files(project, list(blob_shas))
+        )
+
+        summarizer = self.ai_service.summary_fingerprint()
+        sections = {}
+        summarized = 0
+        try:
+            for file_path in file_paths:
+                key = SummaryIndex.make_key(blob_shas[file_path], file_path, summarizer)
+                summary = self.summary_index.get(key)
+                if summary is None:
+                    summary = self._summarize_file(file_path, read_blob)
+                    self.summary_index.put(key, summary)
+                    summarized += 1
+                if summary:
+                    sections[file_path] = f"{file_path}\n[SUMMARY]\n{summary}\n\n"
+        finally:
+            self.summary_index.save()
+
+        print(
+            f'Summaries for "{project.name}": {summarized} new, '
+            f"{len(file_paths) - summarized} reused"
+        )
+        return self.payload_builder.build_from_texts(
+            sections, "Project file summaries, one per file:\n\n"
+        )
+
+    def _build_update_payload(
+        self, project: Project, current_commit: str
+    ) -> Optional[Payload]:
+        """
+        Build a payload of the current README and the diff since its base commit.
+
+        Args:
+            project: Project with base commit and changed files set.
+            current_commit: Commit the diff runs to when reading from git.
+
+        Returns:
+            Update payload, or None if the full payload has to be sent.
+        """
+        if not self.settings.diff_updates or not project.base_commit:
+            return None
+        if not project.changed_files or any(
+            Path(file_path).suffix.lower() in FileService.IMAGE_EXTENSIONS
+            for file_path in project.changed_files
+        ):
+            return None
+
+        try:
+            readme = self.file_service.read_file(project.readme_path)
+        except (OSError, UnicodeDecodeError):
+            return None
+        readme = FileService.BASE_COMMIT_PATTERN.sub("", readme).strip()
+        if not readme:
+            return None
+
+        head_commit = current_commit if self.settings.read_from_git else None
+        try:
+            diff = self.git_service.get_diff(
+                project.base_commit, head_commit, project.changed_files
+            )
+        except CommandError as e:
+            print(f"Warning: Could not diff {project.root_path}: {e}")
+            return None
+
+        diff_tokens = estimate_tokens(diff)
+        max_tokens = self.settings.diff_update_max_tokens
+        if not diff or diff_tokens > max_tokens:
+            if diff:
+                print(
+                    f'Diff of "{project.name}" is ~{diff_tokens} tokens, over '
+                    f"{max_tokens}; sending the full payload"
+                )
+            return None
+
+        content = (
+            f"Current README.md:\n\n{readme}\n\n"
+            f"Changes since it was written, as a unified diff:\n\n{diff}\n"
+        )
+        return Payload(
+            content,
+            estimate_tokens(content),
+            included=list(project.changed_files),
+            update=True,
+        )
+
+    def _summarize_file(
+        self, file_path: str, read_blob: Callable[[str], Optional[bytes]]
+    ) -> str:
+        """
+        Summarize one file, keeping oversized files within the token budget.
+
+        Returns:
+            Summary, or an empty string for binary, generated and unreadable
+            files, which are left out of the payload.
+        """
+        if Path(file_path).suffix.lower() in FileService.IMAGE_EXTENSIONS:
+            return "Image file."
+
+        payload = self.payload_builder.build([file_path], read_blob)
+        if payload.dropped:
+            return "File too large to summarize."
+        if not payload.included and not payload.truncated:
+            return ""
+        return self.ai_service.summarize_file(payload.content)
+
+    def _print_payload_report(self, project: Project, payload: Payload) -> None:
+        """Print how the payload of a project was assembled."""
+        if payload.update:
+            print(
+                f'Payload for "{project.name}": ~{payload.tokens} tokens, current '
+                f"README and diff of {len(payload.included)} file(s)"
+            )
+            return
+        print(
+            f'Payload for "{project.name}": ~{payload.tokens} tokens from '
+            f"{len(payload.included)} file(s), {len(payload.images)} image(s)"
+        )
+        if payload.truncated:
+            print(f"  Truncated: {', '.join(payload.truncated)}")
+        if payload.dropped:
+            print(f"  Dropped: {', '.join(payload.dropped)}")
+
+    def print_summary(self, results: List[ProjectResult]) -> None:
+        """
+        Print a per-project summary of the run.
+
+        Args:
+            results: Results of the processed projects.
+        """
+        failed = [result for result in results if result.failed]
+
+        print(f"\nProcessed {len(results)} project(s):")
+        for result in results:
+            print(f"  {result.project.name}: {result.status} ({result.duration:.1f}s)")
+
+        if failed:
+            print(f"{len(failed)} project(s) failed:")
+            for result in failed:
+                print(f"  {result.project.name}: {result.error}")
+
+        cache = self.ai_service.cache
+        if cache:
+            print(f"AI response cache: {cache.hits} hit(s), {cache.misses} miss(es)")
 
     def discover_projects(self) -> List[Project]:
         """
@@ -53,7 +425,7 @@ class ProjectService:
         """
         projects = []
 
-        apps_dir = Path.cwd() / self.settings.apps_directory
+        apps_dir = Path.cwd() / (self.settings.apps_directory or ".")
 
         if not apps_dir.exists():
             print(
@@ -61,45 +433,179 @@ class ProjectService:
             )
             apps_dir = Path.cwd()
 
-        pyproject_toml_files = self.file_service.find_pyproject_toml_files(apps_dir)
+        if self.settings.discovery_mode == "git":
+            excluded = set(self.settings.excluded_directories)
+            pyproject_toml_files = [
+                path
+                for path in self.git_service.find_tracked_files(
+                    apps_dir, "pyproject.toml"
+                )
+                if excluded.isdisjoint(path.parts)
+            ]
+        elif self.project_index:
+            pyproject_toml_files = self._find_pyproject_toml_files_indexed(apps_dir)
+        else:
+            pyproject_toml_files = self.file_service.find_pyproject_toml_files(apps_dir)
 
         for pyproject_toml_path in pyproject_toml_files:
             project = self._create_project_from_pyproject_toml(pyproject_toml_path)
             if project:
                 projects.append(project)
 
+        self._save_project_index()
         return projects
 
-    def process_single_project(self, project: Project, current_commit: str) -> None:
+    def _find_pyproject_toml_files_indexed(self, apps_dir: Path) -> List[Path]:
+        """Find pyproject.toml files, walking the tree only if it changed."""
+        cached = self.project_index.get_discovery(apps_dir)
+        if cached is not None:
+            return cached
+
+        pyproject_toml_files = []
+        watched = [apps_dir]
+        for path, is_dir in self.file_service.walk(apps_dir):
+            if is_dir or path.name == ".gitignore":
+                watched.append(path)
+            elif path.name == "pyproject.toml" and path.is_file():
+                pyproject_toml_files.append(path)
+
+        pyproject_toml_files.sort()
+        self.project_index.put_discovery(apps_dir, pyproject_toml_files, watched)
+        return pyproject_toml_files
+
+    def _save_project_index(self) -> None:
+        """Persist the project index, warning instead of failing the run."""
+        if not self.project_index:
+            return
+        try:
+            self.project_index.save()
+        except OSError as e:
+            print(f"Warning: Could not save project index: {e}")
+
+    def process_single_project(
+        self,
+        project: Project,
+        current_commit: str,
+        changed_files: Optional[List[str]] = None,
+    ) -> str:
         """
         Process a single project.
 
         Args:
             project: Project to process.
             current_commit: Current commit SHA.
+            changed_files: Changed files detected in advance, if any.
+
+        Returns:
+            Resulting ProjectResult status.
         """
         print(f'\nProcessing project "{project.name}" at "{project.root_path}" ...')
 
-        # Extract base commit from existing README
-        project.base_commit = self.file_service.extract_base_commit_from_readme(
-            project.readme_path
-        )
+        # Skip if no changes
+        skip_status = self.check_project(project, current_commit, changed_files)
+        if skip_status:
+            return skip_status
+
+        # Generate and save README
+        if not self._generate_and_save_readme(project, current_commit):
+            return ProjectResult.EMPTY
+        return ProjectResult.UPDATED
+
+    def check_project(
+        self,
+        project: Project,
+        current_commit: str,
+        changed_files: Optional[List[str]] = None,
+    ) -> Optional[str]:
+        """
+        Prepare a project and decide whether its README has to be regenerated.
+
+        Args:
+            project: Project to check.
+            current_commit: Current commit SHA.
+            changed_files: Changed files detected in advance, if any.
+
+        Returns:
+            ProjectResult status if the project is skipped, None to regenerate it.
+        """
+        if self.prepare_project(project, changed_files):
+            return None
+        if project.relevance:
+            return self._skip_irrelevant_changes(project, current_commit)
+        print(f'No changes detected for project "{project.name}". Skipping update.')
+        return ProjectResult.SKIPPED
+
+    def prepare_project(
+        self, project: Project, changed_files: Optional[List[str]] = None
+    ) -> bool:
+        """
+        Determine the project's base commit and changed files.
+
+        Args:
+            project: Project to prepare.
+            changed_files: Changed files detected in advance, if any.
+
+        Returns:
+            True if the project's README needs to be regenerated.
+        """
+        if changed_files is None:
+            # Extract base commit from existing README
+            project.base_commit = self.read_base_commit(project)
+
+            # Get changed files
+            with metrics.span("change_detection", mode="per_project"):
+                changed_files = self.git_service.get_changed_files(
+                    project.root_path, project.base_commit
+                )
 
-        # Get changed files
-        changed_files = self.git_service.get_changed_files(
-            project.root_path, project.base_commit
-        )
         project.changed_files = self.file_service.filter_project_files(
             project, changed_files
         )
-
-        # Skip if no changes
+        project.relevance = None
         if not project.has_changes:
-            print(f'No changes detected for project "{project.name}". Skipping update.')
-            return
+            return False
 
-        # Generate and save README
-        self._generate_and_save_readme(project, current_commit)
+        if self.relevance_filter and project.base_commit:
+            with metrics.span("relevance"):
+                project.relevance = self.relevance_filter.assess(project)
+            if not project.relevance.relevant:
+                return False
+        return True
+
+    def _skip_irrelevant_changes(self, project: Project, current_commit: str) -> str:
+        """
+        Log why a project's changes do not warrant a new README and skip it.
+
+        Changes that cannot affect the README move the Last updated marker
+        forward so they are not assessed again. Changes that are merely below
+        the threshold keep the marker, so they add up until they reach it.
+
+        Args:
+            project: Project whose changes were assessed.
+            current_commit: Current commit SHA.
+
+        Returns:
+            Resulting ProjectResult status.
+        """
+        relevance = project.relevance
+        print(
+            f'Changes to "{project.name}" scored {relevance.score}% of the '
+            f"{relevance.threshold}% needed to regenerate its README:"
+        )
+        for file_path, reason in relevance.reasons.items():
+            print(f"  {file_path}: {reason}")
+
+        if not relevance.irrelevant:
+            print("Deferring update until more changes accumulate.")
+            metrics.increment("relevance_skips", outcome="deferred")
+            return ProjectResult.DEFERRED
+
+        metrics.increment("relevance_skips", outcome="irrelevant")
+        if self.file_service.update_base_commit(project.readme_path, current_commit):
+            print(f"Skipping update. Last updated marker moved to {current_commit}.")
+        else:
+            print("Skipping update.")
+        return ProjectResult.SKIPPED
 
     def _create_project_from_pyproject_toml(self, pyproject_toml_path: Path) -> Project:
         """
@@ -111,43 +617,160 @@ class ProjectService:
         Returns:
             Project instance or None if error.
         """
-        package_data = self.file_service.read_pyproject_toml(pyproject_toml_path)
+        if self.project_index:
+            name = self.project_index.get_project_name(
+                pyproject_toml_path, self._read_project_name
+            )
+        else:
+            name = self._read_project_name(pyproject_toml_path)
 
-        if not package_data or "project" not in package_data:
+        if name is None:
             return None
 
         return Project(
-            name=package_data["project"]["name"],
+            name=name,
             root_path=pyproject_toml_path.parent,
             pyproject_toml_path=pyproject_toml_path,
         )
 
-    def _generate_and_save_readme(self, project: Project, current_commit: str) -> None:
+    def _read_project_name(self, pyproject_toml_path: Path) -> Optional[str]:
+        """Parse pyproject.toml and get the project name, None if it has none."""
+        package_data = self.file_service.read_pyproject_toml(pyproject_toml_path)
+
+        if not package_data or "project" not in package_data:
+            return None
+        return package_data["project"]["name"]
+
+    def _generate_and_save_readme(self, project: Project, current_commit: str) -> bool:
         """
         Generate and save README for a project.
 
         Args:
             project: Project to generate README for.
             current_commit: Current commit SHA.
+
+        Returns:
+            True if a README was generated and written.
         """
-        # Concatenate file contents
-        file_content = self.file_service.concatenate_file_contents(
-            project.changed_files
-        )
+        payload = self.build_payload(project, current_commit)
+
+        if self.settings.stream_responses:
+            return self.stream_and_save_readme(project, payload, current_commit)
 
         # Generate README content
-        markdown_content = self.ai_service.generate_readme_content(file_content)
+        markdown_content = self.ai_service.generate_readme_content(
+            payload.content, payload.images, payload.update
+        )
+        return self.save_readme(project, markdown_content, current_commit)
+
+    def build_payload(self, project: Project, current_commit: str) -> Payload:
+        """
+        Build the payload sent to the AI for a prepared project.
+
+        Args:
+            project: Project with changed files set.
+            current_commit: Current commit SHA.
+
+        Returns:
+            Payload of the project.
+        """
+        with metrics.span("payload_build"):
+            payload = self._build_update_payload(project, current_commit)
+            if payload is None and self.summary_index:
+                payload = self._build_summary_payload(project, current_commit)
+            elif payload is None:
+                payload = self.payload_builder.build(
+                    project.changed_files, self.blob_reader(current_commit)
+                )
+        metrics.increment("payloads", mode="update" if payload.update else "full")
+        metrics.increment("payload_tokens", payload.tokens)
+        self._print_payload_report(project, payload)
+        return payload
+
+    def estimate_payload(self, project: Project, current_commit: str) -> Payload:
+        """
+        Build the payload a run would send for a prepared project, without the model.
+
+        Incremental updates are built exactly as in a run. In summary mode,
+        where building the payload would call the model, the full payload
+        stands in for the summaries.
+
+        Args:
+            project: Project with changed files set.
+            current_commit: Current commit SHA.
+
+        Returns:
+            Payload of the project.
+        """
+        payload = self._build_update_payload(project, current_commit)
+        if payload is None:
+            payload = self.payload_builder.build(
+                project.changed_files, self.blob_reader(current_commit)
+            )
+        return payload
+
+    def save_readme(
+        self, project: Project, markdown_content: str, current_commit: str
+    ) -> bool:
+        """
+        Write generated README content with its commit tracking comment.
 
+        Args:
+            project: Project the README belongs to.
+            markdown_content: Generated markdown content.
+            current_commit: Commit the content was generated from.
+
+        Returns:
+            True if the README was written, False if the content was empty.
+        """
         if not markdown_content:
             print(f'Error: No content generated for project "{project.name}"')
-            return
+            return False
 
         # Add commit tracking comment
         final_content = f"{markdown_content}\n\n<!-- Last updated: {current_commit} -->"
 
         # Save to file
-        try:
+        with metrics.span("readme_write"):
             self.file_service.write_file(project.readme_path, final_content)
-            print(f"README saved to {project.readme_path}")
-        except Exception as e:
-            print(f"Error writing README for {project.name}: {e}")
+        print(f"README saved to {project.readme_path}")
+        return True
+
+    def stream_and_save_readme(
+        self, project: Project, payload: Payload, current_commit: str
+    ) -> bool:
+        """
+        Stream README content into a temporary file that replaces the README when done.
+
+        Args:
+            project: Project to generate README for.
+            payload: Payload to send.
+            current_commit: Current commit SHA.
+
+        Returns:
+            True if a README was generated and written.
+        """
+        try:
+            with self.file_service.open_atomic(project.readme_path) as readme_file:
+                markdown_content, stats = self.ai_service.stream_readme_content(
+                    payload.content, readme_file.write, payload.images, payload.update
+                )
+                if not markdown_content:
+                    raise _EmptyContentError()
+                readme_file.write(f"\n\n<!-- Last updated: {current_commit} -->")
+        except _EmptyContentError:
+            print(f'Error: No content generated for project "{project.name}"')
+            return False
+
+        if stats.cached:
+            print("Response served from cache")
+        else:
+            print(
+                f"Streamed {stats.output_tokens} tokens in {stats.duration:.1f}s "
+                f"(first token after {stats.time_to_first_token or 0:.2f}s, "
+                f"{stats.tokens_per_second:.1f} tokens/s, "
+                f"{stats.cached_input_tokens} of {stats.input_tokens} input tokens "
+                f"from the prompt cache)"
+            )
+        print(f"README saved to {project.readme_path}")
+        return True
@@ -0,0 +1,154 @@
+"""Scoring of project changes by their relevance to the README."""
+
+import ast
+import hashlib
+import re
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from models.project import Project
+from models.relevance_report import RelevanceReport
+from services.git_service import GitService
+from utils.path_trie import relative_prefix
+
+
+class RelevanceFilter:
+    """Scores changed files so cosmetic or peripheral changes do not trigger regeneration."""
+
+    DEFAULT_WEIGHT = 100
+    MAX_COMPARE_BYTES = 512 * 1024
+    LINE_COMMENTS = {
+        ".py": "#", ".pyi": "#", ".toml": "#", ".cfg": "#", ".ini": "#",
+        ".yml": "#", ".yaml": "#", ".sh": "#", ".txt": "#", ".js": "//",
+        ".jsx": "//", ".ts": "//", ".tsx": "//", ".go": "//", ".rs": "//",
+        ".java": "//", ".c": "//", ".h": "//", ".cpp": "//", ".hpp": "//",
+    }  # fmt: skip
+    # Indentation carries meaning here, so only blank lines, trailing
+    # whitespace and comment lines are ignored
+    INDENTATION_SENSITIVE = {".py", ".pyi", ".yml", ".yaml"}
+    WHITESPACE = re.compile(r"\s+")
+
+    def __init__(
+        self,
+        git_service: GitService,
+        rules: List[Tuple[str, int]],
+        threshold: int,
+        read_working_tree: bool = False,
+    ):
+        """
+        Initialize relevance filter.
+
+        Args:
+            git_service: Git service used to read both sides of a change.
+            rules: Glob patterns and the weight, in percent, of files matching
+                them. The first matching rule applies; patterns without a slash
+                match the file name, others the path below the project root.
+            threshold: Total weight at which a README is regenerated.
+            read_working_tree: Compare the base commit with the files on disk,
+                as the payload reads them, instead of with HEAD.
+        """
+        self.git_service = git_service
+        self.rules = rules
+        self.threshold = threshold
+        self.read_working_tree = read_working_tree
+
+    def assess(self, project: Project) -> RelevanceReport:
+        """
+        Score the changed files of a project since its base commit.
+
+        Args:
+            project: Project with base commit and changed files set.
+
+        Returns:
+            Score, threshold and the reason behind each file's weight.
+        """
+        prefix = relative_prefix(project.root_path, Path.cwd())
+        report = RelevanceReport(0, self.threshold)
+
+        for file_path in project.changed_files:
+            relative = file_path if prefix == "." else file_path[len(prefix) + 1 :]
+            weight, reason = self._classify(file_path, relative, project.base_commit)
+            report.score += weight
+            report.reasons[file_path] = f"{reason} ({weight}%)"
+        return report
+
+    def _classify(
+        self, file_path: str, relative: str, base_commit: Optional[str]
+    ) -> Tuple[int, str]:
+        """Weigh one changed file by the configured rules, then by its content."""
+        for pattern, weight in self.rules:
+            target = relative if "/" in pattern else relative.rsplit("/", 1)[-1]
+            if fnmatchcase(target, pattern):
+                return weight, f"matches {pattern}"
+
+        if base_commit:
+            cosmetic = self._cosmetic_change(file_path, base_commit)
+            if cosmetic:
+                return 0, cosmetic
+        return self.DEFAULT_WEIGHT, "content changed"
+
+    def _cosmetic_change(self, file_path: str, base_commit: str) -> Optional[str]:
+        """Describe a change that leaves the normalized content as it was, if it does."""
+        before = self.git_service.read_blob(file_path, base_commit)
+        after = self._read_current(file_path)
+        if before is None or after is None:
+            # Added or removed
+            return None
+        if max(len(before), len(after)) > self.MAX_COMPARE_BYTES:
+            return None
+
+        try:
+            before_text = before.decode("utf-8")
+            after_text = after.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+        same_layout = self._whitespace_hash(before_text) == self._whitespace_hash(
+            after_text
+        )
+        suffix = Path(file_path).suffix.lower()
+        before_hash = self._code_hash(before_text, suffix)
+        if before_hash is None:
+            if suffix in self.INDENTATION_SENSITIVE:
+                return None
+            return "formatting only" if same_layout else None
+        if before_hash != self._code_hash(after_text, suffix):
+            return None
+        return "formatting only" if same_layout else "comments or formatting only"
+
+    def _read_current(self, file_path: str) -> Optional[bytes]:
+        """Read the current side of a change, None if the file was removed."""
+        if not self.read_working_tree:
+            return self.git_service.read_blob(file_path, "HEAD")
+        try:
+            return Path(file_path).read_bytes()
+        except OSError:
+            return None
+
+    def _whitespace_hash(self, text: str) -> str:
+        """Hash text with all whitespace removed."""
+        return hashlib.sha256(self.WHITESPACE.sub("", text).encode("utf-8")).hexdigest()
+
+    def _code_hash(self, text: str, suffix: str) -> Optional[str]:
+        """Hash text without comments and formatting, None if not supported."""
+        if suffix in (".py", ".pyi"):
+            try:
+                # The syntax tree ignores comments, layout, quoting and parentheses
+                normalized = ast.dump(ast.parse(text))
+            except (SyntaxError, ValueError):
+                return None
+        elif suffix in self.LINE_COMMENTS:
+            marker = self.LINE_COMMENTS[suffix]
+            lines = [
+                line
+                for line in text.splitlines()
+                if line.strip() and not line.lstrip().startswith(marker)
+            ]
+            if suffix in self.INDENTATION_SENSITIVE:
+                normalized = "\n".join(line.rstrip() for line in lines)
+            else:
+                normalized = "".join(self.WHITESPACE.sub("", line) for line in lines)
+        else:
+            return None
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
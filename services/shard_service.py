@@ -0,0 +1,318 @@
+"""Processing one shard of the projects and merging the shards' manifests."""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from models.project import Project
+from models.project_result import ProjectResult
+from services.project_service import ProjectService
+from utils.metrics import metrics
+from utils.path_trie import PathTrie, relative_prefix
+from utils.sharding import assign_shards
+
+MANIFEST_VERSION = 1
+TOKEN_COUNTERS = ("input_tokens", "cached_input_tokens", "output_tokens")
+
+
+class ShardService:
+    """Service processing the projects assigned to one of several runners."""
+
+    def __init__(
+        self,
+        project_service: ProjectService,
+        shard: int,
+        shard_count: int,
+        manifest_directory: Path,
+    ):
+        """
+        Initialize shard service.
+
+        Args:
+            project_service: Project service processing the shard's projects.
+            shard: Number of this shard, starting at 1.
+            shard_count: Total number of shards.
+            manifest_directory: Directory the shard's result manifest is written to.
+        """
+        self.project_service = project_service
+        self.settings = project_service.settings
+        self.shard = shard
+        self.shard_count = shard_count
+        self.manifest_path = (
+            Path(manifest_directory) / f"shard-{shard}-of-{shard_count}.json"
+        )
+
+    def run(self) -> List[ProjectResult]:
+        """
+        Process this shard's projects and write its result manifest.
+
+        Returns:
+            Results of the shard's projects.
+        """
+        project_service = self.project_service
+        started_at = time.time()
+        start = time.perf_counter()
+
+        with metrics.span("discovery"):
+            projects = project_service.discover_projects()
+        current_commit = project_service.git_service.get_current_commit_sha()
+
+        try:
+            weights = self._estimate_weights(projects)
+            selected = self.select(projects, weights)
+            print(
+                f"Shard {self.shard}/{self.shard_count}: {len(selected)} of "
+                f"{len(projects)} project(s)"
+            )
+            results = (
+                project_service.run_projects(selected, current_commit)
+                if selected
+                else []
+            )
+        finally:
+            project_service.close()
+
+        project_service.print_summary(results)
+        self._write_manifest(
+            {
+                "version": MANIFEST_VERSION,
+                "shard": self.shard,
+                "shard_count": self.shard_count,
+                "weighting": self.settings.shard_weighting,
+                "commit": current_commit,
+                "started_at": started_at,
+                "duration": round(time.perf_counter() - start, 6),
+                "projects": self._project_entries(results, weights),
+            }
+        )
+        return results
+
+    def select(
+        self, projects: List[Project], weights: Optional[Dict[str, int]] = None
+    ) -> List[Project]:
+        """
+        Pick the projects assigned to this shard.
+
+        Args:
+            projects: All discovered projects.
+            weights: Estimated payload tokens per project key, to balance the
+                shards by size instead of hashing.
+
+        Returns:
+            Projects of this shard, in discovery order.
+        """
+        keys = [self._key(project) for project in projects]
+        assignment = assign_shards(keys, self.shard_count, weights)
+        return [
+            project
+            for project, key in zip(projects, keys)
+            if assignment[key] == self.shard
+        ]
+
+    def _estimate_weights(self, projects: List[Project]) -> Optional[Dict[str, int]]:
+        """Estimate the payload tokens of every project from committed file sizes."""
+        if self.settings.shard_weighting != "size":
+            return None
+
+        project_service = self.project_service
+        trie: PathTrie[Project] = PathTrie()
+        for project in projects:
+            trie.insert(self._key(project), project)
+
+        files: Dict[str, Dict[str, int]] = {self._key(p): {} for p in projects}
+        for file_path, size in project_service.git_service.get_blob_sizes().items():
+            owners = trie.find_all(file_path)
+            if owners:
+                # Files of nested projects belong to the innermost one
+                files[self._key(owners[-1])][file_path] = size
+
+        weights = {}
+        for project in projects:
+            key = self._key(project)
+            kept = project_service.file_service.filter_project_files(
+                project, list(files[key])
+            )
+            weights[key] = project_service.payload_builder.estimate_tokens(
+                {file_path: files[key][file_path] for file_path in kept}
+            )
+        return weights
+
+    def _project_entries(
+        self, results: List[ProjectResult], weights: Optional[Dict[str, int]]
+    ) -> List[Dict[str, Any]]:
+        """Describe each processed project for the manifest."""
+        # Keyed by root, as projects from different pyproject.toml files may share a name
+        tokens = {
+            counter: metrics.totals_by_project(counter, "project_path")
+            for counter in TOKEN_COUNTERS
+        }
+        entries = []
+        for result in results:
+            key = self._key(result.project)
+            entry = {
+                "project": result.project.name,
+                "path": key,
+                "status": result.status,
+                "duration": round(result.duration, 6),
+                "error": result.error,
+            }
+            if weights is not None:
+                entry["estimated_tokens"] = weights.get(key, 0)
+            for counter in TOKEN_COUNTERS:
+                entry[counter] = int(
+                    tokens[counter].get(str(result.project.root_path), 0)
+                )
+            entries.append(entry)
+        return entries
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Write the manifest so a merge never reads it half-written."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+        print(f"Shard manifest written to {self.manifest_path}")
+
+    @staticmethod
+    def _key(project: Project) -> str:
+        """Get the path identifying a project on every runner."""
+        return relative_prefix(project.root_path, Path.cwd())
+
+
+def merge_manifests(
+    manifest_paths: List[Path], report_path: Optional[Path] = None
+) -> Dict[str, Any]:
+    """
+    Combine the result manifests of all shards into one run report.
+
+    Args:
+        manifest_paths: Manifest files written by the shards.
+        report_path: Where to write the merged report, if anywhere.
+
+    Returns:
+        Merged report, listing missing shards and conflicting commits.
+    """
+    manifests = []
+    for manifest_path in manifest_paths:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifests.append(json.load(f))
+    manifests.sort(key=lambda manifest: manifest["shard"])
+
+    shard_counts = sorted({manifest["shard_count"] for manifest in manifests})
+    commits = sorted({manifest["commit"] for manifest in manifests})
+    shard_count = max(shard_counts, default=0)
+    present = {manifest["shard"] for manifest in manifests}
+
+    projects: List[Dict[str, Any]] = []
+    seen: Dict[str, int] = {}
+    duplicates = []
+    for manifest in manifests:
+        for entry in manifest["projects"]:
+            if entry["path"] in seen:
+                duplicates.append(entry["path"])
+            seen[entry["path"]] = manifest["shard"]
+            projects.append({**entry, "shard": manifest["shard"]})
+    projects.sort(key=lambda entry: entry["path"])
+
+    statuses: Dict[str, int] = {}
+    for entry in projects:
+        statuses[entry["status"]] = statuses.get(entry["status"], 0) + 1
+
+    report = {
+        "version": MANIFEST_VERSION,
+        "commits": commits,
+        "shard_count": shard_count,
+        "missing_shards": [
+            shard for shard in range(1, shard_count + 1) if shard not in present
+        ],
+        "conflicts": _merge_conflicts(shard_counts, commits, duplicates),
+        "shards": [
+            {
+                "shard": manifest["shard"],
+                "projects": len(manifest["projects"]),
+                "duration": manifest["duration"],
+            }
+            for manifest in manifests
+        ],
+        "totals": {
+            "projects": len(projects),
+            "statuses": statuses,
+            "wall_time": max((m["duration"] for m in manifests), default=0.0),
+            "runner_time": round(sum(m["duration"] for m in manifests), 6),
+            **{
+                counter: sum(entry.get(counter, 0) for entry in projects)
+                for counter in TOKEN_COUNTERS
+            },
+        },
+        "projects": projects,
+    }
+
+    if report_path:
+        report_path = Path(report_path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = report_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        os.replace(temp_path, report_path)
+    return report
+
+
+def print_merged_report(report: Dict[str, Any]) -> None:
+    """
+    Print a summary of a merged run report.
+
+    Args:
+        report: Report returned by merge_manifests.
+    """
+    totals = report["totals"]
+    print(f"Merged {len(report['shards'])} of {report['shard_count']} shard(s):")
+    for shard in report["shards"]:
+        print(
+            f"  shard {shard['shard']}: {shard['projects']} project(s) "
+            f"in {shard['duration']:.1f}s"
+        )
+
+    statuses = ", ".join(
+        f"{count} {status}" for status, count in sorted(totals["statuses"].items())
+    )
+    print(f"\nProcessed {totals['projects']} project(s): {statuses or 'none'}")
+    print(
+        f"Wall time {totals['wall_time']:.1f}s, runner time "
+        f"{totals['runner_time']:.1f}s"
+    )
+    print(
+        f"Tokens: {totals['input_tokens']} input "
+        f"({totals['cached_input_tokens']} cached), {totals['output_tokens']} output"
+    )
+
+    failed = [
+        entry for entry in report["projects"] if entry["status"] == ProjectResult.FAILED
+    ]
+    if failed:
+        print(f"{len(failed)} project(s) failed:")
+        for entry in failed:
+            print(f"  {entry['project']} (shard {entry['shard']}): {entry['error']}")
+    if report["missing_shards"]:
+        missing = ", ".join(str(shard) for shard in report["missing_shards"])
+        print(f"Missing shard manifest(s): {missing}")
+    for conflict in report["conflicts"]:
+        print(f"Warning: {conflict}")
+
+
+def _merge_conflicts(
+    shard_counts: List[int], commits: List[str], duplicates: List[str]
+) -> List[str]:
+    """Describe manifests that do not belong to the same sharded run."""
+    conflicts = []
+    if len(shard_counts) > 1:
+        conflicts.append(f"Manifests disagree on the shard count: {shard_counts}")
+    if len(commits) > 1:
+        conflicts.append(f"Manifests come from different commits: {commits}")
+    if duplicates:
+        conflicts.append(
+            f"Projects processed by more than one shard: {sorted(set(duplicates))}"
+        )
+    return conflicts
@@ -0,0 +1,206 @@
+"""Long-running watch mode regenerating READMEs of projects as they change."""
+
+import os
+import time
+import traceback
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+from models.project import Project
+from services.project_service import ProjectService
+from utils.change_watcher import InotifyWatcher, PollingWatcher, create_watcher
+from utils.metrics import metrics
+from utils.path_trie import PathTrie, is_under_prefix, relative_prefix
+
+FileStat = Optional[Tuple[int, int]]
+
+
+class _Snapshot(NamedTuple):
+    """HEAD and the state of every uncommitted file at one point in time."""
+
+    head: str
+    files: Dict[str, FileStat]
+
+
+class WatchService:
+    """Service regenerating only the projects touched by new commits or edits."""
+
+    def __init__(self, project_service: ProjectService):
+        """
+        Initialize watch service.
+
+        Args:
+            project_service: Project service kept warm between cycles.
+        """
+        self.project_service = project_service
+        self.git_service = project_service.git_service
+        self.file_service = project_service.file_service
+        self.settings = project_service.settings
+        self.projects: List[Project] = []
+        if project_service.relevance_filter:
+            # Uncommitted edits are among the changes, so compare with the disk
+            project_service.relevance_filter.read_working_tree = True
+        self._prefixes: Dict[Path, str] = {}
+        self._trie: PathTrie[Project] = PathTrie()
+        self._excluded = set(self.settings.excluded_directories)
+
+    def run(self) -> None:
+        """Watch the repository until interrupted, regenerating changed projects."""
+        self._load_projects()
+        watcher = self._create_watcher()
+        snapshot = self._snapshot()
+        print(
+            f"Watching {len(self.projects)} project(s) with "
+            f"{type(watcher).__name__}. Press Ctrl+C to stop."
+        )
+
+        try:
+            while True:
+                watcher.wait()
+                try:
+                    current = self._snapshot()
+                    if current == snapshot:
+                        continue
+
+                    current = self._debounce(watcher, current)
+                    with metrics.span("watch_cycle"):
+                        self._regenerate(
+                            self._changed_paths(snapshot, current), current
+                        )
+                    # Taken after the cycle so the READMEs just written do not count
+                    snapshot = self._snapshot()
+                except Exception as e:
+                    # E.g. git failing mid-rebase; the next event retries the changes
+                    print(f"ERROR in watch cycle: {e}")
+                    print(traceback.format_exc())
+                    metrics.increment("watch_cycle_failures")
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+        finally:
+            watcher.close()
+            self.project_service.close()
+
+    def _load_projects(self) -> None:
+        """Discover projects and index them by path prefix."""
+        with metrics.span("discovery"):
+            self.projects = self.project_service.discover_projects()
+
+        cwd = Path.cwd()
+        self._prefixes = {}
+        self._trie = PathTrie()
+        for project in self.projects:
+            prefix = relative_prefix(project.root_path, cwd)
+            self._prefixes[project.root_path] = prefix
+            self._trie.insert(prefix, project)
+
+    def _create_watcher(self) -> Union[InotifyWatcher, PollingWatcher]:
+        """Create a watcher for the working tree and the git refs."""
+        excluded = self.settings.excluded_directories
+        poll_seconds = self.settings.watch_poll_seconds
+        watcher = create_watcher(
+            excluded, poll_seconds, self.settings.watch_force_polling
+        )
+        if isinstance(watcher, PollingWatcher):
+            return watcher
+
+        try:
+            for directory in self.file_service.find_directories(Path.cwd()):
+                watcher.watch(directory)
+            git_directory = self.git_service.get_git_directory()
+            watcher.watch(git_directory)
+            watcher.watch(git_directory / "refs", recursive=True)
+        except OSError as e:
+            print(f"Warning: Could not watch the repository ({e}). Polling instead.")
+            watcher.close()
+            return PollingWatcher(poll_seconds)
+        return watcher
+
+    def _snapshot(self) -> _Snapshot:
+        """Record HEAD and the size and modification time of uncommitted files."""
+        files: Dict[str, FileStat] = {}
+        for file_path in self.git_service.get_working_tree_changes():
+            # Each cycle writes to .readmegen; its files must not trigger the next
+            if self._is_excluded(file_path):
+                continue
+            try:
+                stat = os.stat(file_path)
+                files[file_path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                files[file_path] = None
+        return _Snapshot(self.git_service.get_current_commit_sha(), files)
+
+    def _debounce(
+        self, watcher: Union[InotifyWatcher, PollingWatcher], snapshot: _Snapshot
+    ) -> _Snapshot:
+        """Wait until nothing has changed for the debounce window."""
+        debounce_seconds = self.settings.watch_debounce_seconds
+        deadline = time.monotonic() + debounce_seconds
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return snapshot
+            if watcher.wait(remaining):
+                current = self._snapshot()
+                if current != snapshot:
+                    snapshot = current
+                    deadline = time.monotonic() + debounce_seconds
+
+    def _changed_paths(self, before: _Snapshot, after: _Snapshot) -> Set[str]:
+        """Get files committed or edited between two snapshots."""
+        changed = {
+            file_path
+            for file_path in before.files.keys() | after.files.keys()
+            if before.files.get(file_path, ()) != after.files.get(file_path, ())
+        }
+        if before.head != after.head:
+            changed.update(
+                file_path
+                for file_path in self.git_service.get_diff_files(
+                    before.head, after.head
+                )
+                if not self._is_excluded(file_path)
+            )
+        return changed
+
+    def _is_excluded(self, file_path: str) -> bool:
+        """Check if a file lies in an excluded directory, such as .readmegen."""
+        return not self._excluded.isdisjoint(PurePosixPath(file_path).parts[:-1])
+
+    def _regenerate(self, changed_paths: Set[str], snapshot: _Snapshot) -> None:
+        """Regenerate the READMEs of the projects containing changed files."""
+        if any(Path(file_path).name == "pyproject.toml" for file_path in changed_paths):
+            self._load_projects()
+
+        affected = {
+            id(project): project
+            for file_path in changed_paths
+            for project in self._trie.find_all(file_path)
+        }
+        projects = [project for project in self.projects if id(project) in affected]
+        if not projects:
+            print(f"\n{len(changed_paths)} change(s) outside of any project.")
+            return
+
+        print(
+            f"\n{len(changed_paths)} change(s) affecting "
+            f"{', '.join(project.name for project in projects)}"
+        )
+
+        # Committed changes since each README, plus edits not committed yet
+        changed_files = self.project_service.detect_changes(projects)
+        for project in projects:
+            prefix = self._prefixes[project.root_path]
+            edited = [
+                file_path
+                for file_path, stat in snapshot.files.items()
+                if stat is not None and is_under_prefix(file_path, prefix)
+            ]
+            changed_files[project.root_path] = sorted(
+                set(changed_files[project.root_path]).union(edited)
+            )
+
+        results = self.project_service.run_projects(
+            projects, snapshot.head, changed_files
+        )
+        self.project_service.print_summary(results)
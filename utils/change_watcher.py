@@ -0,0 +1,212 @@
+"""Waiting for file system changes, with inotify on Linux and polling elsewhere."""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Union
+
+
+class PollingWatcher:
+    """Wakes up at a fixed interval; callers compare snapshots to find changes."""
+
+    def __init__(self, interval: float):
+        """
+        Initialize polling watcher.
+
+        Args:
+            interval: Seconds between polls.
+        """
+        self.interval = interval
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the next poll is due.
+
+        Args:
+            timeout: Maximum number of seconds to wait, None for one interval.
+
+        Returns:
+            Always True, since any poll may find changes.
+        """
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        return True
+
+    def close(self) -> None:
+        """Release resources held by the watcher."""
+
+
+class InotifyWatcher:
+    """Blocks until the kernel reports a change below the watched directories."""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+    )
+    EVENT = struct.Struct("iIII")
+    READ_SIZE = 64 * 1024
+
+    def __init__(self, libc: ctypes.CDLL, fd: int, excluded: Set[str]):
+        """
+        Initialize inotify watcher. Use create() instead.
+
+        Args:
+            libc: C library providing the inotify calls.
+            fd: Inotify file descriptor.
+            excluded: Directory names never watched.
+        """
+        self._libc = libc
+        self._fd = fd
+        self._excluded = excluded
+        self._paths: Dict[int, Path] = {}
+
+    @classmethod
+    def create(cls, excluded: Iterable[str]) -> Optional["InotifyWatcher"]:
+        """
+        Create an inotify watcher if the platform supports it.
+
+        Args:
+            excluded: Directory names never watched.
+
+        Returns:
+            Watcher, or None if inotify is unavailable.
+        """
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(
+                ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+            )
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        return cls(libc, fd, set(excluded))
+
+    def watch(self, directory: Path, recursive: bool = False) -> None:
+        """
+        Watch a directory, and optionally every directory below it.
+
+        Args:
+            directory: Directory to watch.
+            recursive: Also watch the existing subdirectories. Directories
+                created later are always watched.
+
+        Raises:
+            OSError: If the watch cannot be added, e.g. when the per-user
+                watch limit is reached.
+        """
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), ctypes.c_uint32(self.MASK)
+        )
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                # Removed before we got to it
+                return
+            raise OSError(error, os.strerror(error), str(directory))
+        self._paths[wd] = directory
+
+        if recursive:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                return
+            for entry in entries:
+                if entry.name not in self._excluded and entry.is_dir(
+                    follow_symlinks=False
+                ):
+                    self.watch(Path(entry.path), recursive=True)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for changes below the watched directories.
+
+        Args:
+            timeout: Maximum number of seconds to wait, None to wait forever.
+
+        Returns:
+            True if something changed, False if the timeout expired.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+
+        while True:
+            try:
+                data = os.read(self._fd, self.READ_SIZE)
+            except BlockingIOError:
+                break
+            self._handle_events(data)
+        return True
+
+    def close(self) -> None:
+        """Release the inotify file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _handle_events(self, data: bytes) -> None:
+        """Watch newly created directories and forget removed ones."""
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            name = data[offset + self.EVENT.size : offset + self.EVENT.size + length]
+            offset += self.EVENT.size + length
+
+            if mask & self.IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+
+            if (
+                mask & self.IN_ISDIR
+                and mask & (self.IN_CREATE | self.IN_MOVED_TO)
+                and wd in self._paths
+            ):
+                name = os.fsdecode(name.rstrip(b"\0"))
+                if name not in self._excluded:
+                    try:
+                        self.watch(self._paths[wd] / name, recursive=True)
+                    except OSError:
+                        # Out of watches; later snapshots still catch the change
+                        pass
+
+
+def create_watcher(
+    excluded: Iterable[str], poll_interval: float, force_polling: bool = False
+) -> Union[InotifyWatcher, PollingWatcher]:
+    """
+    Create the best available watcher.
+
+    Args:
+        excluded: Directory names never watched.
+        poll_interval: Seconds between polls when inotify is unavailable.
+        force_polling: Poll even where inotify is available.
+
+    Returns:
+        Inotify watcher where available, otherwise a polling watcher.
+    """
+    watcher = None if force_polling else InotifyWatcher.create(excluded)
+    return watcher or PollingWatcher(poll_interval)
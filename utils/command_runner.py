@@ -1,41 +1,174 @@
 """Command execution utilities."""
 
+import asyncio
 import os
 import subprocess
-from typing import Optional
+import threading
+import weakref
+from typing import Optional, Sequence
 
-from config.settings import Settings
+from utils.metrics import metrics
 
-os.chdir(Settings().apps_directory)
+
+class CommandError(RuntimeError):
+    """A command exited with an error or ran out of time."""
+
+    def __init__(
+        self,
+        argv: Sequence[str],
+        cwd: Optional[str],
+        returncode: Optional[int],
+        stderr: str,
+        timed_out: bool = False,
+    ):
+        """
+        Initialize command error.
+
+        Args:
+            argv: Program and arguments that were run.
+            cwd: Working directory of the command.
+            returncode: Exit status, or None if the command was killed.
+            stderr: Error output of the command.
+            timed_out: Whether the command was killed after its timeout.
+        """
+        self.argv = list(argv)
+        self.cwd = cwd or os.getcwd()
+        self.returncode = returncode
+        self.stderr = stderr
+        self.timed_out = timed_out
+
+        reason = "Timed out" if timed_out else f"Exit status {returncode}"
+        super().__init__(
+            f"Command failed: {subprocess.list2cmdline(self.argv)}\n"
+            f"Working directory: {self.cwd}\n"
+            f"{reason}\n"
+            f"Error: {stderr}"
+        )
 
 
 class CommandRunner:
-    """Utility class for running shell commands."""
+    """Runs programs without a shell, bounding how many run at the same time."""
 
-    @staticmethod
-    def run(command: str, cwd: Optional[str] = None) -> str:
+    def __init__(self, max_concurrency: int = 8, timeout: Optional[float] = 60):
         """
-        Run a shell command and return its output.
+        Initialize command runner.
 
         Args:
-            command: The command to execute.
+            max_concurrency: Maximum number of subprocesses running at once.
+            timeout: Default number of seconds before a command is killed.
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        # One semaphore per event loop, since asyncio primitives are loop-bound
+        self._loop_slots = weakref.WeakKeyDictionary()
+        self._loop_slots_lock = threading.Lock()
+
+    def run(
+        self,
+        argv: Sequence[str],
+        cwd: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Run a command and return its output.
+
+        Args:
+            argv: Program and arguments; nothing is interpreted by a shell.
             cwd: Working directory for the command.
+            timeout: Seconds before the command is killed, defaults to the
+                runner's timeout.
 
         Returns:
             Command output as a string.
 
         Raises:
-            RuntimeError: If the command fails.
+            CommandError: If the command fails or times out.
         """
+        name = self._metric_name(argv)
+        metrics.increment("subprocesses", command=name)
+        timeout = self.timeout if timeout is None else timeout
 
-        try:
-            result = subprocess.run(
-                command, shell=True, capture_output=True, text=True, check=True, cwd=cwd
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(
-                f"Command failed: {command}\n"
-                f"Working directory: {cwd or os.getcwd()}\n"
-                f"Error: {e.stderr}"
+        with self._slots, metrics.span("subprocess", command=name):
+            try:
+                result = subprocess.run(
+                    list(argv),
+                    capture_output=True,
+                    text=True,
+                    cwd=cwd,
+                    timeout=timeout,
+                )
+            except subprocess.TimeoutExpired as e:
+                metrics.increment("subprocess_failures", command=name)
+                stderr = e.stderr.decode(errors="replace") if e.stderr else ""
+                raise CommandError(argv, cwd, None, stderr, timed_out=True)
+
+        if result.returncode != 0:
+            metrics.increment("subprocess_failures", command=name)
+            raise CommandError(argv, cwd, result.returncode, result.stderr)
+        return result.stdout.strip()
+
+    async def run_async(
+        self,
+        argv: Sequence[str],
+        cwd: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Run a command without blocking the event loop and return its output.
+
+        Args:
+            argv: Program and arguments; nothing is interpreted by a shell.
+            cwd: Working directory for the command.
+            timeout: Seconds before the command is killed, defaults to the
+                runner's timeout.
+
+        Returns:
+            Command output as a string.
+
+        Raises:
+            CommandError: If the command fails or times out.
+        """
+        name = self._metric_name(argv)
+        metrics.increment("subprocesses", command=name)
+        timeout = self.timeout if timeout is None else timeout
+
+        async with self._loop_semaphore():
+            with metrics.span("subprocess", command=name):
+                process = await asyncio.create_subprocess_exec(
+                    *argv,
+                    cwd=cwd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                try:
+                    stdout, stderr = await asyncio.wait_for(
+                        process.communicate(), timeout
+                    )
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                    metrics.increment("subprocess_failures", command=name)
+                    raise CommandError(argv, cwd, None, "", timed_out=True)
+
+        if process.returncode != 0:
+            metrics.increment("subprocess_failures", command=name)
+            raise CommandError(
+                argv, cwd, process.returncode, stderr.decode(errors="replace")
             )
+        return stdout.decode(errors="surrogateescape").strip()
+
+    def _loop_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding subprocesses started from the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._loop_slots_lock:
+            semaphore = self._loop_slots.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._loop_slots[loop] = semaphore
+        return semaphore
+
+    @staticmethod
+    def _metric_name(argv: Sequence[str]) -> str:
+        """Name a command by its program and subcommand for metrics."""
+        return " ".join(argv[:2])
@@ -0,0 +1,81 @@
+"""Per-project rules deciding which files are sent to the model."""
+
+from typing import Any, Dict, List, Optional
+
+from utils.generated_files import GeneratedFileDetector
+from utils.glob_matcher import GlobMatcher
+
+
+class ProjectFileRules:
+    """Include and exclude globs of a project combined with generated file checks."""
+
+    LOCKFILES = GlobMatcher(GeneratedFileDetector.LOCKFILES)
+
+    def __init__(
+        self,
+        include: List[str],
+        exclude: List[str],
+        detector: Optional[GeneratedFileDetector] = None,
+    ):
+        """
+        Initialize project file rules.
+
+        Args:
+            include: Globs a file must match to be kept; empty to keep all.
+            exclude: Globs of files to drop.
+            detector: Generated file checks by path, or None to skip them.
+        """
+        self.include = GlobMatcher(include)
+        self.exclude = GlobMatcher(exclude)
+        self.detector = detector
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        source: str,
+        detector: Optional[GeneratedFileDetector] = None,
+    ) -> "ProjectFileRules":
+        """
+        Build rules from a project's [tool.readmegen] table.
+
+        Args:
+            config: The table, e.g. {"include": [...], "exclude": [...]}.
+            source: Name of the file the table came from, used in warnings.
+            detector: Generated file checks by path, or None to skip them.
+
+        Returns:
+            Compiled rules; malformed entries are ignored with a warning.
+        """
+        patterns = {}
+        for key in ("include", "exclude"):
+            value = config.get(key, [])
+            if isinstance(value, str):
+                value = [value]
+            if not isinstance(value, list) or not all(
+                isinstance(pattern, str) for pattern in value
+            ):
+                print(f"Warning: Ignoring tool.readmegen.{key} in {source}: not a list")
+                value = []
+            patterns[key] = value
+        return cls(patterns["include"], patterns["exclude"], detector)
+
+    def exclusion_reason(self, path: str) -> Optional[str]:
+        """
+        Decide whether a file is dropped.
+
+        Args:
+            path: Slash-separated path relative to the project root.
+
+        Returns:
+            Reason the file is dropped, None to keep it.
+        """
+        if self.include and not self.include.match(path):
+            return "not included"
+        if self.LOCKFILES.match(path):
+            return "lockfile"
+        if self.exclude.match(path):
+            return "excluded"
+        if self.detector:
+            return self.detector.match_path(path)
+        return None
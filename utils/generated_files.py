@@ -0,0 +1,123 @@
+"""Heuristics recognizing generated, vendored and data files."""
+
+import re
+from pathlib import PurePosixPath
+from typing import Dict, List, Optional
+
+from utils.glob_matcher import GlobMatcher
+
+
+class GeneratedFileDetector:
+    """
+    Recognizes files that say little about a project, in the spirit of Linguist.
+
+    Lockfiles are always left out by the project file rules. Of the checks
+    here, path checks run before a file is opened, the size check before it is
+    read and the content checks on its first chunk, so excluded files cost
+    at most one chunk.
+    """
+
+    LOCKFILES = [
+        "poetry.lock", "Pipfile.lock", "pdm.lock", "uv.lock", "pixi.lock",
+        "conda-lock.yml", "package-lock.json", "npm-shrinkwrap.json",
+        "yarn.lock", "pnpm-lock.yaml", "bun.lockb", "Cargo.lock", "go.sum",
+        "Gemfile.lock", "composer.lock", "flake.lock",
+    ]  # fmt: skip
+    PATH_PATTERNS: Dict[str, List[str]] = {
+        "vendored": [
+            "vendor/", "vendored/", "_vendor/", "third_party/", "third-party/",
+            "node_modules/", "bower_components/", "site-packages/",
+        ],
+        "minified": [
+            "*.min.js", "*.min.mjs", "*.min.css", "*-min.js", "*.bundle.js",
+            "*.chunk.js", "*.map",
+        ],
+        "generated": [
+            "*_pb2.py", "*_pb2.pyi", "*_pb2_grpc.py", "*.pb.go", "*.pb.cc",
+            "*.pb.h", "*_grpc.pb.go", "*.generated.*", "__generated__/",
+        ],
+    }  # fmt: skip
+    DATA_EXTENSIONS = {
+        ".ipynb", ".csv", ".tsv", ".json", ".jsonl", ".ndjson", ".xml",
+        ".geojson", ".svg", ".sql", ".log",
+    }  # fmt: skip
+    MINIFIABLE_EXTENSIONS = {".js", ".mjs", ".cjs", ".css"}
+    MAX_DATA_BYTES = 64 * 1024
+    MAX_TEXT_BYTES = 1024 * 1024
+    MAX_AVERAGE_LINE_LENGTH = 110
+    MAX_LINE_LENGTH = 5000
+    HEADER_LINES = 5
+    HEADER_MARKERS = re.compile(
+        r"@generated|do not edit|auto-?generated|automatically generated"
+        r"|code generated by|generated by the protocol buffer compiler",
+        re.IGNORECASE,
+    )
+
+    def __init__(self):
+        """Initialize generated file detector."""
+        self._path_matchers = {
+            reason: GlobMatcher(patterns)
+            for reason, patterns in self.PATH_PATTERNS.items()
+        }
+
+    def match_path(self, path: str) -> Optional[str]:
+        """
+        Check a file by its path.
+
+        Args:
+            path: Slash-separated path relative to the project root.
+
+        Returns:
+            Reason the file is excluded, None to keep it.
+        """
+        for reason, matcher in self._path_matchers.items():
+            if matcher.match(path):
+                return reason
+        return None
+
+    def match_size(self, path: str, size: int) -> Optional[str]:
+        """
+        Check a file by its size.
+
+        Args:
+            path: File path.
+            size: File size in bytes.
+
+        Returns:
+            Reason the file is excluded, None to keep it.
+        """
+        suffix = PurePosixPath(path).suffix.lower()
+        if suffix in self.DATA_EXTENSIONS and size > self.MAX_DATA_BYTES:
+            return "large notebook" if suffix == ".ipynb" else "large data file"
+        if size > self.MAX_TEXT_BYTES:
+            return "large file"
+        return None
+
+    def match_content(self, path: str, head: bytes) -> Optional[str]:
+        """
+        Check a file by the start of its content.
+
+        Args:
+            path: File path.
+            head: First bytes of the file.
+
+        Returns:
+            Reason the file is excluded, None to keep it.
+        """
+        lines = head.decode("utf-8", errors="replace").splitlines()
+        if not lines:
+            return None
+
+        if any(self.HEADER_MARKERS.search(line) for line in lines[: self.HEADER_LINES]):
+            return "generated"
+
+        suffix = PurePosixPath(path).suffix.lower()
+        average = sum(len(line) for line in lines) / len(lines)
+        if (
+            suffix in self.MINIFIABLE_EXTENSIONS
+            and average > self.MAX_AVERAGE_LINE_LENGTH
+        ):
+            return "minified"
+        if max(len(line) for line in lines) > self.MAX_LINE_LENGTH:
+            return "long lines"
+        return None
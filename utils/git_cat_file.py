@@ -0,0 +1,81 @@
+"""Persistent ``git cat-file --batch`` process."""
+
+import subprocess
+import threading
+from typing import Optional
+
+from utils.metrics import metrics
+
+
+class GitCatFile:
+    """Reads git objects through one long-lived ``git cat-file --batch`` pipe."""
+
+    def __init__(self, cwd: Optional[str] = None):
+        """
+        Initialize the reader. The git process is started on first use.
+
+        Args:
+            cwd: Working directory for the git process.
+        """
+        self.cwd = cwd
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def read(self, object_name: str) -> Optional[bytes]:
+        """
+        Read the content of a git object.
+
+        Args:
+            object_name: Any object name git understands, e.g. "HEAD:./main.py".
+
+        Returns:
+            Object content, or None if the object does not exist.
+
+        Raises:
+            RuntimeError: If the git process terminates unexpectedly.
+        """
+        with self._lock:
+            process = self._ensure_process()
+            process.stdin.write(object_name.encode("utf-8") + b"\n")
+            process.stdin.flush()
+
+            header = process.stdout.readline()
+            if not header:
+                self._process = None
+                raise RuntimeError(
+                    f"git cat-file terminated while reading {object_name}"
+                )
+
+            fields = header.split()
+            if len(fields) != 3:
+                # "<name> missing" or "<name> ambiguous"
+                return None
+
+            size = int(fields[2])
+            content = process.stdout.read(size)
+            process.stdout.read(1)  # trailing newline
+
+        metrics.increment("git_objects_read")
+        return content
+
+    def close(self) -> None:
+        """Stop the git process."""
+        with self._lock:
+            if self._process is None:
+                return
+            self._process.stdin.close()
+            self._process.wait()
+            self._process.stdout.close()
+            self._process = None
+
+    def _ensure_process(self) -> subprocess.Popen:
+        """Start the git process if it is not running."""
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.cwd,
+            )
+        return self._process
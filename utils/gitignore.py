@@ -0,0 +1,145 @@
+"""Minimal .gitignore pattern matching."""
+
+import re
+from pathlib import Path
+from typing import List, Optional, Pattern, Tuple
+
+
+class GitignoreRules:
+    """Compiled patterns of a single .gitignore file."""
+
+    def __init__(self, base_path: Path, lines: List[str]):
+        """
+        Initialize rules.
+
+        Args:
+            base_path: Directory containing the .gitignore file.
+            lines: Raw lines of the .gitignore file.
+        """
+        self.base_path = base_path
+        self._patterns: List[Tuple[Pattern[str], bool, bool]] = []
+
+        for line in lines:
+            compiled = self._compile(line)
+            if compiled:
+                self._patterns.append(compiled)
+
+    @classmethod
+    def from_directory(cls, directory: Path) -> Optional["GitignoreRules"]:
+        """
+        Load the .gitignore file of a directory.
+
+        Args:
+            directory: Directory that may contain a .gitignore file.
+
+        Returns:
+            Compiled rules or None if the directory has no usable .gitignore.
+        """
+        try:
+            with open(directory / ".gitignore", "r", encoding="utf-8") as f:
+                rules = cls(directory, f.read().splitlines())
+        except (OSError, UnicodeDecodeError):
+            return None
+        return rules if rules._patterns else None
+
+    def match(self, path: Path, is_dir: bool) -> Optional[bool]:
+        """
+        Match a path against the rules.
+
+        Args:
+            path: Path below the rules' base directory.
+            is_dir: Whether the path is a directory.
+
+        Returns:
+            True if ignored, False if explicitly re-included, None if no rule applies.
+        """
+        relative = path.relative_to(self.base_path).as_posix()
+        result = None
+        for regex, negated, dir_only in self._patterns:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relative):
+                result = not negated
+        return result
+
+    @staticmethod
+    def _compile(line: str) -> Optional[Tuple[Pattern[str], bool, bool]]:
+        """Compile one .gitignore line into (regex, negated, dir_only)."""
+        pattern = line.rstrip()
+        if not pattern or pattern.startswith("#"):
+            return None
+
+        negated = pattern.startswith("!")
+        if negated:
+            pattern = pattern[1:]
+        if pattern.startswith("\\"):
+            pattern = pattern[1:]
+
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if not pattern:
+            return None
+
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+
+        body = _translate_glob(pattern)
+        prefix = "" if anchored else "(?:.*/)?"
+        return re.compile(f"^{prefix}{body}$"), negated, dir_only
+
+
+def is_ignored(rules: List[GitignoreRules], path: Path, is_dir: bool) -> bool:
+    """
+    Check a path against a stack of rules, the innermost .gitignore last.
+
+    Args:
+        rules: Rules from the outermost to the innermost directory.
+        path: Path to check.
+        is_dir: Whether the path is a directory.
+
+    Returns:
+        True if the path is ignored.
+    """
+    ignored = False
+    for rule in rules:
+        result = rule.match(path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression body."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("(?:/.*)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                parts.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                char_class = pattern[i + 1 : end].replace("\\", "\\\\")
+                if char_class.startswith("!"):
+                    char_class = "^" + char_class[1:]
+                parts.append(f"[{char_class}]")
+                i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
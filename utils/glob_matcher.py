@@ -0,0 +1,90 @@
+"""Glob patterns compiled into a single regular expression."""
+
+import re
+from typing import Iterable, List
+
+
+class GlobMatcher:
+    """
+    Matches relative paths against many glob patterns with one regex match.
+
+    Patterns follow .gitignore conventions: a pattern without a slash matches
+    a file or directory name at any depth, a pattern with a slash is anchored
+    at the base directory, a trailing slash matches directories only, ``*``
+    and ``?`` stay within one path segment and ``**`` spans segments. A
+    pattern matching a directory matches everything inside it.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Initialize glob matcher.
+
+        Args:
+            patterns: Glob patterns; blank patterns are ignored.
+        """
+        self.patterns: List[str] = [
+            pattern.strip() for pattern in patterns if pattern.strip()
+        ]
+        self._regex = None
+        if self.patterns:
+            alternatives = "|".join(self._translate(p) for p in self.patterns)
+            self._regex = re.compile(f"(?:{alternatives})\\Z", re.DOTALL)
+
+    def __bool__(self) -> bool:
+        """Check if the matcher has any patterns."""
+        return self._regex is not None
+
+    def match(self, path: str) -> bool:
+        """
+        Check if a path matches any pattern.
+
+        Args:
+            path: Slash-separated path relative to the base directory.
+
+        Returns:
+            True if at least one pattern matches.
+        """
+        return self._regex is not None and self._regex.match(path) is not None
+
+    @classmethod
+    def _translate(cls, pattern: str) -> str:
+        """Translate one glob pattern into a regular expression."""
+        dir_only = pattern.endswith("/")
+        anchored = "/" in pattern.rstrip("/")
+        body = cls._translate_body(pattern.strip("/"))
+
+        prefix = "" if anchored else "(?:.*/)?"
+        suffix = "/.*" if dir_only else "(?:/.*)?"
+        return f"(?:{prefix}{body}{suffix})"
+
+    @staticmethod
+    def _translate_body(pattern: str) -> str:
+        """Translate glob wildcards, keeping everything else literal."""
+        parts = []
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if pattern.startswith("**/", i):
+                parts.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                parts.append(".*")
+                i += 2
+                continue
+            if char == "*":
+                parts.append("[^/]*")
+            elif char == "?":
+                parts.append("[^/]")
+            elif char == "[" and "]" in pattern[i + 2 :]:
+                end = pattern.index("]", i + 2)
+                members = pattern[i + 1 : end]
+                if members.startswith("!"):
+                    members = "^" + members[1:]
+                parts.append(f"[{members.replace(chr(92), chr(92) * 2)}]")
+                i = end + 1
+                continue
+            else:
+                parts.append(re.escape(char))
+            i += 1
+        return "".join(parts)
@@ -0,0 +1,169 @@
+"""Image downscaling and encoding with an on-disk cache."""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+
+class ImageEncoder:
+    """Encodes images for the AI, downscaled and cached by content hash."""
+
+    MEDIA_TYPES = {
+        ".png": "image/png",
+        ".jpg": "image/jpeg",
+        ".jpeg": "image/jpeg",
+        ".gif": "image/gif",
+        ".webp": "image/webp",
+    }
+
+    def __init__(self, cache_directory: Path, max_dimension: int, processes: int = 0):
+        """
+        Initialize image encoder.
+
+        Args:
+            cache_directory: Directory holding encoded thumbnails.
+            max_dimension: Maximum width and height of encoded images.
+            processes: Worker processes that downscale and encode images, so
+                the work does not hold up other threads; 0 to encode in the
+                calling thread.
+        """
+        self.cache_directory = Path(cache_directory)
+        self.max_dimension = max_dimension
+        self.processes = processes
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        """Get the hash identifying an image's content."""
+        return hashlib.sha256(data).hexdigest()
+
+    def encode(self, data: bytes, suffix: str) -> Optional[Tuple[str, str]]:
+        """
+        Encode an image, reusing a cached thumbnail when available.
+
+        Args:
+            data: Raw image bytes.
+            suffix: File extension of the image.
+
+        Returns:
+            Media type and base64 data, or None if the image cannot be sent.
+        """
+        key = f"{self.content_hash(data)}_{self.max_dimension}"
+        cache_path = self.cache_directory / key[:2] / f"{key}.json"
+
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            return cached["media_type"], cached["data"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        result = self._encode(data, suffix.lower())
+        if result is None:
+            return None
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"media_type": result[0], "data": result[1]}, f)
+        os.replace(temp_path, cache_path)
+        return result
+
+    def _encode(self, data: bytes, suffix: str) -> Optional[Tuple[str, str]]:
+        """Encode an image in a worker process, or in this thread without workers."""
+        if self.processes:
+            try:
+                future = self._executor().submit(
+                    encode_image, data, suffix, self.max_dimension
+                )
+                return future.result()
+            except Exception as e:
+                # encode_image handles bad images itself, so the pool is broken
+                print(f"Warning: Image workers failed, encoding in-process: {e}")
+                self.close()
+                self.processes = 0
+        return encode_image(data, suffix, self.max_dimension)
+
+    def close(self) -> None:
+        """Stop the worker processes, if any were started."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _executor(self) -> Any:
+        """Get the worker processes, starting them on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                # Deferred so runs without images skip the multiprocessing import
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # Spawned, as forking a process that runs threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    self.processes, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+
+def encode_image(
+    data: bytes, suffix: str, max_dimension: int
+) -> Optional[Tuple[str, str]]:
+    """
+    Downscale an image and encode it as base64.
+
+    Runs in worker processes, so it only takes and returns picklable values.
+
+    Args:
+        data: Raw image bytes.
+        suffix: Lowercase file extension of the image.
+        max_dimension: Maximum width and height of the encoded image.
+
+    Returns:
+        Media type and base64 data, or None if the image cannot be sent.
+    """
+    downscaled = _downscale(data, suffix, max_dimension)
+    if downscaled is None:
+        return None
+    media_type, image_bytes = downscaled
+    return media_type, base64.b64encode(image_bytes).decode("ascii")
+
+
+def _downscale(
+    data: bytes, suffix: str, max_dimension: int
+) -> Optional[Tuple[str, bytes]]:
+    """Shrink an image to the maximum dimension if Pillow is available."""
+    media_types = ImageEncoder.MEDIA_TYPES
+    try:
+        from PIL import Image
+    except ImportError:
+        # Without Pillow, send supported formats unchanged
+        media_type = media_types.get(suffix)
+        return (media_type, data) if media_type else None
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image_format = image.format
+            if max(image.size) <= max_dimension and suffix in media_types:
+                return media_types[suffix], data
+
+            image.thumbnail((max_dimension, max_dimension))
+            if image_format == "JPEG":
+                output_format, media_type = "JPEG", "image/jpeg"
+            else:
+                output_format, media_type = "PNG", "image/png"
+                if image.mode not in ("RGB", "RGBA", "L", "LA"):
+                    image = image.convert("RGBA")
+
+            output = io.BytesIO()
+            image.save(output, format=output_format, optimize=True)
+            return media_type, output.getvalue()
+    except Exception as e:
+        print(f"Warning: Could not encode image: {e}")
+        return None
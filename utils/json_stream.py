@@ -0,0 +1,141 @@
+"""Incremental extraction of a string field from streamed JSON."""
+
+import re
+from typing import Optional
+
+LONE_SURROGATES = re.compile(r"[\ud800-\udfff]")
+
+
+def replace_surrogates(text: str) -> str:
+    """
+    Replace lone surrogates, which json.loads accepts but UTF-8 cannot encode.
+
+    Args:
+        text: Decoded JSON string.
+
+    Returns:
+        Text safe to write as UTF-8.
+    """
+    return LONE_SURROGATES.sub(JsonStringFieldExtractor.REPLACEMENT, text)
+
+
+class JsonStringFieldExtractor:
+    """Decodes the value of one JSON string field while the JSON is still arriving."""
+
+    ESCAPES = {
+        '"': '"',
+        "\\": "\\",
+        "/": "/",
+        "b": "\b",
+        "f": "\f",
+        "n": "\n",
+        "r": "\r",
+        "t": "\t",
+    }
+    HEX_DIGITS = re.compile(r"[0-9a-fA-F]{4}")
+    REPLACEMENT = "\ufffd"
+
+    def __init__(self, field: str):
+        """
+        Initialize extractor.
+
+        Args:
+            field: Name of the string field to extract.
+        """
+        self._start_pattern = re.compile(rf'"{re.escape(field)}"\s*:\s*"')
+        self._prefix = ""
+        self._pending = ""
+        self.found = False
+        self.complete = False
+
+    def feed(self, text: str) -> str:
+        """
+        Consume the next piece of JSON text.
+
+        Args:
+            text: Next piece of the JSON document.
+
+        Returns:
+            Newly decoded characters of the field value, possibly empty.
+        """
+        if self.complete:
+            return ""
+
+        if not self.found:
+            self._prefix += text
+            match = self._start_pattern.search(self._prefix)
+            if not match:
+                return ""
+            self.found = True
+            text = self._prefix[match.end() :]
+            self._prefix = ""
+
+        return self._decode(self._pending + text)
+
+    def _decode(self, text: str) -> str:
+        """Decode string characters until the closing quote or the end of input."""
+        self._pending = ""
+        decoded = []
+        i = 0
+
+        while i < len(text):
+            char = text[i]
+            if char == '"':
+                self.complete = True
+                break
+
+            if char != "\\":
+                end = len(text)
+                for special in ('"', "\\"):
+                    position = text.find(special, i)
+                    if position != -1:
+                        end = min(end, position)
+                decoded.append(text[i:end])
+                i = end
+                continue
+
+            if i + 1 >= len(text):
+                self._pending = text[i:]
+                break
+
+            escape = text[i + 1]
+            if escape != "u":
+                decoded.append(self.ESCAPES.get(escape, escape))
+                i += 2
+                continue
+
+            if i + 6 > len(text):
+                self._pending = text[i:]
+                break
+            code = self._hex(text[i + 2 : i + 6])
+
+            if code is not None and 0xD800 <= code < 0xDC00:
+                # High surrogate, combined with the following low surrogate
+                following = text[i + 6 : i + 12]
+                if len(following) < 6 and "\\u".startswith(following[:2]):
+                    self._pending = text[i:]
+                    break
+                low = self._hex(following[2:]) if following[:2] == "\\u" else None
+                if low is not None and 0xDC00 <= low < 0xE000:
+                    decoded.append(
+                        chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00))
+                    )
+                    i += 12
+                    continue
+                code = None
+            elif code is not None and 0xDC00 <= code < 0xE000:
+                code = None
+
+            # Lone surrogates cannot be encoded as UTF-8; like bad escapes,
+            # they become the replacement character
+            decoded.append(self.REPLACEMENT if code is None else chr(code))
+            i += 6
+
+        return "".join(decoded)
+
+    @staticmethod
+    def _hex(digits: str) -> Optional[int]:
+        """Parse the four hex digits of a \\u escape, None if they are invalid."""
+        if not JsonStringFieldExtractor.HEX_DIGITS.fullmatch(digits):
+            return None
+        return int(digits, 16)
@@ -0,0 +1,255 @@
+"""Run metrics: counters and timed spans, exportable as JSON or Prometheus text."""
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class Metrics:
+    """Thread-safe registry of counters and spans for one run."""
+
+    PREFIX = "readmegen"
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters: Dict[Tuple[str, LabelSet], float] = {}
+        self._spans: List[Dict[str, Any]] = []
+        self._started_at = time.time()
+        self._start = time.perf_counter()
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name: Counter name.
+            value: Amount to add.
+            **labels: Extra labels; the current project is added automatically.
+        """
+        key = (name, self._label_set(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def span(self, name: str, **labels: str) -> Iterator[None]:
+        """
+        Time a block of work.
+
+        Args:
+            name: Span name, e.g. a pipeline stage.
+            **labels: Extra labels; the current project is added automatically.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, start, **labels)
+
+    def record_span(self, name: str, start: float, **labels: str) -> None:
+        """
+        Record a span that started earlier and ends now.
+
+        For work that begins and ends on different threads, where a ``span``
+        block cannot enclose it.
+
+        Args:
+            name: Span name.
+            start: ``time.perf_counter()`` value when the work started.
+            **labels: Extra labels; the current project is added automatically.
+        """
+        label_set = self._label_set(labels)
+        duration = time.perf_counter() - start
+        with self._lock:
+            self._spans.append(
+                {
+                    "name": name,
+                    "labels": dict(label_set),
+                    "start": round(start - self._start, 6),
+                    "duration": round(duration, 6),
+                }
+            )
+
+    @contextmanager
+    def project_scope(self, project: str, path: Optional[str] = None) -> Iterator[None]:
+        """
+        Attribute all metrics recorded by the current thread to a project.
+
+        Args:
+            project: Project name.
+            path: Project root, telling apart projects that share a name.
+        """
+        previous = getattr(self._local, "project", None)
+        self._local.project = {"project": project}
+        if path is not None:
+            self._local.project["project_path"] = path
+        try:
+            yield
+        finally:
+            self._local.project = previous
+
+    def totals_by_project(self, name: str, label: str = "project") -> Dict[str, float]:
+        """
+        Sum a counter per project across its other labels.
+
+        Args:
+            name: Counter name.
+            label: Label identifying projects, "project" for the name or
+                "project_path" for the root.
+
+        Returns:
+            Counter total per project name or root.
+        """
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for (counter, labels), value in self._counters.items():
+                project = dict(labels).get(label)
+                if counter == name and project is not None:
+                    totals[project] = totals.get(project, 0) + value
+        return totals
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Build a JSON-serializable run report.
+
+        Returns:
+            Counters, spans and per-span totals of the run.
+        """
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            spans = list(self._spans)
+
+        return {
+            "started_at": self._started_at,
+            "duration": round(time.perf_counter() - self._start, 6),
+            "counters": counters,
+            "span_totals": [
+                {"name": name, "labels": dict(labels), "count": count, "seconds": total}
+                for (name, labels), (count, total) in sorted(
+                    self._span_totals(spans).items()
+                )
+            ],
+            "spans": spans,
+        }
+
+    def write_json(self, path: Path) -> None:
+        """
+        Write the run report as JSON.
+
+        Args:
+            path: Output file path.
+        """
+        self._write_atomic(path, json.dumps(self.report(), indent=2))
+
+    def write_prometheus(self, path: Path) -> None:
+        """
+        Write counters and span totals in the Prometheus textfile format.
+
+        Args:
+            path: Output file path, typically in a node exporter textfile directory.
+        """
+        report = self.report()
+        lines = []
+
+        counters: Dict[str, List[str]] = {}
+        for counter in report["counters"]:
+            metric = f"{self.PREFIX}_{self._sanitize(counter['name'])}_total"
+            counters.setdefault(metric, []).append(
+                f"{metric}{self._format_labels(counter['labels'])} {counter['value']}"
+            )
+        for metric, samples in counters.items():
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(samples)
+
+        spans: Dict[str, List[str]] = {}
+        for total in report["span_totals"]:
+            metric = f"{self.PREFIX}_{self._sanitize(total['name'])}_seconds"
+            labels = self._format_labels(total["labels"])
+            spans.setdefault(metric, []).extend(
+                [
+                    f"{metric}_sum{labels} {total['seconds']:.6f}",
+                    f"{metric}_count{labels} {total['count']}",
+                ]
+            )
+        for metric, samples in spans.items():
+            lines.append(f"# TYPE {metric} summary")
+            lines.extend(samples)
+
+        lines.append(f"# TYPE {self.PREFIX}_run_duration_seconds gauge")
+        lines.append(f"{self.PREFIX}_run_duration_seconds {report['duration']}")
+        lines.append(f"# TYPE {self.PREFIX}_run_started_timestamp_seconds gauge")
+        lines.append(
+            f"{self.PREFIX}_run_started_timestamp_seconds {report['started_at']}"
+        )
+
+        self._write_atomic(path, "\n".join(lines) + "\n")
+
+    def reset(self) -> None:
+        """Discard everything recorded so far and restart the run clock."""
+        with self._lock:
+            self._counters.clear()
+            self._spans.clear()
+            self._started_at = time.time()
+            self._start = time.perf_counter()
+
+    def _label_set(self, labels: Dict[str, str]) -> LabelSet:
+        """Combine explicit labels with the current project."""
+        project = getattr(self._local, "project", None)
+        if project is not None and "project" not in labels:
+            labels = {**labels, **project}
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    @staticmethod
+    def _span_totals(
+        spans: List[Dict[str, Any]],
+    ) -> Dict[Tuple[str, LabelSet], Tuple[int, float]]:
+        """Aggregate span count and duration per name and labels."""
+        totals: Dict[Tuple[str, LabelSet], Tuple[int, float]] = {}
+        for span in spans:
+            key = (span["name"], tuple(sorted(span["labels"].items())))
+            count, seconds = totals.get(key, (0, 0.0))
+            totals[key] = (count + 1, round(seconds + span["duration"], 6))
+        return totals
+
+    @staticmethod
+    def _sanitize(name: str) -> str:
+        """Make a name valid as a Prometheus metric name."""
+        return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+    @staticmethod
+    def _format_labels(labels: Dict[str, str]) -> str:
+        """Format labels for the Prometheus text format."""
+        if not labels:
+            return ""
+        formatted = ",".join(
+            '{}="{}"'.format(
+                key,
+                value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+            )
+            for key, value in sorted(labels.items())
+        )
+        return f"{{{formatted}}}"
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str) -> None:
+        """Write a file so readers never see it half-written."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+
+metrics = Metrics()
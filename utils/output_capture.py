@@ -0,0 +1,105 @@
+"""Per-thread output grouping utilities."""
+
+import io
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Iterator, TextIO
+
+
+class _ThreadRoutedStream:
+    """Stream that routes writes to the calling thread's buffer, if any."""
+
+    def __init__(self, target: TextIO, local: threading.local):
+        """
+        Initialize routed stream.
+
+        Args:
+            target: Stream receiving writes from threads without a buffer.
+            local: Thread-local storage holding per-thread buffers.
+        """
+        self._target = target
+        self._local = local
+
+    def write(self, text: str) -> int:
+        """Write text to the current thread's buffer or the target stream."""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is not None:
+            return buffer.write(text)
+        return self._target.write(text)
+
+    def flush(self) -> None:
+        """Flush the target stream."""
+        self._target.flush()
+
+    def __getattr__(self, name: str):
+        """Delegate everything else to the target stream."""
+        return getattr(self._target, name)
+
+
+class OutputCapture:
+    """Groups printed output per worker thread so it is emitted in one block."""
+
+    def __init__(self):
+        """Initialize output capture."""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._original_stdout = None
+
+    @contextmanager
+    def installed(self) -> Iterator["OutputCapture"]:
+        """Route ``sys.stdout`` through the capture for the duration of the block."""
+        self._original_stdout = sys.stdout
+        sys.stdout = _ThreadRoutedStream(self._original_stdout, self._local)
+        try:
+            yield self
+        finally:
+            sys.stdout = self._original_stdout
+
+    @contextmanager
+    def group(self) -> Iterator[io.StringIO]:
+        """
+        Buffer everything the current thread prints and emit it at once.
+
+        Yields:
+            Buffer collecting the current thread's output.
+        """
+        buffer = io.StringIO()
+        try:
+            with self.redirected(buffer):
+                yield buffer
+        finally:
+            self.emit(buffer)
+
+    @contextmanager
+    def redirected(self, buffer: io.StringIO) -> Iterator[io.StringIO]:
+        """
+        Route everything the current thread prints into a buffer without emitting it.
+
+        Lets work that moves between threads collect its output in one buffer,
+        which is emitted with ``emit`` once the work is done.
+
+        Args:
+            buffer: Buffer receiving the current thread's output.
+
+        Yields:
+            The given buffer.
+        """
+        previous = getattr(self._local, "buffer", None)
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = previous
+
+    def emit(self, buffer: io.StringIO) -> None:
+        """
+        Write a buffer to the real stdout in one block.
+
+        Args:
+            buffer: Buffer filled through ``redirected``.
+        """
+        target = self._original_stdout or sys.stdout
+        with self._lock:
+            target.write(buffer.getvalue())
+            target.flush()
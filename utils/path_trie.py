@@ -0,0 +1,95 @@
+"""Path-prefix trie for assigning files to directories."""
+
+import os
+from pathlib import Path
+from typing import Dict, Generic, List, TypeVar
+
+T = TypeVar("T")
+
+
+class _Node(Generic[T]):
+    """Single path segment in the trie."""
+
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        """Initialize an empty node."""
+        self.children: Dict[str, "_Node[T]"] = {}
+        self.values: List[T] = []
+
+
+class PathTrie(Generic[T]):
+    """Maps directory prefixes to values and finds all prefixes of a path."""
+
+    def __init__(self):
+        """Initialize an empty trie."""
+        self._root: _Node[T] = _Node()
+
+    def insert(self, prefix: str, value: T) -> None:
+        """
+        Register a value under a directory prefix.
+
+        Args:
+            prefix: Slash-separated relative directory; "" or "." for the root.
+            value: Value to associate with the prefix.
+        """
+        node = self._root
+        for segment in self._split(prefix):
+            node = node.children.setdefault(segment, _Node())
+        node.values.append(value)
+
+    def find_all(self, path: str) -> List[T]:
+        """
+        Find the values of every registered prefix containing the path.
+
+        Args:
+            path: Slash-separated relative file path.
+
+        Returns:
+            Values from the outermost to the innermost matching prefix.
+        """
+        node = self._root
+        matches = list(node.values)
+        for segment in self._split(path):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            matches.extend(node.values)
+        return matches
+
+    @staticmethod
+    def _split(path: str) -> List[str]:
+        """Split a path into its non-trivial segments."""
+        return [segment for segment in path.split("/") if segment and segment != "."]
+
+
+def relative_prefix(directory: Path, base: Path) -> str:
+    """
+    Express a directory as a slash-separated prefix relative to a base.
+
+    Args:
+        directory: Directory to express.
+        base: Directory the prefix is relative to.
+
+    Returns:
+        Relative prefix, "." when both are the same directory.
+    """
+    return Path(os.path.relpath(directory, base)).as_posix()
+
+
+def is_under_prefix(path: str, prefix: str) -> bool:
+    """
+    Check whether a relative path lies under a relative directory prefix.
+
+    Args:
+        path: Slash-separated relative file path.
+        prefix: Prefix as returned by ``relative_prefix``.
+
+    Returns:
+        True if the path is inside the prefix directory.
+    """
+    if prefix == ".":
+        return not path.startswith("../")
+    return path.startswith(prefix) and (
+        len(path) == len(prefix) or path[len(prefix)] == "/"
+    )
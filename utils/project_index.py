@@ -0,0 +1,200 @@
+"""Persistent index of discovered projects and their README base commits."""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Stamp = Tuple[int, int]
+
+
+class ProjectIndex:
+    """Remembers discovery results so unchanged files are not walked or parsed again."""
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        """
+        Initialize project index, loading the existing index if present.
+
+        Args:
+            path: JSON file holding the index.
+        """
+        self.path = Path(path)
+        self._discovery: Dict[str, Any] = {}
+        self._projects: Dict[str, Dict[str, Any]] = {}
+        self._readmes: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self._discovery = data["discovery"]
+                self._projects = data["projects"]
+                self._readmes = data["readmes"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            print(f"Warning: Could not load project index {self.path}: {e}")
+
+    def get_discovery(self, root: Path) -> Optional[List[Path]]:
+        """
+        Get the pyproject.toml files found below a root by the last full walk.
+
+        The result is only returned while every directory and .gitignore file
+        seen by that walk still has the same modification time, since adding,
+        removing or renaming an entry changes the mtime of its directory.
+
+        Args:
+            root: Directory the walk started from.
+
+        Returns:
+            Paths of pyproject.toml files, or None if the tree must be walked again.
+        """
+        with self._lock:
+            discovery = self._discovery
+            if discovery.get("root") != str(root):
+                return None
+            for path, mtime_ns in discovery["stamps"].items():
+                try:
+                    if os.stat(path).st_mtime_ns != mtime_ns:
+                        return None
+                except OSError:
+                    return None
+            return [Path(path) for path in discovery["pyprojects"]]
+
+    def put_discovery(
+        self, root: Path, pyprojects: List[Path], watched: List[Path]
+    ) -> None:
+        """
+        Store the result of a full walk.
+
+        Args:
+            root: Directory the walk started from.
+            pyprojects: pyproject.toml files found.
+            watched: Directories and .gitignore files whose changes invalidate
+                the result.
+        """
+        stamps = {}
+        for path in watched:
+            try:
+                stamps[str(path)] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+
+        with self._lock:
+            self._discovery = {
+                "root": str(root),
+                "pyprojects": [str(path) for path in pyprojects],
+                "stamps": stamps,
+            }
+            kept = set(self._discovery["pyprojects"])
+            self._projects = {
+                path: entry for path, entry in self._projects.items() if path in kept
+            }
+            self._dirty = True
+
+    def get_project_name(
+        self, pyproject_path: Path, parse: Callable[[Path], Optional[str]]
+    ) -> Optional[str]:
+        """
+        Get a project's name, parsing its pyproject.toml only if it changed.
+
+        A file whose mtime changed but whose content hash did not is not parsed.
+
+        Args:
+            pyproject_path: Path to the pyproject.toml file.
+            parse: Reads the project name from the file, None if it has none.
+
+        Returns:
+            Project name, or None if the file does not define a project.
+        """
+        key = str(pyproject_path)
+        stamp = self._stamp(pyproject_path)
+        with self._lock:
+            entry = self._projects.get(key)
+        if entry is not None and stamp is not None and entry["stamp"] == list(stamp):
+            return entry["name"]
+
+        try:
+            content_hash = hashlib.sha256(pyproject_path.read_bytes()).hexdigest()
+        except OSError:
+            content_hash = None
+        if entry is None or content_hash is None or entry["sha256"] != content_hash:
+            name = parse(pyproject_path)
+        else:
+            name = entry["name"]
+
+        with self._lock:
+            self._projects[key] = {
+                "name": name,
+                "stamp": list(stamp) if stamp else None,
+                "sha256": content_hash,
+            }
+            self._dirty = True
+        return name
+
+    def get_base_commit(
+        self, readme_path: Path, extract: Callable[[Path], Optional[str]]
+    ) -> Optional[str]:
+        """
+        Get the base commit recorded in a README, reading it only if it changed.
+
+        Args:
+            readme_path: Path to the README.md file.
+            extract: Reads the base commit from the README.
+
+        Returns:
+            Commit SHA if found, None otherwise.
+        """
+        key = str(readme_path)
+        stamp = self._stamp(readme_path)
+        if stamp is None:
+            with self._lock:
+                if self._readmes.pop(key, None) is not None:
+                    self._dirty = True
+            return None
+
+        with self._lock:
+            entry = self._readmes.get(key)
+        if entry is not None and entry["stamp"] == list(stamp):
+            return entry["base_commit"]
+
+        base_commit = extract(readme_path)
+        with self._lock:
+            self._readmes[key] = {"stamp": list(stamp), "base_commit": base_commit}
+            self._dirty = True
+        return base_commit
+
+    def save(self) -> None:
+        """Write the index to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": self.VERSION,
+                        "discovery": self._discovery,
+                        "projects": self._projects,
+                        "readmes": self._readmes,
+                    },
+                    f,
+                )
+            os.replace(temp_path, self.path)
+            self._dirty = False
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[Stamp]:
+        """Get the modification time and size of a file, None if it is missing."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,214 @@
+"""Request and token budgets shared by all concurrent model requests."""
+
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+from typing import List, Mapping, Optional, Tuple
+
+from utils.metrics import metrics
+
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class RateLimiter:
+    """
+    Token buckets for requests and tokens per minute.
+
+    Waiting requests are admitted smallest first, so when the budget is tight
+    small projects are not held up behind large ones. Limits start from the
+    configured values and follow the provider's rate-limit headers.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        """
+        Initialize rate limiter.
+
+        Args:
+            requests_per_minute: Request budget, 0 until learned from headers.
+            tokens_per_minute: Token budget, 0 until learned from headers.
+        """
+        self._condition = threading.Condition()
+        self._request_limit = float(requests_per_minute)
+        self._token_limit = float(tokens_per_minute)
+        self._requests = self._request_limit
+        self._tokens = self._token_limit
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Wait until a request of the given size fits the budgets, then use them.
+
+        Args:
+            tokens: Estimated tokens of the request, including its output.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        start = time.monotonic()
+        ticket = (tokens, next(self._sequence))
+
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    self._refill()
+                    delay = None
+                    if self._waiting[0] == ticket:
+                        delay = self._delay(tokens)
+                        if delay <= 0:
+                            break
+                    self._condition.wait(delay)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+            if self._request_limit:
+                self._requests -= 1
+            if self._token_limit:
+                self._tokens -= min(tokens, self._token_limit)
+
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            metrics.increment("rate_limit_wait_seconds", waited)
+        return waited
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """
+        Adjust the budgets to the provider's rate-limit headers.
+
+        Args:
+            headers: Response headers, e.g. x-ratelimit-remaining-tokens.
+        """
+        with self._condition:
+            self._refill()
+            for kind in ("requests", "tokens"):
+                limit = self._parse_number(headers.get(f"x-ratelimit-limit-{kind}"))
+                remaining = self._parse_number(
+                    headers.get(f"x-ratelimit-remaining-{kind}")
+                )
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+
+                if limit:
+                    if kind == "requests":
+                        self._requests += limit - self._request_limit
+                        self._request_limit = limit
+                    else:
+                        self._tokens += limit - self._token_limit
+                        self._token_limit = limit
+                if remaining is not None:
+                    if kind == "requests":
+                        self._requests = min(self._requests, remaining)
+                    else:
+                        self._tokens = min(self._tokens, remaining)
+                    if remaining <= 0 and reset:
+                        self._pause_locked(reset)
+            self._condition.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Admit no requests for a while, e.g. after the provider rejected one.
+
+        Args:
+            seconds: Length of the pause.
+        """
+        with self._condition:
+            self._pause_locked(seconds)
+            self._condition.notify_all()
+
+    @staticmethod
+    def backoff(
+        attempt: int,
+        base_seconds: float,
+        max_seconds: float,
+        retry_after: Optional[float] = None,
+    ) -> float:
+        """
+        Get a jittered exponential backoff delay.
+
+        Args:
+            attempt: Number of the retry, starting at 0.
+            base_seconds: Delay ceiling of the first retry.
+            max_seconds: Upper bound of the delay ceiling.
+            retry_after: Delay requested by the provider, used as a minimum.
+
+        Returns:
+            Seconds to wait before retrying.
+        """
+        ceiling = min(max_seconds, base_seconds * (2**attempt))
+        delay = random.uniform(0, ceiling)
+        return max(delay, retry_after or 0.0)
+
+    def _pause_locked(self, seconds: float) -> None:
+        """Extend the pause; the caller holds the lock."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _refill(self) -> None:
+        """Add the budget earned since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self._request_limit:
+            self._requests = min(
+                self._request_limit,
+                self._requests + elapsed * self._request_limit / self.WINDOW_SECONDS,
+            )
+        if self._token_limit:
+            self._tokens = min(
+                self._token_limit,
+                self._tokens + elapsed * self._token_limit / self.WINDOW_SECONDS,
+            )
+
+    def _delay(self, tokens: int) -> float:
+        """Get how long until a request of the given size fits the budgets."""
+        delay = self._paused_until - time.monotonic()
+        if self._request_limit and self._requests < 1:
+            rate = self._request_limit / self.WINDOW_SECONDS
+            delay = max(delay, (1 - self._requests) / rate)
+        if self._token_limit:
+            # A request larger than the whole budget still goes once it is full
+            needed = min(tokens, self._token_limit)
+            if self._tokens < needed:
+                rate = self._token_limit / self.WINDOW_SECONDS
+                delay = max(delay, (needed - self._tokens) / rate)
+        return delay
+
+    @staticmethod
+    def _parse_number(value: Optional[str]) -> Optional[float]:
+        """Parse a numeric header value, None if absent or malformed."""
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit reset duration such as "1s", "6m0s" or "20ms".
+
+    Args:
+        value: Header value.
+
+    Returns:
+        Duration in seconds, or None if absent or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
@@ -0,0 +1,120 @@
+"""On-disk content-addressed cache for AI responses."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+class ResponseCache:
+    """Stores AI responses on disk, keyed by a hash of the request."""
+
+    def __init__(self, directory: Path, max_bytes: int, ttl_seconds: float):
+        """
+        Initialize response cache.
+
+        Args:
+            directory: Directory holding cache entries.
+            max_bytes: Total size above which least recently used entries are evicted.
+            ttl_seconds: Age after which an entry is no longer used.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """
+        Build a cache key from everything that influences a response.
+
+        Args:
+            **parts: JSON-serializable request components.
+
+        Returns:
+            Hex digest identifying the request.
+        """
+        encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Cached response or None on a miss.
+        """
+        path = self._entry_path(key)
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count(hit=False)
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            self._count(hit=False)
+            return None
+
+        # Access time drives LRU eviction
+        os.utime(path)
+        self._count(hit=True)
+        return entry.get("response")
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response and evict old entries if the cache grew too large.
+
+        Args:
+            key: Cache key.
+            response: Response to store.
+        """
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.time(), "response": response}, f)
+        os.replace(temp_path, path)
+
+        self._evict()
+
+    def _entry_path(self, key: str) -> Path:
+        """Get the file path of a cache entry."""
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _count(self, hit: bool) -> None:
+        """Record a cache hit or miss."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits its size limit."""
+        with self._lock:
+            entries = []
+            for path in self.directory.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
@@ -0,0 +1,75 @@
+"""Deterministic assignment of projects to shards."""
+
+import hashlib
+import heapq
+import re
+from typing import Dict, List, Optional, Tuple
+
+SHARD_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Parse a shard specification such as "2/4".
+
+    Args:
+        value: Shard number, starting at 1, and shard count separated by a slash.
+
+    Returns:
+        Shard number and shard count.
+
+    Raises:
+        ValueError: If the specification is malformed or out of range.
+    """
+    match = SHARD_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Shard must look like i/N, got {value!r}")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Shard {value!r} is out of range, expected 1 <= i <= N")
+    return index, count
+
+
+def stable_hash(key: str) -> int:
+    """
+    Hash a key the same way on every machine and Python process.
+
+    Args:
+        key: Key to hash, e.g. a project path.
+
+    Returns:
+        Unsigned 64-bit hash.
+    """
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big")
+
+
+def assign_shards(
+    keys: List[str], count: int, weights: Optional[Dict[str, float]] = None
+) -> Dict[str, int]:
+    """
+    Assign keys to shards so that every runner computes the same assignment.
+
+    Without weights a key's shard depends only on the key, so projects keep
+    their shard as others are added or removed. With weights, keys are placed
+    heaviest first on the least loaded shard, which balances the shards; the
+    assignment then depends on all keys and weights, which runners at the
+    same commit agree on.
+
+    Args:
+        keys: Keys to assign, e.g. project paths.
+        count: Number of shards.
+        weights: Optional estimated cost per key.
+
+    Returns:
+        Shard number, starting at 1, per key.
+    """
+    if weights is None:
+        return {key: stable_hash(key) % count + 1 for key in keys}
+
+    loads = [(0.0, shard) for shard in range(1, count + 1)]
+    assignment = {}
+    for key in sorted(keys, key=lambda key: (-weights.get(key, 0), stable_hash(key))):
+        load, shard = heapq.heappop(loads)
+        assignment[key] = shard
+        heapq.heappush(loads, (load + weights.get(key, 0), shard))
+    return assignment
@@ -0,0 +1,85 @@
+"""Persistent index of per-file summaries keyed by git blob SHA, path and model."""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class SummaryIndex:
+    """Stores file summaries on disk so unchanged files are summarized only once."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize summary index, loading existing summaries if present.
+
+        Args:
+            path: JSON file holding the index.
+        """
+        self.path = Path(path)
+        self._summaries: Dict[str, str] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._summaries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load summary index {self.path}: {e}")
+
+    @staticmethod
+    def make_key(blob_sha: str, file_path: str, summarizer: str) -> str:
+        """
+        Build the key of a summary from everything it is generated from.
+
+        Args:
+            blob_sha: Git blob SHA of the file content.
+            file_path: File path, which is part of the summarized input.
+            summarizer: Fingerprint of the model and prompt producing summaries.
+
+        Returns:
+            Key led by the blob SHA.
+        """
+        digest = hashlib.sha256(f"{file_path}\n{summarizer}".encode("utf-8"))
+        return f"{blob_sha}:{digest.hexdigest()[:16]}"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a stored summary.
+
+        Args:
+            key: Summary key from make_key.
+
+        Returns:
+            Summary or None if the file has not been summarized yet.
+        """
+        with self._lock:
+            return self._summaries.get(key)
+
+    def put(self, key: str, summary: str) -> None:
+        """
+        Store a summary.
+
+        Args:
+            key: Summary key from make_key.
+            summary: Summary of the file.
+        """
+        with self._lock:
+            self._summaries[key] = summary
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the index to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self._summaries, f)
+            os.replace(temp_path, self.path)
+            self._dirty = False
@@ -0,0 +1,21 @@
+"""Token estimation utilities."""
+
+CHARS_PER_TOKEN = 4
+# Rough cost of one downscaled image input
+IMAGE_TOKENS = 800
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of model tokens in a text.
+
+    Uses the common approximation of four characters per token, which is
+    close enough for budgeting without a tokenizer dependency.
+
+    Args:
+        text: Text to estimate.
+
+    Returns:
+        Estimated token count.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN